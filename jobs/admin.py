@@ -0,0 +1,19 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "run_at", "locked_by", "finished_at")
+    list_filter = ("status", "name")
+    readonly_fields = ("attempts", "locked_by", "locked_at", "last_error", "created_at", "finished_at")
+    actions = ("retry_jobs",)
+
+    @admin.action(description="Zopakovať vybrané úlohy")
+    def retry_jobs(self, request, queryset):
+        count = queryset.exclude(status=Job.RUNNING).update(
+            status=Job.QUEUED, run_at=timezone.now(), attempts=0, last_error="", finished_at=None,
+        )
+        self.message_user(request, f"Zaradených úloh: {count}")
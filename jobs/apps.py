@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    name = 'jobs'
+
+    def ready(self):
+        # Obslužné funkcie sa registrujú v <app>/jobs.py (napr. tasks/jobs.py)
+        from . import mail  # noqa: F401
+        autodiscover_modules('jobs')
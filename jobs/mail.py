@@ -0,0 +1,81 @@
+# jobs/mail.py
+"""Email cez frontu – EMAIL_BACKEND, ktorý správy len zaradí ako úlohu
+
+Požiadavka (napr. registrácia cez allauth s povinným potvrdením emailu)
+nečaká na SMTP server. Worker správy odošle skutočným backendom
+JOBS_EMAIL_BACKEND, všetky správy jedného volania cez jedno spojenie.
+"""
+
+import base64
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .queue import enqueue, register
+
+SEND_EMAIL_JOB = 'jobs.send_email'
+
+
+def _encode(content):
+    if isinstance(content, bytes):
+        return {'base64': base64.b64encode(content).decode('ascii')}
+    return {'text': content}
+
+
+def _decode(content):
+    return base64.b64decode(content['base64']) if 'base64' in content else content['text']
+
+
+def serialize_message(message):
+    """EmailMessage → JSON (aj alternatívy a prílohy s obsahom)"""
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'content_subtype': message.content_subtype,
+        'alternatives': [
+            [_encode(content), mimetype] for content, mimetype in getattr(message, 'alternatives', [])
+        ],
+        'attachments': [
+            # MIMEBase prílohy sa serializovať nedajú – v projekte sa nepoužívajú
+            [filename, _encode(content), mimetype] for filename, content, mimetype in message.attachments
+        ],
+    }
+
+
+def deserialize_message(data):
+    message = EmailMultiAlternatives(
+        subject=data['subject'], body=data['body'], from_email=data['from_email'],
+        to=data['to'], cc=data['cc'], bcc=data['bcc'], reply_to=data['reply_to'],
+        headers=data['headers'],
+    )
+    message.content_subtype = data['content_subtype']
+    for content, mimetype in data['alternatives']:
+        message.attach_alternative(_decode(content), mimetype)
+    for filename, content, mimetype in data['attachments']:
+        message.attach(filename, _decode(content), mimetype)
+    return message
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Jedno volanie send_messages = jedna úloha vo fronte"""
+
+    def send_messages(self, email_messages):
+        messages = [serialize_message(message) for message in email_messages if message.recipients()]
+        if messages:
+            enqueue(SEND_EMAIL_JOB, {'messages': messages})
+        return len(messages)
+
+
+@register(SEND_EMAIL_JOB)
+def send_email(messages):
+    """Odošle správy skutočným backendom; chyba vyvolá ďalší pokus celej úlohy"""
+    connection = get_connection(settings.JOBS_EMAIL_BACKEND, fail_silently=False)
+    connection.send_messages([deserialize_message(data) for data in messages])
+
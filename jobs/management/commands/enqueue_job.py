@@ -0,0 +1,35 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.queue import UnknownJob, enqueue, registered_jobs
+
+
+class Command(BaseCommand):
+    help = "Put a registered job into the background queue (e.g. from cron instead of running it inline)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", nargs="?", help="Názov úlohy, napr. tasks.send_reminders")
+        parser.add_argument("--payload", default="{}", help="Argumenty úlohy ako JSON objekt")
+        parser.add_argument("--delay", type=int, default=0, help="Spustiť najskôr o toľko sekúnd")
+        parser.add_argument("--priority", type=int, default=0, help="Menšie číslo = skôr")
+        parser.add_argument("--list", action="store_true", help="Vypísať registrované úlohy")
+
+    def handle(self, *args, **options):
+        if options["list"] or not options["name"]:
+            for name in registered_jobs():
+                self.stdout.write(name)
+            return
+        try:
+            payload = json.loads(options["payload"])
+        except ValueError as exc:
+            raise CommandError(f"Neplatný JSON v --payload: {exc}")
+        if not isinstance(payload, dict):
+            raise CommandError("--payload musí byť JSON objekt")
+        try:
+            job = enqueue(options["name"], payload, delay=timedelta(seconds=options["delay"]),
+                          priority=options["priority"])
+        except UnknownJob:
+            raise CommandError(f"Neznáma úloha: {options['name']} (zoznam: --list)")
+        self.stdout.write(self.style.SUCCESS(f"✅ Zaradená úloha {job}"))
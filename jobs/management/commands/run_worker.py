@@ -0,0 +1,77 @@
+import os
+import signal
+import socket
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from jobs.queue import claim_jobs, purge_finished, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Process background jobs from the database queue (email, reminders, exports); "
+        "run one or more workers next to the web server"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Úloh na jedno zamknutie (predvolene JOBS_BATCH_SIZE)")
+        parser.add_argument("--poll-interval", type=float, default=None,
+                            help="Pauza v sekundách, keď je fronta prázdna (predvolene JOBS_POLL_INTERVAL)")
+        parser.add_argument("--once", action="store_true", help="Spracovať čakajúce úlohy a skončiť")
+        parser.add_argument("--max-jobs", type=int, default=None, help="Skončiť po toľkých úlohách")
+        parser.add_argument("--purge-days", type=int, default=7,
+                            help="Mazať dokončené úlohy staršie ako toľko dní (0 = nemazať)")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or settings.JOBS_BATCH_SIZE
+        poll_interval = settings.JOBS_POLL_INTERVAL if options["poll_interval"] is None else options["poll_interval"]
+        if batch_size < 1 or poll_interval < 0:
+            raise CommandError("--batch-size musí byť kladné a --poll-interval nezáporné")
+
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = False
+        # Dokončiť rozpracovanú úlohu a skončiť – zámok by inak držala do JOBS_LOCK_TIMEOUT
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        processed = failed = 0
+        last_maintenance = 0.0
+        self.stdout.write(f"Worker {worker_id} beží")
+        while not self.stopping:
+            if time.monotonic() - last_maintenance > 60:
+                requeued = requeue_stale()
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f"Vrátených úloh po vypršaní zámku: {requeued}"))
+                if options["purge_days"]:
+                    purge_finished(timedelta(days=options["purge_days"]))
+                last_maintenance = time.monotonic()
+
+            # Dlho bežiaci proces – spojenia ako pri požiadavke (CONN_MAX_AGE, health checks)
+            close_old_connections()
+            # Zamknúť len toľko, koľko sa spracuje – zvyšok by čakal na vypršanie zámku
+            limit = min(batch_size, options["max_jobs"] - processed) if options["max_jobs"] else batch_size
+            jobs = claim_jobs(worker_id, limit)
+            for job in jobs:
+                ok = run_job(job)
+                processed += 1
+                failed += not ok
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"{'✅' if ok else '❌'} {job.name} #{job.pk} (pokus {job.attempts})")
+            if options["max_jobs"] and processed >= options["max_jobs"]:
+                break
+
+            if not jobs:
+                if options["once"]:
+                    break
+                time.sleep(poll_interval)
+
+        close_old_connections()
+        self.stdout.write(self.style.SUCCESS(f"✅ Spracovaných úloh: {processed}, neúspešných: {failed}"))
+
+    def _stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,169 @@
+# jobs/queue.py
+"""Fronta úloh na pozadí v databáze
+
+Úloha sa zapíše v transakcii volajúceho – worker ju uvidí až po jej potvrdení
+a pri rollbacku zmizne spolu so zmenami, ktoré ju vyvolali. Worker si úlohy
+zamyká cez SELECT ... FOR UPDATE SKIP LOCKED (PostgreSQL, MySQL 8, Oracle),
+takže viac workerov si ich rozdelí bez čakania. SQLite zámky riadkov nemá –
+úlohu si worker privlastní podmieneným UPDATE (status=QUEUED), zápisy sú
+v SQLite aj tak serializované.
+
+Kým obslužná funkcia beží, vlákno heartbeat posúva locked_at – requeue_stale
+tak vráti len úlohy workerov, ktoré naozaj prestali bežať, nie dlhé exporty.
+"""
+
+import logging
+import random
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+class UnknownJob(KeyError):
+    pass
+
+
+def register(name):
+    """Dekorátor obslužnej funkcie úlohy; argumenty dostane z payloadu ako kwargs"""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_handler(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownJob(name) from None
+
+
+def registered_jobs():
+    return sorted(_registry)
+
+
+def enqueue(name, payload=None, *, delay=None, priority=0, max_attempts=None):
+    """Zaradí úlohu do fronty; payload musí byť serializovateľný do JSON"""
+    get_handler(name)
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        priority=priority,
+        run_at=timezone.now() + (delay or timedelta()),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+def backoff(attempts):
+    """Exponenciálne čakanie pred ďalším pokusom s náhodným rozptylom (max JOBS_BACKOFF_MAX)"""
+    delay = min(settings.JOBS_BACKOFF_BASE * 2 ** (attempts - 1), settings.JOBS_BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_jobs(worker_id, limit):
+    """Privlastní si až `limit` čakajúcich úloh, ktorých čas nadišiel"""
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.QUEUED, run_at__lte=now).order_by('priority', 'run_at', 'id')
+    claim = {'status': Job.RUNNING, 'locked_by': worker_id, 'locked_at': now, 'attempts': F('attempts') + 1}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:limit])
+            Job.objects.filter(pk__in=ids).update(**claim)
+    else:
+        ids = []
+        for pk in due.values_list('id', flat=True)[:limit]:
+            # Iný worker mohol úlohu medzitým získať – podmienka na status to rozhodne
+            if Job.objects.filter(pk=pk, status=Job.QUEUED).update(**claim):
+                ids.append(pk)
+    return list(Job.objects.filter(pk__in=ids).order_by('priority', 'run_at', 'id'))
+
+
+def renew_lock(job):
+    """Posunie locked_at úlohy, ktorú worker stále drží; vracia False, ak ju už stratil"""
+    return bool(Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by).update(
+        locked_at=timezone.now(),
+    ))
+
+
+class _Heartbeat(threading.Thread):
+    """Obnovuje zámok úlohy každých `interval` sekúnd, kým sa nezastaví (vlastné spojenie)"""
+
+    def __init__(self, job, interval):
+        super().__init__(name=f'job-heartbeat-{job.pk}', daemon=True)
+        self.job = job
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    renew_lock(self.job)
+                except DatabaseError:
+                    # Ďalší pokus o interval; zámok vyprší až po JOBS_LOCK_TIMEOUT
+                    logger.warning('Heartbeat of job %s failed', self.job, exc_info=True)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_job(job):
+    """Spustí obslužnú funkciu; pri chybe naplánuje ďalší pokus alebo úlohu označí ako FAILED"""
+    heartbeat = _Heartbeat(job, settings.JOBS_HEARTBEAT_INTERVAL)
+    heartbeat.start()
+    try:
+        get_handler(job.name)(**job.payload)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        # Zámok sa už neobnovuje – stav úlohy ďalej mení len tento worker
+        heartbeat.stop()
+
+    if error is None:
+        _finish(job, status=Job.DONE, finished_at=timezone.now())
+        return True
+    if job.attempts < job.max_attempts:
+        retry_at = timezone.now() + backoff(job.attempts)
+        logger.warning('Job %s failed (attempt %s/%s), retry at %s', job, job.attempts, job.max_attempts, retry_at)
+        _finish(job, status=Job.QUEUED, run_at=retry_at, last_error=error)
+    else:
+        logger.error('Job %s failed permanently', job)
+        _finish(job, status=Job.FAILED, finished_at=timezone.now(), last_error=error)
+    return False
+
+
+def _finish(job, **values):
+    # Podmienka na locked_by – úlohu vrátenú po vypršaní zámku už môže mať iný worker
+    Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by).update(
+        locked_by='', locked_at=None, **values,
+    )
+
+
+def requeue_stale(timeout=None):
+    """Vráti do fronty úlohy workerov, ktoré spadli uprostred spracovania (bez heartbeatu)"""
+    timeout = settings.JOBS_LOCK_TIMEOUT if timeout is None else timeout
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff).update(
+        status=Job.QUEUED, locked_by='', locked_at=None, run_at=timezone.now(),
+    )
+
+
+def purge_finished(older_than):
+    """Zmaže dokončené úlohy staršie ako `older_than` (timedelta); neúspešné ostávajú na analýzu"""
+    return Job.objects.filter(status=Job.DONE, finished_at__lt=timezone.now() - older_than).delete()[0]
@@ -0,0 +1,123 @@
+import time
+from datetime import timedelta
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim_jobs, enqueue, register, requeue_stale, run_job
+
+_seen = []
+_calls = []
+
+
+@register("tests.ok")
+def ok_job(**payload):
+    _calls.append(payload)
+
+
+@register("tests.fail")
+def failing_job():
+    raise RuntimeError("zlyhanie")
+
+
+@register("tests.slow")
+def slow_job(seconds):
+    time.sleep(seconds)
+    # Zámok starší ako 0,2 s by requeue_stale vrátil – heartbeat ho musí obnovovať
+    _seen.append(requeue_stale(timeout=0.2))
+
+
+@override_settings(JOBS_BACKOFF_BASE=10, JOBS_BACKOFF_MAX=3600)
+class QueueTests(TestCase):
+    def test_claim_takes_due_jobs_in_order(self):
+        later = enqueue("tests.ok", priority=1)
+        first = enqueue("tests.ok")
+        enqueue("tests.ok", delay=timedelta(hours=1))
+
+        claimed = claim_jobs("worker-1", 10)
+
+        self.assertEqual([job.pk for job in claimed], [first.pk, later.pk])
+        self.assertTrue(all(job.status == Job.RUNNING and job.locked_by == "worker-1" for job in claimed))
+        self.assertEqual({job.attempts for job in claimed}, {1})
+
+    def test_second_claim_skips_claimed_jobs(self):
+        job = enqueue("tests.ok")
+        self.assertEqual(len(claim_jobs("worker-1", 10)), 1)
+        self.assertEqual(claim_jobs("worker-2", 10), [])
+        job.refresh_from_db()
+        self.assertEqual(job.locked_by, "worker-1")
+
+    def test_success_marks_done(self):
+        _calls.clear()
+        enqueue("tests.ok", {"value": 1})
+        [job] = claim_jobs("worker-1", 1)
+        self.assertTrue(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, _calls), (Job.DONE, "", [{"value": 1}]))
+
+    def test_failure_is_retried_with_backoff(self):
+        enqueue("tests.fail", max_attempts=3)
+        [job] = claim_jobs("worker-1", 1)
+        before = timezone.now()
+        with self.assertLogs("jobs.queue", "WARNING"):
+            self.assertFalse(run_job(job))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.QUEUED, 1, ""))
+        self.assertIn("zlyhanie", job.last_error)
+        # Prvý pokus: 10 s ± 20 %
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=8))
+        self.assertLessEqual(job.run_at, timezone.now() + timedelta(seconds=12))
+        self.assertEqual(claim_jobs("worker-1", 1), [])
+
+    def test_last_attempt_fails_permanently(self):
+        enqueue("tests.fail", max_attempts=2)
+        for attempt in (1, 2):
+            Job.objects.update(run_at=timezone.now())
+            [job] = claim_jobs("worker-1", 1)
+            self.assertEqual(job.attempts, attempt)
+            with self.assertLogs("jobs.queue"):
+                run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIsNotNone(job.finished_at)
+        Job.objects.update(run_at=timezone.now())
+        self.assertEqual(claim_jobs("worker-1", 1), [])
+
+    def test_requeue_stale_returns_only_expired_locks(self):
+        stale, fresh = enqueue("tests.ok"), enqueue("tests.ok")
+        claim_jobs("worker-1", 2)
+        Job.objects.filter(pk=stale.pk).update(locked_at=timezone.now() - timedelta(seconds=700))
+
+        self.assertEqual(requeue_stale(timeout=600), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((stale.status, stale.locked_by), (Job.QUEUED, ""))
+        self.assertEqual(fresh.status, Job.RUNNING)
+
+    def test_requeued_job_is_not_finished_by_the_old_worker(self):
+        enqueue("tests.ok")
+        [old] = claim_jobs("worker-1", 1)
+        requeue_stale(timeout=-1)
+        [new] = claim_jobs("worker-2", 1)
+
+        self.assertTrue(run_job(old))
+        new.refresh_from_db()
+        self.assertEqual((new.status, new.locked_by, new.attempts), (Job.RUNNING, "worker-2", 2))
+
+
+class HeartbeatTests(TransactionTestCase):
+    """Heartbeat zapisuje z vlastného vlákna – úloha musí byť naozaj potvrdená"""
+
+    @override_settings(JOBS_HEARTBEAT_INTERVAL=0.05)
+    def test_running_job_is_not_requeued(self):
+        _seen.clear()
+        job = enqueue("tests.slow", {"seconds": 0.5})
+        [claimed] = claim_jobs("worker-1", 1)
+        self.assertTrue(run_job(claimed))
+
+        self.assertEqual(_seen, [0])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.DONE, 1))
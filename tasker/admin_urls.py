@@ -0,0 +1,6 @@
+# Admin pri TASK_FAST_BOOT – tasker/urls.py tento modul importuje až pri prvom prístupe
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
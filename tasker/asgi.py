@@ -1,6 +1,14 @@
 import os
-from django.core.asgi import get_asgi_application
+
+from tasker import boot
+
+boot.begin()
+
+from django.core.asgi import get_asgi_application  # noqa: E402
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tasker.settings')
 
 application = get_asgi_application()
+
+# Server začne prijímať požiadavky až po zahriatí
+boot.finish()
@@ -0,0 +1,180 @@
+# tasker/boot.py
+"""Štart workera – zahriatie cache pred prvou požiadavkou a meranie štartu
+
+wsgi.py/asgi.py volajú begin() pred importom Djanga a finish() po vytvorení
+aplikácie. Pri TASK_FAST_BOOT je cyklický GC počas importov vypnutý a po štarte
+sa objekty zmrazia (gc.freeze); pri TASK_BOOT_WARMUP prvá požiadavka neplatí
+za naplnenie URL resolvera, kompiláciu šablón ani načítanie prekladov.
+probe() spúšťa príkaz profile_startup v čerstvom procese s -X importtime.
+
+Modul sa importuje pred Djangom, preto všetky importy Djanga sú vo funkciách.
+"""
+
+import gc
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Trvanie krokov posledného warm_up() v ms – číta ho probe()
+last_warm_up = {}
+
+_gc_paused = False
+
+
+def _fast_boot():
+    # Settings ešte nie sú načítané – rovnaké pravidlo ako TASK_FAST_BOOT v settings.py
+    return os.environ.get("TASK_FAST_BOOT", "False").lower() in ("1", "true", "yes")
+
+
+def begin():
+    """Pred importom Djanga: pri TASK_FAST_BOOT vypne cyklický GC
+
+    Štart vytvorí desaťtisíce objektov (moduly, triedy, modely) a GC by ich počas
+    importov opakovane prechádzal, vrátane úplnej kolekcie. Platí len pre
+    TASK_FAST_BOOT z prostredia procesu, nie z .env (ten sa číta až v settings).
+    """
+    global _gc_paused
+    if _fast_boot() and gc.isenabled():
+        gc.disable()
+        _gc_paused = True
+
+
+def finish():
+    """Po vytvorení aplikácie: zahriatie a zapnutie GC so zmrazenými objektmi štartu"""
+    global _gc_paused
+    from django.conf import settings
+
+    if settings.TASK_BOOT_WARMUP:
+        warm_up()
+    if _gc_paused:
+        # Objekty zo štartu žijú do konca procesu – v permanentnej generácii ich GC
+        # už neprechádza a po fork (gunicorn --preload) sa ich stránky nekopírujú
+        gc.freeze()
+        gc.enable()
+        _gc_paused = False
+
+
+@contextmanager
+def _timed(timings, step):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[step] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def _project_templates(engine):
+    """Mená šablón v DIRS projektu – šablóny knižníc (allauth, admin) sa načítajú podľa potreby"""
+    for directory in engine.dirs:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                yield os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/')
+
+
+def compile_templates():
+    """Skompiluje šablóny projektu do cached loadera (Django ho používa predvolene)
+
+    Vracia počet skompilovaných šablón; chybná šablóna štart nezastaví –
+    chyba sa zaloguje a prejaví sa až pri požiadavke ako bez zahriatia.
+    """
+    from django.template import TemplateSyntaxError, engines
+    from django.template.backends.django import DjangoTemplates
+
+    compiled = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in _project_templates(backend.engine):
+            try:
+                backend.engine.get_template(name)
+            except (TemplateSyntaxError, UnicodeDecodeError) as exc:
+                logger.warning("Šablónu %s sa nepodarilo skompilovať: %s", name, exc)
+                continue
+            compiled += 1
+    return compiled
+
+
+def warm_up():
+    """Naplní cache procesu pred prijímaním požiadaviek; vracia {krok: ms}
+
+    Bez prístupu k databáze – spojenia sú viazané na vlákno, ktoré požiadavky
+    obsluhuje, a nedostupná DB nesmie zabrániť štartu workera.
+    """
+    from django.conf import settings
+    from django.urls import get_resolver
+    from django.utils import translation
+
+    timings = {}
+    with _timed(timings, 'urls'):
+        # Import všetkých views a tabuľka pre reverse(); admin pri TASK_FAST_BOOT ostane lenivý
+        get_resolver().reverse_dict
+    with _timed(timings, 'templates'):
+        compile_templates()
+    with _timed(timings, 'translations'):
+        translation.activate(settings.LANGUAGE_CODE)
+        translation.deactivate()
+
+    last_warm_up.clear()
+    last_warm_up.update(timings)
+    logger.info("Worker zahriaty: %s", timings)
+    return timings
+
+
+def _wsgi_request(application, path, host):
+    """Jedna GET požiadavka priamo cez WSGI handler; vracia stavový kód"""
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'HTTP_HOST': host,
+        # HTTPS, aby SECURE_SSL_REDIRECT mimo DEBUG nemeral len presmerovanie
+        'wsgi.url_scheme': 'https', 'HTTPS': 'on', 'SERVER_PORT': '443',
+    }
+    setup_testing_defaults(environ)
+    status = []
+    response = application(environ, lambda line, headers, exc_info=None: status.append(line))
+    try:
+        for _ in response:
+            pass
+    finally:
+        if hasattr(response, 'close'):
+            response.close()
+    return int(status[0].split()[0])
+
+
+def probe(path='/accounts/login/', host='startup-probe.invalid'):
+    """Fázy štartu procesu v ms ako jeden JSON riadok na stdout
+
+    Poradie zodpovedá WSGI serveru: settings → django.setup() → modul
+    WSGI_APPLICATION (handler, middleware, finish()) → prvá a druhá požiadavka.
+    """
+    phases = {}
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tasker.settings')
+    # Ako wsgi.py – GC sa vypína pred prvým importom Djanga, nie až v module aplikácie
+    begin()
+    with _timed(phases, 'settings'):
+        from django.conf import settings
+        settings.INSTALLED_APPS
+    with _timed(phases, 'setup'):
+        import django
+        django.setup(set_prefix=False)
+    with _timed(phases, 'application'):
+        from django.utils.module_loading import import_string
+        application = import_string(settings.WSGI_APPLICATION)
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, host]
+    with _timed(phases, 'first_request'):
+        status = _wsgi_request(application, path, host)
+    with _timed(phases, 'second_request'):
+        _wsgi_request(application, path, host)
+
+    print(json.dumps({
+        'phases': phases,
+        'warm_up': dict(last_warm_up),
+        'status': status,
+        'fast_boot': settings.TASK_FAST_BOOT,
+        'modules': len(sys.modules),
+    }))
@@ -1,6 +1,6 @@
 import os
+import tempfile
 from pathlib import Path
-from dotenv import load_dotenv
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.log import DEFAULT_LOGGING
 
@@ -8,7 +8,11 @@ from django.utils.log import DEFAULT_LOGGING
 BASE_DIR = Path(__file__).resolve().parent.parent
 # Uisti sa, že load_dotenv hľadá .env v BASE_DIR
 dotenv_path = BASE_DIR / ".env"
-load_dotenv(dotenv_path)
+# python-dotenv len ak .env existuje – v kontajneroch ide konfigurácia z prostredia
+# a import by len predĺžil štart každého workera
+if dotenv_path.exists():
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path)
 
 def get_env(name: str, default=None, required: bool = False):
     """Získa hodnotu z prostredia, alebo vyvolá výnimku ak required."""
@@ -35,8 +39,16 @@ ALLOWED_HOSTS = get_env("DJANGO_ALLOWED_HOSTS", "").split(",")
 
 # ------- Aplikácie, middleware, šablóny -------
 
+# Rýchly štart workera (tasker/boot.py): admin.py moduly sa načítajú až pri prvej
+# požiadavke pod /admin/ a pred prijímaním požiadaviek sa zahrejú cache.
+# Len pre webové workery – `manage.py check` bez neho kontroluje aj registráciu adminu
+TASK_FAST_BOOT = get_env("TASK_FAST_BOOT", "False").lower() in ("1", "true", "yes")
+# Zahriatie v wsgi.py/asgi.py: URL resolver, šablóny projektu, preklady
+TASK_BOOT_WARMUP = get_env("TASK_BOOT_WARMUP", str(TASK_FAST_BOOT)).lower() in ("1", "true", "yes")
+
 INSTALLED_APPS = [
-    "django.contrib.admin",
+    # SimpleAdminConfig nespúšťa autodiscover – spraví ho tasker/admin_urls.py
+    "django.contrib.admin.apps.SimpleAdminConfig" if TASK_FAST_BOOT else "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -46,14 +58,19 @@ INSTALLED_APPS = [
     "allauth",
     "allauth.account",
     "tasks",
+    "jobs",
 ]
 
 MIDDLEWARE = [
+    # Prvý v poradí, aby meral aj session a prihlásenie; bez TASK_INSTRUMENTATION sa vypne
+    'tasks.instrumentation.QueryTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Po prihlásení – história úloh (tasks/audit.py) zapisuje, kto zmenu urobil
+    'tasks.audit.AuditActorMiddleware',
     'allauth.account.middleware.AccountMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -82,9 +99,199 @@ WSGI_APPLICATION = "tasker.wsgi.application"
 # ------- Databáza -------
 
 import dj_database_url
+
+# Perzistentné spojenia: počet sekúnd, "none" = bez limitu, 0 (predvolene) = nové spojenie
+# pre každú požiadavku. Zapína sa v prostredí, napr. DATABASE_CONN_MAX_AGE=60.
+_conn_max_age = get_env("DATABASE_CONN_MAX_AGE", "0")
+# Režim poolu pre PostgreSQL: "" (žiadny), "pgbouncer" (externý pooler v transaction
+# móde – bez server-side kurzorov), "native" (psycopg pool, vyžaduje Django 5.1+)
+DATABASE_POOL = get_env("DATABASE_POOL", "").lower()
+if DATABASE_POOL not in ("", "pgbouncer", "native"):
+    raise ImproperlyConfigured(f"Unknown DATABASE_POOL '{DATABASE_POOL}'.")
+
 DATABASES = {
-    "default": dj_database_url.config(default=get_env("DATABASE_URL", "sqlite:///db.sqlite3"))
+    "default": dj_database_url.config(
+        default=get_env("DATABASE_URL", "sqlite:///db.sqlite3"),
+        conn_max_age=None if _conn_max_age.lower() == "none" else int(_conn_max_age),
+        conn_health_checks=get_env("DATABASE_CONN_HEALTH_CHECKS", "True").lower() in ("1", "true", "yes"),
+        disable_server_side_cursors=DATABASE_POOL == "pgbouncer",
+    )
+}
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    # Testovacia DB v súbore – zdieľaná pamäť pri súbežných spojeniach hlási
+    # "database table is locked" namiesto čakania na zámok (súbežné testy úprav)
+    # Mimo repozitára, v dočasnom adresári systému; test runner ju na konci zmaže
+    DATABASES["default"]["TEST"] = {"NAME": os.path.join(tempfile.gettempdir(), "tasker_test_db.sqlite3")}
+
+if DATABASE_POOL == "native":
+    import django
+    if django.VERSION < (5, 1):
+        raise ImproperlyConfigured("DATABASE_POOL=native requires Django 5.1 or newer.")
+    # Pool drží spojenia sám, perzistentné spojenia Djanga sa s ním nesmú kombinovať
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = True
+
+# SQLite: WAL, busy_timeout a synchronous=NORMAL pri každom novom spojení (tasks/db.py).
+# Vypnuté predvolene – WAL sa zapíše do súboru databázy natrvalo a vedľa neho
+# pribudnú súbory -wal a -shm (zálohy a kópie databázy s nimi musia počítať)
+SQLITE_TUNING = get_env("SQLITE_TUNING", "False").lower() in ("1", "true", "yes")
+SQLITE_BUSY_TIMEOUT = int(get_env("SQLITE_BUSY_TIMEOUT", "5000"))
+
+# ------- Cache -------
+
+# DJANGO_CACHE_BACKEND: locmem (predvolene), file, redis, memcached alebo dummy.
+# locmem je len v rámci jedného procesu – pri viacerých workeroch použi redis/memcached,
+# inak zneplatnenie cache z jedného procesu ostatné neuvidia.
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "memcached": "django.core.cache.backends.memcached.PyMemcacheCache",
+    "dummy": "django.core.cache.backends.dummy.DummyCache",
+}
+_cache_backend = get_env("DJANGO_CACHE_BACKEND", "locmem")
+if _cache_backend not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"Unknown DJANGO_CACHE_BACKEND '{_cache_backend}'.")
+if _cache_backend in ("redis", "memcached"):
+    _cache_location = get_env("DJANGO_CACHE_LOCATION", required=True)
+elif _cache_backend == "file":
+    _cache_location = get_env("DJANGO_CACHE_LOCATION", str(BASE_DIR / ".cache"))
+else:
+    _cache_location = get_env("DJANGO_CACHE_LOCATION", "tasker")
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[_cache_backend],
+        "LOCATION": _cache_location,
+        "TIMEOUT": int(get_env("DJANGO_CACHE_TIMEOUT", "300")),
+        "KEY_PREFIX": get_env("DJANGO_CACHE_KEY_PREFIX", "tasker"),
+    }
+}
+
+# ------- Session a správy -------
+
+# SESSION_STORAGE: db (predvolene), cached_db, cache alebo signed_cookies.
+# "cache" potrebuje zdieľaný cache backend, inak sa session stratí medzi workermi.
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cache": "django.contrib.sessions.backends.cache",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_STORAGE = get_env("SESSION_STORAGE", "db")
+if SESSION_STORAGE not in SESSION_ENGINES:
+    raise ImproperlyConfigured(f"Unknown SESSION_STORAGE '{SESSION_STORAGE}'.")
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STORAGE]
+
+# MESSAGES_STORAGE: fallback (cookie, pri pretečení session), cookie alebo session
+MESSAGE_STORAGES = {
+    "fallback": "django.contrib.messages.storage.fallback.FallbackStorage",
+    "cookie": "django.contrib.messages.storage.cookie.CookieStorage",
+    "session": "django.contrib.messages.storage.session.SessionStorage",
 }
+_message_storage = get_env("MESSAGES_STORAGE", "fallback")
+if _message_storage not in MESSAGE_STORAGES:
+    raise ImproperlyConfigured(f"Unknown MESSAGES_STORAGE '{_message_storage}'.")
+MESSAGE_STORAGE = MESSAGE_STORAGES[_message_storage]
+
+# Počet riadkov django_session zmazaných jedným DELETE (clear_expired_sessions)
+SESSION_CLEANUP_BATCH_SIZE = int(get_env("SESSION_CLEANUP_BATCH_SIZE", "1000"))
+
+# ------- Zoznam úloh -------
+
+TASK_LIST_PAGE_SIZE = int(get_env("TASK_LIST_PAGE_SIZE", "25"))
+# Streamovaná odpoveď: prvé riadky idú do prehliadača skôr, než sa načítajú posledné
+TASK_LIST_STREAMING = get_env("TASK_LIST_STREAMING", "False").lower() in ("1", "true", "yes")
+TASK_LIST_STREAM_CHUNK_SIZE = int(get_env("TASK_LIST_STREAM_CHUNK_SIZE", "100"))
+
+# Fulltextové vyhľadávanie (tasks/search.py): prázdne = podľa databázy
+# (SQLite FTS5 / PostgreSQL tsvector), inak bodkovaná cesta k backendu
+TASK_SEARCH_BACKEND = get_env("TASK_SEARCH_BACKEND", "")
+TASK_SEARCH_LIMIT = int(get_env("TASK_SEARCH_LIMIT", "50"))
+
+# Async views (tasks/async_views.py) pre nasadenie pod ASGI serverom
+TASK_ASYNC_VIEWS = get_env("TASK_ASYNC_VIEWS", "False").lower() in ("1", "true", "yes")
+
+# Veľkosť dávky pri streamovaní ndjson z API (tasks/api.py)
+TASK_API_CHUNK_SIZE = int(get_env("TASK_API_CHUNK_SIZE", "500"))
+
+# Najviac úloh v jednej hromadnej akcii (tasks/bulk.py)
+TASK_BULK_MAX_IDS = int(get_env("TASK_BULK_MAX_IDS", "500"))
+
+# Archív (príkaz archive_tasks): dokončené úlohy bez zmeny dlhšie ako toľko dní
+# sa presúvajú do ArchivedTask po dávkach; zoznam a API ich ukážu s ?archived=1
+TASK_ARCHIVE_AFTER_DAYS = int(get_env("TASK_ARCHIVE_AFTER_DAYS", "90"))
+TASK_ARCHIVE_BATCH_SIZE = int(get_env("TASK_ARCHIVE_BATCH_SIZE", "1000"))
+
+# História úloh (príkaz compact_task_events): záznamy staršie ako toľko dní
+# sa zlúčia do jedného SNAPSHOT na úlohu
+TASK_EVENT_COMPACT_AFTER_DAYS = int(get_env("TASK_EVENT_COMPACT_AFTER_DAYS", "180"))
+
+# Admin: filtrovaný zoznam úloh sa počíta najviac po tento limit (tasks/pagination.py)
+TASK_ADMIN_COUNT_LIMIT = int(get_env("TASK_ADMIN_COUNT_LIMIT", "10000"))
+
+# Zdroj štatistík: "aggregate" (predvolene, COUNT nad tabuľkou úloh) alebo "counters"
+# (TaskCounters + histogram termínov, tasks/counters.py). Počítadlá sa udržiavajú len
+# pri "counters"; hneď po zapnutí ich z tabuľky úloh postav príkazom reconcile_task_counters.
+TASK_STATS_SOURCE = get_env("TASK_STATS_SOURCE", "aggregate")
+if TASK_STATS_SOURCE not in ("counters", "aggregate"):
+    raise ImproperlyConfigured(f"Unknown TASK_STATS_SOURCE '{TASK_STATS_SOURCE}'.")
+
+# Počty úloh v cache, udržiavané signálmi na Task (tasks/signals.py); vyžaduje zdieľaný cache backend
+TASK_STATS_CACHE = get_env("TASK_STATS_CACHE", "False").lower() in ("1", "true", "yes")
+TASK_STATS_CACHE_TIMEOUT = int(get_env("TASK_STATS_CACHE_TIMEOUT", "86400"))
+
+# HTML fragmenty zoznamu (tabuľka, štatistiky) v cache, verzie posúvajú signály na Task;
+# vyžaduje zdieľaný cache backend
+TASK_FRAGMENT_CACHE = get_env("TASK_FRAGMENT_CACHE", "False").lower() in ("1", "true", "yes")
+TASK_FRAGMENT_CACHE_TIMEOUT = int(get_env("TASK_FRAGMENT_CACHE_TIMEOUT", "600"))
+
+# Skupiny používateľa v cache medzi požiadavkami (zneplatňuje m2m_changed).
+# Odobratá skupina by s neviditeľným zneplatnením oprávňovala ďalej. Krátky timeout je poistka.
+TASK_ROLES_CACHE = get_env("TASK_ROLES_CACHE", "False").lower() in ("1", "true", "yes")
+TASK_ROLES_CACHE_TIMEOUT = int(get_env("TASK_ROLES_CACHE_TIMEOUT", "60"))
+
+# Zneplatnenie týchto cache (zmazanie kľúča, posun verzie) musia vidieť všetky procesy –
+# s locmem by ostatné workery servírovali zastarané hodnoty až do vypršania timeoutu
+for _name, _enabled in (
+    ("TASK_STATS_CACHE", TASK_STATS_CACHE),
+    ("TASK_FRAGMENT_CACHE", TASK_FRAGMENT_CACHE),
+    ("TASK_ROLES_CACHE", TASK_ROLES_CACHE),
+):
+    if _enabled and _cache_backend == "locmem":
+        raise ImproperlyConfigured(
+            f"{_name} requires a shared DJANGO_CACHE_BACKEND (redis, memcached or file), not locmem."
+        )
+
+# Meranie dotazov a latencie požiadaviek (tasks/instrumentation.py), vzorky ako JSON riadky
+TASK_INSTRUMENTATION = get_env("TASK_INSTRUMENTATION", "False").lower() in ("1", "true", "yes")
+TASK_INSTRUMENTATION_LOG = get_env("TASK_INSTRUMENTATION_LOG", str(BASE_DIR / "request_timings.jsonl"))
+
+# Pripomienky termínov (tasks/reminders.py, príkaz send_task_reminders):
+# koľko dní vopred, ako ďaleko dozadu pri prvom behu, správ na dávku jedného spojenia
+TASK_REMINDER_DAYS = int(get_env("TASK_REMINDER_DAYS", "1"))
+TASK_REMINDER_LOOKBACK_DAYS = int(get_env("TASK_REMINDER_LOOKBACK_DAYS", "7"))
+TASK_REMINDER_BATCH_SIZE = int(get_env("TASK_REMINDER_BATCH_SIZE", "100"))
+TASK_REMINDER_BASE_URL = get_env("TASK_REMINDER_BASE_URL", "http://localhost:8000")
+
+# ------- Úlohy na pozadí (jobs) -------
+
+# Email cez frontu: požiadavka správu len zaradí, odošle ju `manage.py run_worker`
+# skutočným backendom JOBS_EMAIL_BACKEND. Vyžaduje bežiaci worker.
+JOBS_QUEUE_EMAIL = get_env("JOBS_QUEUE_EMAIL", "False").lower() in ("1", "true", "yes")
+JOBS_MAX_ATTEMPTS = int(get_env("JOBS_MAX_ATTEMPTS", "5"))
+# Čakanie pred opakovaním: JOBS_BACKOFF_BASE * 2^(pokus-1) sekúnd, najviac JOBS_BACKOFF_MAX
+JOBS_BACKOFF_BASE = float(get_env("JOBS_BACKOFF_BASE", "10"))
+JOBS_BACKOFF_MAX = float(get_env("JOBS_BACKOFF_MAX", "3600"))
+# Úloha RUNNING bez obnovenia zámku dlhšie ako toto (sekundy) patrí spadnutému workerovi
+# a vráti sa do fronty; bežiaca úloha obnovuje zámok každých JOBS_HEARTBEAT_INTERVAL sekúnd
+JOBS_LOCK_TIMEOUT = int(get_env("JOBS_LOCK_TIMEOUT", "600"))
+JOBS_HEARTBEAT_INTERVAL = float(get_env("JOBS_HEARTBEAT_INTERVAL", "60"))
+if not 0 < JOBS_HEARTBEAT_INTERVAL < JOBS_LOCK_TIMEOUT:
+    raise ImproperlyConfigured("JOBS_HEARTBEAT_INTERVAL must be positive and shorter than JOBS_LOCK_TIMEOUT.")
+JOBS_BATCH_SIZE = int(get_env("JOBS_BATCH_SIZE", "10"))
+JOBS_POLL_INTERVAL = float(get_env("JOBS_POLL_INTERVAL", "1.0"))
 
 # ------- Heslovanie, validátory, medzinárodné -------
 
@@ -140,7 +347,11 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 # Email backend pre development - vypíše emaily do konzoly
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+EMAIL_BACKEND = get_env("EMAIL_BACKEND", 'django.core.mail.backends.console.EmailBackend')
+# Pri JOBS_QUEUE_EMAIL odosiela worker pôvodným backendom, požiadavky len zaraďujú
+JOBS_EMAIL_BACKEND = EMAIL_BACKEND
+if JOBS_QUEUE_EMAIL:
+    EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend'
 
 # Allauth nastavenia pre email verifikáciu
 SITE_ID = 1
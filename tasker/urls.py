@@ -1,15 +1,24 @@
 from django.contrib import admin
-from django.urls import path, include
-from tasks import views
+from django.urls import URLResolver, path, include
+from django.urls.resolvers import RoutePattern
 from django.conf import settings
 from django.conf.urls.static import static
-from tasks import views
+from tasks import urls as task_urls
+
+if settings.TASK_FAST_BOOT:
+    # Resolver s menným priestorom sa pri reverse() iných URL nenačítava – modul
+    # (a s ním autodiscover adminu) sa importuje až pri prvom použití adminu
+    admin_urls = URLResolver(
+        RoutePattern('admin/', is_endpoint=False), 'tasker.admin_urls', app_name='admin', namespace='admin',
+    )
+else:
+    admin_urls = path('admin/', admin.site.urls)
 
 urlpatterns = [
-    path('', views.task_list, name='task_list'),
+    path('', task_urls.task_list, name='task_list'),
     path('tasks/', include('tasks.urls')),
     path('accounts/', include('allauth.urls')),
-    path('admin/', admin.site.urls),
+    admin_urls,
 ]
 
 
@@ -1,6 +1,14 @@
 import os
-from django.core.wsgi import get_wsgi_application
+
+from tasker import boot
+
+boot.begin()
+
+from django.core.wsgi import get_wsgi_application  # noqa: E402
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tasker.settings')
 
 application = get_wsgi_application()
+
+# Server (napr. gunicorn --preload) začne prijímať požiadavky až po zahriatí
+boot.finish()
@@ -1,8 +1,78 @@
 from django.contrib import admin
-from .models import Task
+from .bulk import set_completed
+from .models import ArchivedTask, Task, TaskCounters, TaskEvent
+from .pagination import EstimatedCountPaginator, estimated_count
+from .search import get_search_backend
+from .stats import ALL_SCOPE
+
+
+class TaskPaginator(EstimatedCountPaginator):
+    def estimate(self):
+        # Presný počet všetkých úloh udržiava TaskCounters – jeden riadok namiesto COUNT(*)
+        total = TaskCounters.objects.filter(scope=ALL_SCOPE).values_list('total', flat=True).first()
+        return total if total is not None else estimated_count(Task)
+
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
-    list_display = ("title", "due_date", "completed")
+    list_display = ("title", "user", "due_date", "status", "completed")
+    search_fields = ("title", "description")
+    list_filter = ("completed", "due_date")
+    # Vlastník v jednom JOIN-e, výber vlastníka cez vyhľadávanie namiesto <select> všetkých používateľov
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
+    # Bez druhého COUNT(*) nad celou tabuľkou pri filtrovaní
+    show_full_result_count = False
+    paginator = TaskPaginator
+    actions = ("mark_completed", "mark_pending")
+
+    def get_search_results(self, request, queryset, search_term):
+        """Fulltextový index namiesto icontains cez search_fields"""
+        if not search_term.strip():
+            return queryset, False
+        return get_search_backend().search(queryset, search_term), False
+
+    @admin.action(description="Označiť ako dokončené", permissions=["change"])
+    def mark_completed(self, request, queryset):
+        updated = set_completed(queryset, True)
+        self.message_user(request, f"Dokončených úloh: {updated}")
+
+    @admin.action(description="Označiť ako čakajúce", permissions=["change"])
+    def mark_pending(self, request, queryset):
+        updated = set_completed(queryset, False)
+        self.message_user(request, f"Čakajúcich úloh: {updated}")
+
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(admin.ModelAdmin):
+    list_display = ("title", "user", "due_date", "updated_at", "archived_at")
+    list_select_related = ("user",)
     search_fields = ("title",)
-    list_filter = ("completed", "due_date")
\ No newline at end of file
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TaskEvent)
+class TaskEventAdmin(admin.ModelAdmin):
+    list_display = ("task_id", "action", "owner", "actor", "created_at")
+    list_filter = ("action",)
+    list_select_related = ("owner", "actor")
+    search_fields = ("=task_id",)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    # História je len pridávaná – v admine sa iba číta
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,236 @@
+# tasks/api.py
+"""JSON/ndjson API nad úlohami pre prehliadač prihláseného používateľa
+
+API používa session z prihlásenia cez web – iné prihlásenie (tokeny) nemá.
+Zápisy (POST, PATCH, PUT, DELETE) preto prechádzajú CsrfViewMiddleware ako
+formuláre: klient musí poslať hlavičku X-CSRFToken s hodnotou cookie csrftoken.
+Klienti mimo prehliadača môžu API len čítať, a to tiež so session cookie.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.forms.models import model_to_dict
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_etags, quote_etag
+from django.views.decorators.http import require_http_methods
+
+from .forms import TaskForm
+from .models import Task, TaskConflict
+from .pagination import KeysetPaginator
+from .queries import filter_tasks, visible_tasks
+from .roles import resolve_roles
+
+# Polia vrátené v API (rovnaké pre JSON aj ndjson)
+API_FIELDS = ('id', 'title', 'description', 'due_date', 'status', 'completed',
+              'user_id', 'created_at', 'updated_at', 'version')
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+
+def api_login_required(view):
+    """Ako login_required, ale namiesto presmerovania vráti 401 JSON"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Prihlásenie je povinné.'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def serialize_task(row, today):
+    """Slovník pre JSON z hodnôt úlohy (dict z .values() alebo inštancia)"""
+    if not isinstance(row, dict):
+        # Inštancia Task alebo ArchivedTask
+        row = {field: getattr(row, field) for field in API_FIELDS}
+    data = {field: row[field] for field in API_FIELDS}
+    data['is_overdue'] = bool(row['due_date'] and not row['completed'] and row['due_date'] < today)
+    return data
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, encoder=DjangoJSONEncoder)
+
+
+def _parse_body(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _wants_ndjson(request):
+    return (request.GET.get('format') == 'ndjson'
+            or NDJSON_CONTENT_TYPE in request.headers.get('Accept', ''))
+
+
+def _wants_archived(request):
+    return request.GET.get('archived') == '1'
+
+
+def list_etag(request, state, variant):
+    """ETag zoznamu z agregátu {last_modified: max(updated_at), rows: počet}
+
+    Zoznam neposiela Last-Modified: zmazanie alebo archivácia úlohy max(updated_at)
+    nezvýši, klient s If-Modified-Since by dostal 304 so zastaraným zoznamom.
+    Zmenu počtu zachytí len ETag.
+    """
+    last_modified = state['last_modified']
+    stamp = last_modified.isoformat() if last_modified else '-'
+    raw = f"{request.user.pk}|{variant}|{stamp}|{state['rows']}"
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+def _with_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_vary_headers(response, ('Cookie', 'Accept'))
+    return response
+
+
+@api_login_required
+@require_http_methods(['GET', 'HEAD', 'POST'])
+def api_task_list(request):
+    """GET: zoznam úloh (JSON so stránkovaním alebo ndjson stream), POST: nová úloha"""
+    if request.method == 'POST':
+        return _api_task_create(request)
+
+    archived = _wants_archived(request)
+    all_tasks, _ = visible_tasks(request.user, archived=archived)
+    filter_by = request.GET.get('filter', 'all')
+    cursor = request.GET.get('cursor')
+    today = timezone.now().date()
+    tasks = filter_tasks(all_tasks, filter_by, today)
+
+    ndjson = _wants_ndjson(request)
+    variant = f"{filter_by}|{cursor}|{'ndjson' if ndjson else 'json'}|{'archived' if archived else 'hot'}"
+    state = tasks.aggregate(last_modified=Max('updated_at'), rows=Count('id'))
+    etag = list_etag(request, state, variant)
+
+    # Nezmenené dáta → 304 bez serializácie
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return _with_validators(not_modified, etag, None)
+
+    if ndjson:
+        rows = tasks.order_by(*KeysetPaginator.ordering).values(*API_FIELDS)
+
+        def lines():
+            for row in rows.iterator(chunk_size=settings.TASK_API_CHUNK_SIZE):
+                yield json.dumps(serialize_task(row, today), cls=DjangoJSONEncoder) + '\n'
+
+        response = StreamingHttpResponse(lines(), content_type=NDJSON_CONTENT_TYPE)
+        return _with_validators(response, etag, None)
+
+    page = KeysetPaginator(tasks.only(*API_FIELDS), per_page=settings.TASK_LIST_PAGE_SIZE).page(cursor)
+    response = _json({
+        'results': [serialize_task(task, today) for task in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+    return _with_validators(response, etag, None)
+
+
+def _api_task_create(request):
+    if not request.user.has_perm('tasks.add_task'):
+        return _json({'error': 'Nemáte oprávnenie vytvárať úlohy.'}, status=403)
+    data = _parse_body(request)
+    if data is None:
+        return _json({'error': 'Očakáva sa JSON objekt.'}, status=400)
+
+    form = TaskForm(data)
+    if not form.is_valid():
+        return _json({'errors': form.errors}, status=400)
+    task = form.save(commit=False)
+    task.user = request.user
+    task.save()
+    return _json(serialize_task(task, timezone.now().date()), status=201)
+
+
+@api_login_required
+@require_http_methods(['GET', 'HEAD', 'PATCH', 'PUT', 'DELETE'])
+def api_task_detail(request, pk):
+    """Detail, úprava (PATCH/PUT) a zmazanie jednej úlohy"""
+    if request.method not in ('GET', 'HEAD'):
+        return task_detail_write(request, pk)
+
+    visible, _ = visible_tasks(request.user)
+    try:
+        task = visible.get(pk=pk)
+    except Task.DoesNotExist:
+        return _json({'error': 'Úloha neexistuje.'}, status=404)
+    return task_detail_response(request, task, timezone.now().date())
+
+
+def task_etag(task):
+    # Verzia sa mení pri každom zápise – If-Match s týmto ETagom je podmienená úprava
+    return quote_etag(f"{task.pk}-{task.version}")
+
+
+def task_detail_response(request, task, today):
+    """GET detailu s ETag podľa verzie a Last-Modified podľa updated_at"""
+    etag = task_etag(task)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=task.updated_at)
+    if not_modified is not None:
+        return _with_validators(not_modified, etag, task.updated_at)
+    return _with_validators(_json(serialize_task(task, today)), etag, task.updated_at)
+
+
+def task_detail_write(request, pk):
+    """PATCH/PUT/DELETE jednej úlohy s rovnakými pravidlami ako HTML views"""
+    visible, _ = visible_tasks(request.user)
+    try:
+        task = visible.get(pk=pk)
+    except Task.DoesNotExist:
+        return _json({'error': 'Úloha neexistuje.'}, status=404)
+    roles = resolve_roles(request.user)
+
+    if request.method == 'DELETE':
+        if not roles.can_delete and task.user_id != request.user.pk:
+            return _json({'error': 'Nemáte oprávnenie zmazať túto úlohu.'}, status=403)
+        task.delete()
+        return HttpResponse(status=204)
+
+    if not roles.can_edit and task.user_id != request.user.pk:
+        return _json({'error': 'Nemáte oprávnenie upravovať túto úlohu.'}, status=403)
+    data = _parse_body(request)
+    if data is None:
+        return _json({'error': 'Očakáva sa JSON objekt.'}, status=400)
+    if request.method == 'PATCH':
+        # Čiastočná úprava – chýbajúce polia ostanú pôvodné
+        data = {**model_to_dict(task, fields=TaskForm.Meta.fields), **data}
+
+    # If-Match: úprava len nad verziou, ktorú klient naposledy videl
+    if_match = request.headers.get('If-Match')
+    if if_match and task_etag(task) not in parse_etags(if_match) and if_match.strip() != '*':
+        return _conflict(task, status=412)
+
+    form = TaskForm(data, instance=task)
+    if not form.is_valid():
+        return _json({'errors': form.errors}, status=400)
+    try:
+        task = form.save_versioned()
+    except TaskConflict:
+        current = visible.filter(pk=pk).first()
+        if current is None:
+            return _json({'error': 'Úloha neexistuje.'}, status=404)
+        return _conflict(current)
+    return _with_validators(_json(serialize_task(task, timezone.now().date())), task_etag(task), None)
+
+
+def _conflict(current, status=409):
+    """Súbežná zmena – klient dostane aktuálny stav a novú verziu na opätovný pokus"""
+    response = _json({
+        'error': 'Úlohu medzitým zmenil niekto iný.',
+        'current': serialize_task(current, timezone.now().date()),
+    }, status=status)
+    response['ETag'] = task_etag(current)
+    return response
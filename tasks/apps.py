@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+class TasksConfig(AppConfig):
+    name = 'tasks'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .db import tune_sqlite
+        from .search import clear_search_backend_cache
+
+        connection_created.connect(tune_sqlite, dispatch_uid='tasks.tune_sqlite')
+        # Migrácia mohla FTS tabuľku vytvoriť alebo zmazať
+        post_migrate.connect(clear_search_backend_cache, dispatch_uid='tasks.clear_search_backend_cache')
@@ -0,0 +1,55 @@
+# tasks/archive.py
+"""Presun starých dokončených úloh do ArchivedTask
+
+Každá dávka je krátka samostatná transakcia (kópia + zmazanie najviac
+`batch_size` riadkov), takže zápisy používateľov nikdy nečakajú na celý
+presun. Zmazanie ide bežným QuerySet.delete() – kaskáda (pripomienky) aj
+signály úloh upravia počty, fulltextový index, cache a históriu rovnako
+ako pri zmazaní z UI, len záznam v histórii je ARCHIVED.
+"""
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .audit import batched_events, deletes_recorded_as
+from .models import ArchivedTask, Task, TaskEvent
+
+ARCHIVE_FIELDS = ('id', 'title', 'description', 'due_date', 'status', 'completed',
+                  'user_id', 'created_at', 'updated_at', 'version')
+
+
+def archive_candidates(cutoff):
+    """Dokončené úlohy bez zmeny od `cutoff` (čiastočný index task_done_updated_idx)"""
+    return Task.objects.filter(completed=True, updated_at__lt=cutoff)
+
+
+def archive_batch(cutoff, batch_size):
+    """Presunie jednu dávku najstarších kandidátov; vracia počet presunutých úloh"""
+    with transaction.atomic():
+        candidates = archive_candidates(cutoff).order_by('updated_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            # Riadky, ktoré práve niekto upravuje, počkajú na ďalší beh
+            candidates = candidates.select_for_update(skip_locked=True)
+        rows = list(candidates.values(*ARCHIVE_FIELDS)[:batch_size])
+        if not rows:
+            return 0
+
+        now = timezone.now()
+        pks = [row['id'] for row in rows]
+        ArchivedTask.objects.bulk_create(
+            [ArchivedTask(archived_at=now, **row) for row in rows], ignore_conflicts=True,
+        )
+        with deletes_recorded_as(TaskEvent.ARCHIVED), batched_events():
+            Task.objects.filter(pk__in=pks).delete()
+    return len(rows)
+
+
+def archive_completed(cutoff, batch_size, max_batches=None):
+    """Presúva dávky, kým sú kandidáti; generuje počet presunutých úloh po každej dávke"""
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved:
+            return
+        batches += 1
+        yield moved
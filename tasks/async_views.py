@@ -0,0 +1,239 @@
+# tasks/async_views.py
+"""ASGI varianty zoznamu, prepnutia stavu a API nad async ORM
+
+Zapínajú sa nastavením TASK_ASYNC_VIEWS (pre nasadenie pod uvicorn/daphne).
+Šablóny a formuláre sú v Django synchrónne, preto sa vykresľujú cez
+sync_to_async – čítanie z databázy však beží bez obsadenia vlákna.
+"""
+
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import redirect, render
+from django.template.loader import get_template, render_to_string
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_http_methods, require_POST
+
+from . import api
+from .bulk import toggle_completed
+from .fragments import afragment_keys, fragment_context, render_stats, render_table
+from .models import Task
+from .queries import filter_tasks, visible_tasks
+from .roles import aresolve_roles
+from .pagination import KeysetPaginator
+from .search import get_search_backend
+from .stats import aget_stats, stats_scope
+from .views import (
+    _list_stats_scope, _page_query, _partial_error, _partial_format, _split_task_list, _task_list_context,
+    _task_list_query, _task_partial_response, _wants_archived, _wants_stream,
+)
+
+
+async def _aauthenticate(request):
+    """Načíta používateľa async a zapamätá ho aj ako request.user
+
+    Inak by prvý prístup k request.user (napr. v šablóne) spravil ďalší
+    synchrónny dotaz na ten istý riadok.
+    """
+    user = await request.auser()
+    request.user = user
+    if user.is_authenticated:
+        await aresolve_roles(user)
+    return user
+
+
+def async_login_required(view):
+    """login_required pre async views (Django 5.0 ho pre korutíny nemá)"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await _aauthenticate(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def async_api_login_required(view):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await _aauthenticate(request)
+        if not user.is_authenticated:
+            return api._json({'error': 'Prihlásenie je povinné.'}, status=401)
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@async_login_required
+async def task_list(request):
+    """Async verzia tasks.views.task_list"""
+    roles = await aresolve_roles(request.user)
+    today = timezone.now().date()
+    # Výber backendu pri prvom vyhľadávaní číta schému databázy – mimo event loopu
+    backend = await sync_to_async(get_search_backend)() if request.GET.get('q', '').strip() else None
+    all_tasks, can_see_all, filter_by, query, paginator = _task_list_query(request, today, backend)
+
+    cursor = request.GET.get('cursor')
+    archived = _wants_archived(request)
+    streaming = _wants_stream(request)
+    if streaming:
+        page = await paginator.astream(cursor, chunk_size=settings.TASK_LIST_STREAM_CHUNK_SIZE)
+    elif settings.TASK_FRAGMENT_CACHE and not archived:
+        return await _acached_task_list(request, roles, today, all_tasks, can_see_all, filter_by, query, paginator)
+    else:
+        page = await paginator.apage(cursor)
+
+    stats = await aget_stats(all_tasks, _list_stats_scope(request, can_see_all), today)
+
+    context = _task_list_context(
+        roles, page, stats, filter_by, query, can_see_all, archived, _page_query(request),
+    )
+    if streaming:
+        return await _astream_task_list(request, context)
+    return await sync_to_async(render)(request, "tasks/task_list.html", context)
+
+
+async def _acached_task_list(request, roles, today, all_tasks, can_see_all, filter_by, query, paginator):
+    """Async verzia tasks.views._cached_task_list"""
+    cursor = request.GET.get('cursor')
+    page_query = _page_query(request)
+    scope = stats_scope(None if can_see_all else request.user.pk)
+    keys = await afragment_keys(scope, request.user, roles, today, filter_by, query, cursor, page_query)
+    cached = await cache.aget_many(keys.values())
+    table = cached.get(keys['table'])
+    stats_html = cached.get(keys['stats'])
+
+    page = await paginator.apage(cursor) if table is None else None
+    stats = await aget_stats(all_tasks, scope, today) if stats_html is None else None
+    context = _task_list_context(roles, page, stats, filter_by, query, can_see_all, page_query=page_query)
+
+    missing = {}
+    if table is None:
+        table = missing[keys['table']] = await sync_to_async(render_table)(context, request)
+    if stats_html is None:
+        stats_html = missing[keys['stats']] = await sync_to_async(render_stats)(context, request)
+    if missing:
+        await cache.aset_many(missing, timeout=settings.TASK_FRAGMENT_CACHE_TIMEOUT)
+
+    context.update(fragment_context(table, stats_html, request))
+    return await sync_to_async(render)(request, "tasks/task_list.html", context)
+
+
+async def _astream_task_list(request, context):
+    parts, html = await sync_to_async(_split_task_list)(request, context)
+    if parts is None:
+        return StreamingHttpResponse([html])
+
+    head, middle, tail = parts
+    page = context['tasks']
+    rows_template = get_template("tasks/task_rows.html")
+    render_rows = sync_to_async(rows_template.render)
+
+    async def content():
+        yield head
+        async for chunk in page.achunks():
+            yield await render_rows({**context, 'tasks': chunk}, request)
+        yield middle
+        yield await sync_to_async(render_to_string)("tasks/task_pagination.html", context, request)
+        yield tail
+
+    return StreamingHttpResponse(content())
+
+
+@async_login_required
+@require_POST
+async def task_toggle_complete(request, pk):
+    """Async verzia tasks.views.task_toggle_complete"""
+    fmt = _partial_format(request)
+    roles = await aresolve_roles(request.user)
+    visible, _ = visible_tasks(request.user)
+    try:
+        task = await visible.aget(pk=pk)
+    except Task.DoesNotExist:
+        raise Http404("No Task matches the given query.")
+
+    if not roles.can_edit and task.user_id != request.user.pk:
+        if fmt:
+            return _partial_error(fmt, 'Nemáte oprávnenie upravovať túto úlohu.')
+        messages.error(request, 'Nemáte oprávnenie upravovať túto úlohu.')
+        return redirect('task_list')
+
+    try:
+        old_state, _ = await sync_to_async(toggle_completed)(task)
+    except Task.DoesNotExist:
+        raise Http404("No Task matches the given query.")
+
+    status = "dokončená" if task.completed else "nedokončená"
+    message = f'Úloha "{task.title}" je teraz {status}!'
+    if fmt:
+        return await sync_to_async(_task_partial_response)(
+            request, fmt, pk, task, old_state, task.stats_state(), message,
+        )
+    messages.success(request, message)
+    return redirect("task_list")
+
+
+@async_api_login_required
+@require_http_methods(['GET', 'HEAD', 'POST'])
+async def api_task_list(request):
+    """Async verzia tasks.api.api_task_list (POST ide cez sync_to_async)"""
+    if request.method == 'POST':
+        return await sync_to_async(api._api_task_create)(request)
+
+    archived = api._wants_archived(request)
+    all_tasks, _ = visible_tasks(request.user, archived=archived)
+    filter_by = request.GET.get('filter', 'all')
+    cursor = request.GET.get('cursor')
+    today = timezone.now().date()
+    tasks = filter_tasks(all_tasks, filter_by, today)
+
+    ndjson = api._wants_ndjson(request)
+    state = await tasks.aaggregate(last_modified=Max('updated_at'), rows=Count('id'))
+    etag = api.list_etag(
+        request, state, f"{filter_by}|{cursor}|{'ndjson' if ndjson else 'json'}|{'archived' if archived else 'hot'}",
+    )
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return api._with_validators(not_modified, etag, None)
+
+    if ndjson:
+        rows = tasks.order_by(*KeysetPaginator.ordering).values(*api.API_FIELDS)
+
+        async def lines():
+            async for row in rows.aiterator(chunk_size=settings.TASK_API_CHUNK_SIZE):
+                yield json.dumps(api.serialize_task(row, today), cls=DjangoJSONEncoder) + '\n'
+
+        response = StreamingHttpResponse(lines(), content_type=api.NDJSON_CONTENT_TYPE)
+        return api._with_validators(response, etag, None)
+
+    paginator = KeysetPaginator(tasks.only(*api.API_FIELDS), per_page=settings.TASK_LIST_PAGE_SIZE)
+    page = await paginator.apage(cursor)
+    response = api._json({
+        'results': [api.serialize_task(task, today) for task in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+    return api._with_validators(response, etag, None)
+
+
+@async_api_login_required
+@require_http_methods(['GET', 'HEAD', 'PATCH', 'PUT', 'DELETE'])
+async def api_task_detail(request, pk):
+    """Async verzia tasks.api.api_task_detail – zápisy idú cez sync_to_async"""
+    if request.method not in ('GET', 'HEAD'):
+        return await sync_to_async(api.task_detail_write)(request, pk)
+
+    visible, _ = visible_tasks(request.user)
+    try:
+        task = await visible.aget(pk=pk)
+    except Task.DoesNotExist:
+        return api._json({'error': 'Úloha neexistuje.'}, status=404)
+    return api.task_detail_response(request, task, timezone.now().date())
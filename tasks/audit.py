@@ -0,0 +1,196 @@
+# tasks/audit.py
+"""História zmien úloh (TaskEvent)
+
+Záznam z uloženia alebo zmazania sa zapíše v tej istej transakcii ako
+zmena – rollback vráti oboje naraz a potvrdená zmena nikdy nie je bez
+záznamu. Viac zmien v bloku batched_events() sa zapíše jedným bulk_create
+ešte pred jeho koncom. Hromadné operácie (bulk akcie, admin) zapisujú svoje
+záznamy priamo po dávkach cez write_events; archivácia maže cez signály a
+len prepne akciu (deletes_recorded_as).
+
+Kto zmenu urobil, nastavuje AuditActorMiddleware pre každú požiadavku;
+v príkazoch a workeroch je aktér prázdny (systém).
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime
+from itertools import islice
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from .models import TaskEvent
+
+# Polia, ktorých zmeny sa zaznamenávajú
+AUDIT_FIELDS = ('title', 'description', 'due_date', 'status', 'completed', 'user_id')
+
+EVENT_BATCH_SIZE = 1000
+
+_actor = ContextVar('task_audit_actor', default=None)
+# Akcia, pod ktorou sa zapíše zmazanie úlohy (archivácia maže cez ten istý Collector)
+_delete_action = ContextVar('task_audit_delete_action', default=TaskEvent.DELETED)
+# Záznamy odložené do konca bloku batched_events (None = zapísať hneď)
+_batch = ContextVar('task_audit_batch', default=None)
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def diff(old, new):
+    """{pole: [pôvodná, nová]} pre polia, ktoré sa zmenili (old None = vytvorenie)"""
+    return {
+        field: [_json_value(old.get(field)) if old else None, _json_value(new.get(field))]
+        for field in AUDIT_FIELDS
+        if old is None or old.get(field) != new.get(field)
+    }
+
+
+def audit_values(task):
+    return {field: getattr(task, field) for field in AUDIT_FIELDS}
+
+
+def current_actor_id():
+    """Id prihláseného používateľa aktuálnej požiadavky (alebo None)"""
+    request = _actor.get()
+    if request is None:
+        return None
+    user = getattr(request, 'user', None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def delete_action():
+    return _delete_action.get()
+
+
+@contextmanager
+def deletes_recorded_as(action):
+    """Zmazania úloh v bloku sa do histórie zapíšu ako `action` (napr. ARCHIVED)"""
+    token = _delete_action.set(action)
+    try:
+        yield
+    finally:
+        _delete_action.reset(token)
+
+
+@contextmanager
+def batched_events(using=DEFAULT_DB_ALIAS):
+    """Záznamy z bloku zapíše jedným bulk_create na jeho konci, v jeho transakcii
+
+    Pri výnimke sa nezapíše nič – zmenu z bloku vráti ten istý rollback.
+    """
+    with transaction.atomic(using=using):
+        events = []
+        token = _batch.set(events)
+        try:
+            yield
+        finally:
+            _batch.reset(token)
+        TaskEvent.objects.using(using).bulk_create(events, batch_size=EVENT_BATCH_SIZE)
+
+
+def record(task_id, owner_id, action, changes, actor_id=None, using=DEFAULT_DB_ALIAS):
+    """Zapíše záznam v aktuálnej transakcii; v bloku batched_events ho odloží na jeho koniec"""
+    event = TaskEvent(
+        task_id=task_id, owner_id=owner_id, action=action, changes=changes,
+        actor_id=actor_id if actor_id is not None else current_actor_id(),
+    )
+    events = _batch.get()
+    if events is None:
+        event.save(using=using)
+        return
+    events.append(event)
+
+
+def write_events(events):
+    """Priamy zápis záznamov po dávkach – pre množinové operácie v ich transakcii
+
+    `events` je iterovateľné (task_id, owner_id, action, changes, actor_id).
+    """
+    default_actor = current_actor_id()
+    events = iter(events)
+    while batch := list(islice(events, EVENT_BATCH_SIZE)):
+        TaskEvent.objects.bulk_create([
+            TaskEvent(task_id=task_id, owner_id=owner_id, action=action, changes=changes,
+                      actor_id=actor_id if actor_id is not None else default_actor)
+            for task_id, owner_id, action, changes, actor_id in batch
+        ])
+
+
+class AuditActorMiddleware:
+    """Sprístupní požiadavku signálom, aby záznam vedel, kto zmenu urobil"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _actor.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _actor.reset(token)
+
+    async def __acall__(self, request):
+        token = _actor.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            _actor.reset(token)
+
+
+def _fold(events):
+    """Čisté zmeny cez viac záznamov – prvá pôvodná a posledná nová hodnota"""
+    net = {}
+    for event in events:
+        for field, (old, new) in event.changes.items():
+            net[field] = [net[field][0] if field in net else old, new]
+    return {field: values for field, values in net.items() if values[0] != values[1]}
+
+
+def compact_events(cutoff, batch_size=500):
+    """Nahradí záznamy staršie ako `cutoff` jedným SNAPSHOT na úlohu
+
+    Spracúva po `batch_size` úlohách, každú dávku v samostatnej transakcii.
+    Vracia (počet úloh, počet zmazaných záznamov).
+    """
+    old = TaskEvent.objects.filter(created_at__lt=cutoff)
+    tasks = compacted = 0
+    last_task_id = -1
+    while True:
+        task_ids = list(
+            old.filter(task_id__gt=last_task_id).order_by('task_id')
+            .values_list('task_id', flat=True).distinct()[:batch_size]
+        )
+        if not task_ids:
+            return tasks, compacted
+        last_task_id = task_ids[-1]
+        with transaction.atomic():
+            events = old.filter(task_id__in=task_ids).select_for_update().order_by('task_id', 'created_at', 'id')
+            by_task = {}
+            for event in events:
+                by_task.setdefault(event.task_id, []).append(event)
+            snapshots = []
+            for task_id, task_events in by_task.items():
+                # Jediný záznam by sa len prepísal rovnakým počtom riadkov
+                if len(task_events) == 1:
+                    continue
+                last = task_events[-1]
+                snapshots.append(TaskEvent(
+                    task_id=task_id, owner_id=last.owner_id, action=TaskEvent.SNAPSHOT,
+                    changes=_fold(task_events), folded=sum(event.folded for event in task_events),
+                    created_at=last.created_at,
+                ))
+                compacted += len(task_events)
+                tasks += 1
+            folded_ids = [event.pk for task_id in (s.task_id for s in snapshots) for event in by_task[task_id]]
+            TaskEvent.objects.filter(pk__in=folded_ids).delete()
+            TaskEvent.objects.bulk_create(snapshots)
@@ -0,0 +1,41 @@
+# tasks/bench.py
+"""Spoločné pomôcky benchmarkových príkazov (bench_tasks, bench_wsgi_asgi, bench_db_connections)"""
+
+import statistics
+
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+
+
+def summarize(latencies, elapsed):
+    """Priepustnosť a percentily latencie v milisekundách (bez meraní None)"""
+    latencies = sorted(latencies)
+    if not latencies:
+        return {
+            "requests": 0, "elapsed_s": round(elapsed, 3), "rps": None,
+            "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None,
+        }
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+def bench_user(username=None):
+    """Prihlásený používateľ benchmarku – zadaný, inak prvý superuser"""
+    users = User.objects.filter(username=username) if username else User.objects.filter(is_superuser=True)
+    user = users.order_by("pk").first()
+    if user is None:
+        raise CommandError("Nenašiel sa používateľ na prihlásenie (použite --user)")
+    return user
+
+
+def split_requests(total, workers):
+    """Rozdelí `total` požiadaviek medzi `workers` klientov čo najrovnomernejšie"""
+    return [total // workers + (1 if index < total % workers else 0) for index in range(workers)]
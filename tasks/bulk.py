@@ -0,0 +1,160 @@
+# tasks/bulk.py
+
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .audit import diff, record, write_events
+from .counters import apply_counter_changes, apply_counter_groups
+from .fragments import bump_fragments
+from .models import Task, TaskEvent
+from .queries import visible_tasks
+from .roles import resolve_roles
+from .stats import apply_task_change, invalidate_stats
+
+BULK_ACTIONS = ('complete', 'uncomplete', 'delete', 'set_due_date')
+
+# Výsledky pre jednotlivé ID
+OK = 'ok'
+FORBIDDEN = 'forbidden'
+NOT_FOUND = 'not_found'
+
+
+def editable_tasks(user):
+    """Úlohy, ktoré smie používateľ upravovať – filter priamo v SQL"""
+    if resolve_roles(user).can_edit:
+        return Task.objects.all()
+    return Task.objects.filter(user=user)
+
+
+def deletable_tasks(user):
+    """Úlohy, ktoré smie používateľ mazať – filter priamo v SQL"""
+    if resolve_roles(user).can_delete:
+        return Task.objects.all()
+    return Task.objects.filter(user=user)
+
+
+def apply_bulk_action(user, action, ids, due_date=None):
+    """Vykoná akciu nad množinou úloh jedným UPDATE/DELETE
+
+    Vracia slovník {id: OK | FORBIDDEN | NOT_FOUND}. Úlohy, ktoré používateľ
+    nevidí, sa hlásia ako NOT_FOUND rovnako ako pri get_object_or_404.
+    """
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"Neznáma hromadná akcia: {action}")
+    if action == 'set_due_date' and due_date is None:
+        raise ValueError("Akcia set_due_date vyžaduje termín")
+
+    roles = resolve_roles(user)
+    allowed_by_role = roles.can_delete if action == 'delete' else roles.can_edit
+    allowed = deletable_tasks(user) if action == 'delete' else editable_tasks(user)
+    visible, _ = visible_tasks(user)
+
+    with transaction.atomic():
+        # Jeden SELECT na rozlíšenie výsledkov, zamkne riadky do konca transakcie
+        states = {
+            pk: (owner_id, completed, due)
+            for pk, owner_id, completed, due in visible.filter(pk__in=ids).select_for_update()
+            .values_list('pk', 'user_id', 'completed', 'due_date')
+        }
+        owners = {pk: state[0] for pk, state in states.items()}
+        permitted = {pk for pk, owner_id in owners.items() if allowed_by_role or owner_id == user.pk}
+
+        if permitted:
+            target = allowed.filter(pk__in=permitted)
+            if action == 'delete':
+                target.delete()
+            else:
+                if action == 'set_due_date':
+                    changes = {'due_date': due_date}
+                else:
+                    changes = {'completed': action == 'complete'}
+                # update() obchádza auto_now aj signály štatistík
+                target.update(updated_at=timezone.now(), version=F('version') + 1, **changes)
+                # TaskCounters v tej istej transakcii – zo stavov zamknutých riadkov
+                apply_counter_changes([
+                    (states[pk], (states[pk][0], changes.get('completed', states[pk][1]),
+                                  changes.get('due_date', states[pk][2])))
+                    for pk in permitted
+                ])
+                # História len pre úlohy, ktorým sa hodnota naozaj zmenila
+                events = []
+                for pk in permitted:
+                    old = {'completed': states[pk][1], 'due_date': states[pk][2]}
+                    if delta := diff(old, {**old, **changes}):
+                        events.append((pk, states[pk][0], TaskEvent.UPDATED, delta, None))
+                write_events(events)
+                owner_ids = {owners[pk] for pk in permitted}
+                transaction.on_commit(lambda: invalidate_stats(owner_ids))
+                transaction.on_commit(lambda: bump_fragments(owner_ids))
+
+    results = {}
+    for pk in ids:
+        if pk not in owners:
+            results[pk] = NOT_FOUND
+        elif pk in permitted:
+            results[pk] = OK
+        else:
+            results[pk] = FORBIDDEN
+    return results
+
+
+def set_completed(queryset, completed):
+    """Množinovo označí úlohy ako dokončené/čakajúce (admin akcie nad celou tabuľkou)
+
+    Jeden GROUP BY na posun počtov a jeden UPDATE – bez načítania úloh do pamäte.
+    Úlohy, ktoré už požadovaný stav majú, sa nemenia. Vracia počet zmenených úloh.
+    """
+    with transaction.atomic():
+        target = Task.objects.filter(pk__in=queryset.values('pk'), completed=not completed)
+        if connection.features.has_select_for_update:
+            # FOR UPDATE nejde s GROUP BY – riadky sa zamknú samostatným dotazom bez načítania
+            sql, params = target.select_for_update().values('pk').query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+        groups = list(target.values_list('user_id', 'due_date').annotate(count=Count('id')).order_by())
+        if not groups:
+            return 0
+        write_events(
+            (pk, user_id, TaskEvent.UPDATED, {'completed': [not completed, completed]}, None)
+            for pk, user_id in target.values_list('pk', 'user_id').iterator()
+        )
+        updated = target.update(completed=completed, updated_at=timezone.now(), version=F('version') + 1)
+        apply_counter_groups([
+            ((user_id, not completed, due_date), (user_id, completed, due_date), count)
+            for user_id, due_date, count in groups
+        ])
+        owner_ids = {user_id for user_id, _, _ in groups}
+        transaction.on_commit(lambda: invalidate_stats(owner_ids))
+        transaction.on_commit(lambda: bump_fragments(owner_ids))
+    return updated
+
+
+def toggle_completed(task):
+    """Prepne stav úlohy jedným UPDATE ... SET completed = NOT completed
+
+    Prepína sa hodnota v DB, nie načítaná – dve súbežné kliknutia sa obe
+    prejavia namiesto toho, aby druhé prepísalo prvé. `task` sa aktualizuje
+    na nový stav; vracia (pôvodný, nový) stav pre počítadlá štatistík.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # Najprv zápis: riadok je od neho zamknutý do konca transakcie, takže
+        # následné čítanie vráti presne stav, ktorý zapísalo toto prepnutie
+        flipped = Task.objects.filter(pk=task.pk).update(
+            completed=~F('completed'), version=F('version') + 1, updated_at=now,
+        )
+        if not flipped:
+            raise Task.DoesNotExist(f'Task {task.pk} does not exist.')
+        user_id, completed, due_date, version = Task.objects.filter(pk=task.pk).values_list(
+            'user_id', 'completed', 'due_date', 'version',
+        ).get()
+        old, new = (user_id, not completed, due_date), (user_id, completed, due_date)
+        # update() obchádza signály – počty, história a cache ako v post_save
+        apply_counter_changes([(old, new)])
+        record(task.pk, user_id, TaskEvent.UPDATED, {'completed': [old[1], new[1]]})
+        transaction.on_commit(lambda: apply_task_change(old, new))
+        transaction.on_commit(lambda: bump_fragments([user_id]))
+    task.completed, task.version, task.updated_at = completed, version, now
+    task.user_id, task.due_date = user_id, due_date
+    return old, new
@@ -0,0 +1,169 @@
+# tasks/counters.py
+"""Denormalizované počty úloh (TaskCounters) a histogram termínov (TaskDueCount)
+
+Počty sa upravujú F() výrazmi v tej istej transakcii ako zápis úlohy, takže
+štatistiky zoznamu sú jeden dotaz na malú tabuľku namiesto COUNT(*) nad
+všetkými úlohami. Prípadný drift opraví príkaz reconcile_task_counters.
+
+Udržiavajú sa len pri TASK_STATS_SOURCE='counters' – inak by každý zápis
+úlohy zbytočne čakal na zámok spoločného riadku 'all'. Po zapnutí ich z
+tabuľky úloh postaví reconcile_task_counters.
+"""
+
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Task, TaskCounters, TaskDueCount
+from .stats import ALL_SCOPE, STAT_FIELDS, stats_scope
+
+COUNTER_FIELDS = ('total', 'completed', 'pending')
+
+
+def counters_enabled():
+    return settings.TASK_STATS_SOURCE == 'counters'
+
+
+def _deltas(changes):
+    """Súčet zmien pre trojice (old, new, počet úloh) – (počty, histogram)"""
+    counters = defaultdict(Counter)
+    histogram = Counter()
+    for old, new, count in changes:
+        for state, sign in ((old, -count), (new, count)):
+            if state is None:
+                continue
+            user_id, completed, due_date = state
+            for scope in (ALL_SCOPE, stats_scope(user_id)):
+                counters[scope]['total'] += sign
+                counters[scope]['completed' if completed else 'pending'] += sign
+                if due_date is not None and not completed:
+                    histogram[scope, due_date] += sign
+    return counters, histogram
+
+
+def _update_or_create(model, lookup, delta):
+    """Atomický prírastok cez F(); chýbajúci riadok sa vytvorí (pri súbehu sa prírastok zopakuje)"""
+    if model.objects.filter(**lookup).update(**{field: F(field) + value for field, value in delta.items()}):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **delta)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(**{field: F(field) + value for field, value in delta.items()})
+
+
+def apply_counter_changes(changes):
+    """Upraví počty a histogram podľa zmien úloh
+
+    `changes` sú dvojice (old, new) ako v tasks.stats.apply_task_change –
+    (user_id, completed, due_date), pri vytvorení je old None, pri zmazaní new None.
+    Musí bežať v transakcii zápisu úloh.
+    """
+    apply_counter_groups((old, new, 1) for old, new in changes)
+
+
+def apply_counter_groups(groups):
+    """Ako apply_counter_changes, ale pre skupiny rovnakých zmien (old, new, počet úloh)
+
+    Pre množinové UPDATE – stačí GROUP BY (user_id, due_date) namiesto stavu každej úlohy.
+    """
+    if not counters_enabled():
+        return
+    counters, histogram = _deltas(groups)
+    for scope, delta in counters.items():
+        delta = {field: value for field, value in delta.items() if value}
+        if delta:
+            _update_or_create(TaskCounters, {'scope': scope}, delta)
+    for (scope, due_date), value in histogram.items():
+        if value:
+            _update_or_create(TaskDueCount, {'scope': scope, 'due_date': due_date}, {'count': value})
+
+
+def _counters_query(scope, today):
+    # Počty aj súčet histogramu pred dneškom jedným dotazom
+    overdue = TaskDueCount.objects.filter(
+        scope=OuterRef('scope'), due_date__lt=today,
+    ).values('scope').annotate(overdue=Sum('count')).values('overdue')
+    return TaskCounters.objects.filter(scope=scope).annotate(
+        overdue=Coalesce(Subquery(overdue), 0),
+    ).values(*COUNTER_FIELDS, 'overdue')
+
+
+def read_counters(scope, today):
+    """Štatistiky rozsahu z TaskCounters; rozsah bez riadku nemá žiadne úlohy"""
+    row = _counters_query(scope, today).first()
+    return row or dict.fromkeys(STAT_FIELDS, 0)
+
+
+async def aread_counters(scope, today):
+    row = await _counters_query(scope, today).afirst()
+    return row or dict.fromkeys(STAT_FIELDS, 0)
+
+
+def actual_counters():
+    """Skutočné počty a histogram spočítané z tabuľky úloh (GROUP BY používateľ)"""
+    counters = defaultdict(Counter)
+    per_user = Task.objects.values('user_id').annotate(
+        total=Count('id'), completed=Count('id', filter=Q(completed=True)),
+    ).order_by()
+    for row in per_user:
+        for scope in (ALL_SCOPE, stats_scope(row['user_id'])):
+            counters[scope]['total'] += row['total']
+            counters[scope]['completed'] += row['completed']
+            counters[scope]['pending'] += row['total'] - row['completed']
+
+    histogram = Counter()
+    per_date = Task.objects.filter(completed=False, due_date__isnull=False).values(
+        'user_id', 'due_date',
+    ).annotate(count=Count('id')).order_by()
+    for row in per_date:
+        for scope in (ALL_SCOPE, stats_scope(row['user_id'])):
+            histogram[scope, row['due_date']] += row['count']
+    return counters, histogram
+
+
+def reconcile_counters(repair=True):
+    """Porovná uložené počty so skutočnými a voliteľne ich opraví
+
+    Riadky počítadiel sa zamknú ako prvé – zápisy úloh, ktoré ich potrebujú
+    upraviť, počkajú do konca opravy a svoj prírastok pridajú až potom.
+    Vracia zoznam rozdielov (rozsah, pole, uložené, skutočné).
+    """
+    drift = []
+    with transaction.atomic():
+        stored = {row.scope: row for row in TaskCounters.objects.select_for_update()}
+        stored_histogram = {
+            (row.scope, row.due_date): row for row in TaskDueCount.objects.select_for_update()
+        }
+        counters, histogram = actual_counters()
+
+        for scope in sorted(set(stored) | set(counters)):
+            row = stored.get(scope)
+            actual = counters.get(scope, Counter())
+            changed = False
+            for field in COUNTER_FIELDS:
+                have = getattr(row, field) if row else 0
+                if have != actual[field]:
+                    drift.append((scope, field, have, actual[field]))
+                    changed = True
+            if repair and changed:
+                TaskCounters.objects.update_or_create(
+                    scope=scope, defaults={field: actual[field] for field in COUNTER_FIELDS},
+                )
+
+        for key in sorted(set(stored_histogram) | set(histogram)):
+            row = stored_histogram.get(key)
+            have = row.count if row else 0
+            if have != histogram[key]:
+                drift.append((key[0], f'due:{key[1].isoformat()}', have, histogram[key]))
+                if repair:
+                    TaskDueCount.objects.update_or_create(
+                        scope=key[0], due_date=key[1], defaults={'count': histogram[key]},
+                    )
+        if repair:
+            # Dni bez nedokončených úloh histogram len zväčšujú
+            TaskDueCount.objects.filter(count=0).delete()
+    return drift
@@ -0,0 +1,19 @@
+# tasks/db.py
+"""Nastavenie nových databázových spojení (signál connection_created)"""
+
+from django.conf import settings
+
+
+def tune_sqlite(sender, connection, **kwargs):
+    """WAL a busy_timeout pre SQLite – čitatelia neblokujú zápis a zápisy na seba počkajú
+
+    synchronous=NORMAL je pri WAL bezpečné voči poškodeniu databázy, pri výpadku
+    napájania sa môže stratiť len posledná potvrdená transakcia.
+    """
+    if connection.vendor != 'sqlite' or not settings.SQLITE_TUNING:
+        return
+    with connection.cursor() as cursor:
+        # journal_mode sa ukladá do súboru databázy, pri :memory: ostane "memory"
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute(f'PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}')
+        cursor.execute('PRAGMA synchronous=NORMAL')
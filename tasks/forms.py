@@ -1,10 +1,20 @@
 # tasks/forms.py
 
 from django import forms
+from django.conf import settings
 from django.utils import timezone
+from .bulk import BULK_ACTIONS
 from .models import Task
 
 class TaskForm(forms.ModelForm):
+    # Verzia úlohy pri otvorení formulára – uloží sa len, ak ju medzitým nikto nezmenil
+    version = forms.IntegerField(widget=forms.HiddenInput, required=False, min_value=1)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['version'].initial = self.instance.version
+
     class Meta:
         model = Task
         fields = ["title", "description", "due_date", "completed"]  # Zmenené z "status" na "completed"
@@ -28,8 +38,83 @@ class TaskForm(forms.ModelForm):
             })
         }
 
+    def clean_due_date(self):
+        due = self.cleaned_data.get("due_date")
+        # Nezmenený termín úlohy po splatnosti je platný – inak by ju nešlo ani dokončiť
+        if due and due < timezone.now().date() and due != self.instance.due_date:
+            raise forms.ValidationError("Due date cannot be in the past.")
+        return due
+
+    def save_versioned(self):
+        """Uloží len zmenené polia úpravy, podmienene verziou z formulára
+
+        Bez verzie (starší klient) sa porovná s načítanou – chráni aspoň pred
+        zmenou medzi načítaním a zápisom. Pri súbežnej zmene vyhodí TaskConflict,
+        aj keď sa odoslané hodnoty náhodou zhodujú s aktuálnymi – vychádzali
+        zo zastaraného stavu.
+        """
+        task = self.save(commit=False)
+        expected = self.cleaned_data.get('version') or task.version
+        changed = [field for field in self.changed_data if field != 'version']
+        if changed or expected != task.version:
+            task.save_changes(changed, expected)
+        return task
+
+
+class TaskIdsField(forms.Field):
+    """Zoznam ID úloh – z formulára (ids=1&ids=2) aj z JSON poľa"""
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return []
+        if isinstance(value, (str, int)):
+            value = [value]
+        try:
+            return sorted({int(pk) for pk in value})
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Neplatné ID úloh.")
+
+    def validate(self, value):
+        super().validate(value)
+        if len(value) > settings.TASK_BULK_MAX_IDS:
+            raise forms.ValidationError(f"Naraz je možné spracovať najviac {settings.TASK_BULK_MAX_IDS} úloh.")
+
+
+class BulkTaskForm(forms.Form):
+    action = forms.ChoiceField(choices=[(action, action) for action in BULK_ACTIONS])
+    ids = TaskIdsField()
+    due_date = forms.DateField(required=False)
+
     def clean_due_date(self):
         due = self.cleaned_data.get("due_date")
         if due and due < timezone.now().date():
             raise forms.ValidationError("Due date cannot be in the past.")
-        return due
\ No newline at end of file
+        return due
+
+    def clean(self):
+        cleaned_data = super().clean()
+        # Chýbajúci termín by vybraným úlohám termín zmazal
+        missing = cleaned_data.get("action") == "set_due_date" and not cleaned_data.get("due_date")
+        if missing and "due_date" not in self.errors:
+            self.add_error("due_date", "Zadajte nový termín.")
+        return cleaned_data
+
+
+class ImportTaskForm(TaskForm):
+    """Validácia importovaného riadku – rovnaká ako TaskForm, plus stav
+
+    Pri migrácii historických dát je možné povoliť termín v minulosti.
+    """
+
+    class Meta(TaskForm.Meta):
+        fields = TaskForm.Meta.fields + ["status"]
+
+    def __init__(self, *args, allow_past_due=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.allow_past_due = allow_past_due
+
+    def clean_due_date(self):
+        if self.allow_past_due:
+            return self.cleaned_data.get("due_date")
+        return super().clean_due_date()
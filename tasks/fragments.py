@@ -0,0 +1,98 @@
+# tasks/fragments.py
+"""Verziovaná cache HTML fragmentov zoznamu úloh (tabuľka a štatistiky)
+
+Každý rozsah (všetky úlohy / úlohy jedného používateľa) má vlastnú verziu,
+ktorú posúvajú signály na Task. Verzia je súčasťou kľúča fragmentu, takže
+zmena úlohy okamžite zneplatní presne tie fragmenty, ktoré ju zobrazujú –
+staré záznamy len dožijú v cache bez toho, aby sa ešte čítali.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from .stats import ALL_SCOPE, stats_scope
+
+# Tabuľka obsahuje formuláre na zmazanie – token sa do cache neukladá,
+# dopĺňa sa pri každej požiadavke
+CSRF_PLACEHOLDER = '__task_fragment_csrf__'
+
+
+def _version_key(scope):
+    return f'tasks:fragments:version:{scope}'
+
+
+def _new_version():
+    # Časová verzia – po vypadnutí kľúča z cache nezačne od nuly a staré fragmenty neožijú
+    return time.time_ns()
+
+
+def bump_fragments(user_ids=()):
+    """Zneplatní fragmenty rozsahu všetkých úloh a rozsahov daných používateľov"""
+    if not settings.TASK_FRAGMENT_CACHE:
+        return
+    scopes = [ALL_SCOPE] + [stats_scope(user_id) for user_id in set(user_ids) if user_id is not None]
+    version = _new_version()
+    cache.set_many({_version_key(scope): version for scope in scopes}, timeout=None)
+
+
+def _keys(scope, version, user, roles, today, filter_by, query, cursor, page_query):
+    # Riadky závisia od diváka (vlastník, oprávnenia), štatistiky len od rozsahu;
+    # odkazy stránkovania nesú parametre zoznamu, preto sú v kľúči aj tie
+    table = '|'.join(str(part) for part in (
+        scope, version, user.pk, roles.can_edit, roles.can_delete,
+        today.isoformat(), filter_by, query, cursor or '', page_query,
+    ))
+    digest = hashlib.md5(table.encode('utf-8')).hexdigest()
+    return {
+        'table': f'tasks:fragments:table:{digest}',
+        'stats': f'tasks:fragments:stats:{scope}:{version}:{today.isoformat()}:{filter_by}',
+    }
+
+
+def fragment_keys(scope, user, roles, today, filter_by, query, cursor, page_query):
+    version = cache.get(_version_key(scope))
+    if version is None:
+        version = _new_version()
+        cache.add(_version_key(scope), version, timeout=None)
+    return _keys(scope, version, user, roles, today, filter_by, query, cursor, page_query)
+
+
+async def afragment_keys(scope, user, roles, today, filter_by, query, cursor, page_query):
+    version = await cache.aget(_version_key(scope))
+    if version is None:
+        version = _new_version()
+        await cache.aadd(_version_key(scope), version, timeout=None)
+    return _keys(scope, version, user, roles, today, filter_by, query, cursor, page_query)
+
+
+def render_table(context, request):
+    """Riadky a stránkovanie s CSRF zástupcom namiesto tokenu"""
+    context = {**context, 'csrf_token': CSRF_PLACEHOLDER}
+    return {
+        'has_tasks': bool(context['tasks']),
+        'stranded': context['tasks'].stranded,
+        'rows': get_template('tasks/task_rows.html').render(context, request),
+        'pagination': get_template('tasks/task_pagination.html').render(context, request),
+    }
+
+
+def render_stats(context, request):
+    return get_template('tasks/task_stats.html').render(context, request)
+
+
+def fragment_context(table, stats_html, request):
+    """Kontext pre task_list.html z (prípadne cachovaných) fragmentov"""
+    token = get_token(request)
+    return {
+        'tasks': table['has_tasks'],
+        'stranded': table.get('stranded', False),
+        'rows_html': mark_safe(table['rows'].replace(CSRF_PLACEHOLDER, token)),
+        'pagination_html': mark_safe(table['pagination']),
+        'stats_html': mark_safe(stats_html),
+    }
@@ -0,0 +1,177 @@
+# tasks/instrumentation.py
+"""Meranie dotazov, SQL času, vykresľovania šablón a celkovej latencie požiadaviek
+
+Zapína sa nastavením TASK_INSTRUMENTATION. Middleware pridá hlavičku
+Server-Timing, zaloguje duplicitné dotazy a vzorky zapisuje ako JSON riadky
+do TASK_INSTRUMENTATION_LOG, odkiaľ ich agreguje príkaz report_request_timings.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import Template as BackendTemplate
+
+logger = logging.getLogger(__name__)
+
+# Vzorka práve spracúvanej požiadavky – contextvar sa prenáša aj do sync_to_async vlákien
+_current = ContextVar('task_request_sample', default=None)
+_write_lock = threading.Lock()
+_installed = False
+
+
+class RequestSample:
+    __slots__ = ('started', 'queries', 'sql_time', 'template_time', 'template_depth', 'statements')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.statements = Counter()
+
+    def duplicates(self):
+        """{sql: počet} pre dotazy spustené viackrát s rovnakými parametrami"""
+        return {sql: count for (sql, _), count in self.statements.items() if count > 1}
+
+
+def _record_query(execute, sql, params, many, context):
+    sample = _current.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        sample.sql_time += time.perf_counter() - start
+        sample.queries += 1
+        sample.statements[(sql, repr(params))] += 1
+
+
+def _instrument_connection(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _timed_render(render):
+    def wrapper(self, context=None, request=None):
+        sample = _current.get()
+        if sample is None:
+            return render(self, context, request)
+        # Len vonkajšie vykreslenie – vnorené render_to_string sa už počíta v ňom
+        sample.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            sample.template_depth -= 1
+            if not sample.template_depth:
+                sample.template_time += time.perf_counter() - start
+    return wrapper
+
+
+def install():
+    """Zapojí meranie do všetkých spojení a do vykresľovania šablón (raz za proces)"""
+    global _installed
+    if _installed:
+        return
+    connection_created.connect(_instrument_connection, dispatch_uid='tasks.instrument_connection')
+    for connection in connections.all(initialized_only=True):
+        _instrument_connection(None, connection)
+    BackendTemplate.render = _timed_render(BackendTemplate.render)
+    _installed = True
+
+
+def _url_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is not None and match.view_name:
+        return match.view_name
+    return '<unresolved>'
+
+
+def _write_sample(record):
+    path = settings.TASK_INSTRUMENTATION_LOG
+    if not path:
+        return
+    line = json.dumps(record, ensure_ascii=False) + '\n'
+    with _write_lock, open(path, 'a', encoding='utf-8') as handle:
+        handle.write(line)
+
+
+class QueryTimingMiddleware:
+    """Počet a čas SQL, čas šablón a celková latencia pre každú požiadavku
+
+    Pri streamovaných odpovediach sa meria len čas do vrátenia odpovede,
+    riadky vykreslené počas streamovania už vo vzorke nie sú.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TASK_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        sample = RequestSample()
+        token = _current.set(sample)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, sample)
+
+    async def __acall__(self, request):
+        sample = RequestSample()
+        token = _current.set(sample)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, sample)
+
+    def _finish(self, request, response, sample):
+        total_ms = (time.perf_counter() - sample.started) * 1000
+        sql_ms = sample.sql_time * 1000
+        template_ms = sample.template_time * 1000
+        duplicates = sample.duplicates()
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={sql_ms:.2f};desc="{sample.queries} queries"',
+            f'tpl;dur={template_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ])
+        url_name = _url_name(request)
+        if duplicates:
+            response['X-Duplicate-Queries'] = str(sum(count - 1 for count in duplicates.values()))
+            for sql, count in duplicates.items():
+                logger.warning('Duplicitný dotaz %d× v %s: %s', count, url_name, sql[:200])
+
+        _write_sample({
+            'ts': round(time.time(), 3),
+            'url_name': url_name,
+            'method': request.method,
+            'status': response.status_code,
+            'queries': sample.queries,
+            'duplicates': sum(count - 1 for count in duplicates.values()),
+            'sql_ms': round(sql_ms, 3),
+            'template_ms': round(template_ms, 3),
+            'total_ms': round(total_ms, 3),
+        })
+        return response
@@ -0,0 +1,39 @@
+# tasks/jobs.py
+"""Úlohy na pozadí aplikácie tasks – spúšťa ich `run_worker`, zaraďuje `enqueue_job` alebo kód"""
+
+from django.core.management import call_command
+
+from jobs.queue import register
+
+from .reminders import send_reminders
+
+
+@register('tasks.send_reminders')
+def send_reminders_job(days=None, lookback=None):
+    send_reminders(days=days, lookback=lookback)
+
+
+@register('tasks.rebuild_search_index')
+def rebuild_search_index_job():
+    call_command('rebuild_search_index', verbosity=0)
+
+
+@register('tasks.reconcile_counters')
+def reconcile_counters_job():
+    call_command('reconcile_task_counters', verbosity=0)
+
+
+@register('tasks.archive')
+def archive_tasks_job(days=None):
+    call_command('archive_tasks', days=days, verbosity=0)
+
+
+@register('tasks.compact_events')
+def compact_events_job(days=None):
+    call_command('compact_task_events', days=days, verbosity=0)
+
+
+@register('tasks.export')
+def export_tasks_job(output, format=None, user=None):
+    # Checkpoint vedľa súboru – opakovaný pokus po chybe pokračuje, kde export skončil
+    call_command('export_tasks', output, format=format, user=user, checkpoint=f'{output}.ckpt', verbosity=0)
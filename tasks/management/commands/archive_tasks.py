@@ -0,0 +1,46 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tasks.archive import archive_candidates, archive_completed
+
+
+class Command(BaseCommand):
+    help = (
+        "Move completed tasks not changed for N days from the Task table to ArchivedTask "
+        "in short batches, so the hot table and its indexes stay small"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None,
+                            help="Vek dokončenej úlohy v dňoch (predvolene TASK_ARCHIVE_AFTER_DAYS)")
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Úloh na jednu transakciu (predvolene TASK_ARCHIVE_BATCH_SIZE)")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Pauza medzi dávkami v sekundách")
+        parser.add_argument("--max-batches", type=int, default=None, help="Najviac dávok v jednom behu")
+        parser.add_argument("--dry-run", action="store_true", help="Len spočítať kandidátov")
+
+    def handle(self, *args, **options):
+        days = settings.TASK_ARCHIVE_AFTER_DAYS if options["days"] is None else options["days"]
+        batch_size = options["batch_size"] or settings.TASK_ARCHIVE_BATCH_SIZE
+        if days < 0 or batch_size < 1:
+            raise CommandError("--days musí byť nezáporné a --batch-size kladné")
+        cutoff = timezone.now() - timedelta(days=days)
+
+        if options["dry_run"]:
+            count = archive_candidates(cutoff).count()
+            self.stdout.write(f"Na archiváciu: {count} úloh dokončených pred {cutoff:%d.%m.%Y}")
+            return
+
+        moved = 0
+        for batch in archive_completed(cutoff, batch_size, options["max_batches"]):
+            moved += batch
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Presunutých: {moved}")
+            if options["sleep"]:
+                # Priestor pre zápisy používateľov medzi dávkami (SQLite má jeden zapisovač)
+                time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Archivovaných {moved} úloh"))
@@ -0,0 +1,94 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.test.utils import override_settings
+
+from tasks.bench import bench_user, summarize
+
+# (názov, CONN_MAX_AGE, SQLITE_TUNING)
+MODES = (
+    ("fresh", 0, False),
+    ("fresh+tuning", 0, True),
+    ("persistent", None, False),
+    ("persistent+tuning", None, True),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how database connection setup affects task_list latency: "
+        "a new connection per request (CONN_MAX_AGE=0) versus a persistent one, "
+        "with and without the SQLite connection tuning"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/", help="Meraná URL (predvolene zoznam úloh)")
+        parser.add_argument("--requests", type=int, default=200, help="Počet požiadaviek na režim")
+        parser.add_argument("--user", help="Prihlásený používateľ (predvolene prvý superuser)")
+        parser.add_argument("--json", action="store_true", help="Výstup ako JSON")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests musí byť kladné")
+        user = bench_user(options["user"])
+
+        modes = [mode for mode in MODES if connection.vendor == "sqlite" or not mode[2]]
+        original_max_age = connection.settings_dict["CONN_MAX_AGE"]
+        results = []
+        try:
+            with override_settings(ALLOWED_HOSTS=["testserver"], SECURE_SSL_REDIRECT=False, DEBUG=False):
+                client = Client()
+                client.force_login(user)
+                for name, max_age, tuning in modes:
+                    with override_settings(SQLITE_TUNING=tuning):
+                        results.append(self._run_mode(client, name, max_age, options))
+        finally:
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = original_max_age
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:>18}: pripojenie {result['connect_ms']} ms, "
+                f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms, "
+                f"{result['rps']} req/s ({result['connections']} spojení)"
+            )
+
+    def _run_mode(self, client, name, max_age, options):
+        # close_at sa počíta pri otvorení spojenia, preto sa zmena prejaví až po zatvorení
+        connection.close()
+        connection.settings_dict["CONN_MAX_AGE"] = max_age
+
+        connect_times = []
+        for _ in range(min(options["requests"], 50)):
+            start = time.perf_counter()
+            connection.ensure_connection()
+            connect_times.append(time.perf_counter() - start)
+            connection.close()
+
+        latencies, errors, connections = [], 0, 0
+        started = time.perf_counter()
+        for _ in range(options["requests"]):
+            start = time.perf_counter()
+            connections += connection.connection is None
+            response = client.get(options["path"])
+            if response.streaming:
+                b"".join(response.streaming_content)
+            # Testovací klient neposiela request_finished do close_old_connections, WSGI server áno
+            close_old_connections()
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code >= 400
+        elapsed = time.perf_counter() - started
+
+        result = summarize(latencies, elapsed)
+        connect_times.sort()
+        result.update(
+            mode=name, path=options["path"], errors=errors, connections=connections,
+            connect_ms=round(connect_times[len(connect_times) // 2] * 1000, 3),
+        )
+        return result
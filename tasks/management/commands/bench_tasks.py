@@ -0,0 +1,229 @@
+import http.client
+import json
+import re
+import subprocess
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from tasks.bench import bench_user, split_requests, summarize
+from tasks.models import Task
+
+SCENARIOS = ("list", "list_overdue", "list_search", "toggle", "create", "api_list")
+# Zapisujú do nastavenej databázy – história, počítadlá aj fulltextový index sa menia naozaj
+WRITE_SCENARIOS = ("toggle", "create")
+RUN_MODES = ("client", "http")
+BENCH_PREFIX = "bench-run-"
+_SERVER_QUERIES_RE = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def _git_revision():
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark task_list, task_toggle_complete, task_create and the API through the test "
+        "client and/or a concurrent HTTP load generator; writes JSON for regression comparison"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=RUN_MODES, nargs="+", default=["client"],
+                            help="client = in-process test klient, http = živý server na --base-url")
+        parser.add_argument("--scenarios", choices=SCENARIOS, nargs="+",
+                            default=[scenario for scenario in SCENARIOS if scenario not in WRITE_SCENARIOS],
+                            help="Predvolene len čítanie; toggle a create vyžadujú --allow-writes")
+        parser.add_argument("--allow-writes", action="store_true",
+                            help="Povoliť scenáre toggle/create, ktoré zapisujú úlohy do nastavenej databázy")
+        parser.add_argument("--requests", type=int, default=100, help="Počet požiadaviek na scenár")
+        parser.add_argument("--concurrency", type=int, default=10, help="Súbežní klienti v režime http")
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Adresa servera pre režim http")
+        parser.add_argument("--user", help="Prihlásený používateľ (predvolene prvý superuser)")
+        parser.add_argument("--output", help="Zapísať výsledky ako JSON do súboru")
+        parser.add_argument("--compare", help="JSON s predchádzajúcimi výsledkami na porovnanie")
+        parser.add_argument("--threshold", type=float, default=10.0,
+                            help="Povolené zhoršenie p95 a req/s v percentách pri --compare")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests a --concurrency musia byť kladné")
+        writes = [scenario for scenario in options["scenarios"] if scenario in WRITE_SCENARIOS]
+        if writes and not options["allow_writes"]:
+            raise CommandError(
+                f"Scenáre {', '.join(writes)} zapisujú do databázy {connection.settings_dict['NAME']} "
+                "– spustite ich nad skúšobnou databázou s --allow-writes"
+            )
+        user = bench_user(options["user"])
+        # Úloha na prepínanie patrí meranému používateľovi, na konci sa zmaže spolu s vytvorenými
+        target = Task.objects.create(title=f"{BENCH_PREFIX}toggle", user=user) if "toggle" in writes else None
+
+        results = []
+        try:
+            for mode in options["mode"]:
+                for scenario in options["scenarios"]:
+                    run = self._run_client if mode == "client" else self._run_http
+                    latencies, queries, errors, elapsed = run(scenario, user, target, options)
+                    result = summarize(latencies, elapsed)
+                    result.update(
+                        scenario=scenario, mode=mode, errors=errors,
+                        concurrency=1 if mode == "client" else options["concurrency"],
+                        queries_p50=sorted(queries)[len(queries) // 2] if queries else None,
+                        queries_max=max(queries) if queries else None,
+                    )
+                    results.append(result)
+                    self.stdout.write(self._format(result))
+        finally:
+            if writes:
+                Task.objects.filter(user=user, title__startswith=BENCH_PREFIX).delete()
+
+        report = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "revision": _git_revision(),
+                "database": connection.vendor,
+                "tasks": Task.objects.count(),
+                "user": user.username,
+                "requests": options["requests"],
+            },
+            "results": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+        else:
+            self.stdout.write(json.dumps(report, indent=2))
+
+        if options["compare"]:
+            self._compare(report, options["compare"], options["threshold"])
+
+    def _request(self, scenario, target):
+        """(metóda, cesta, dáta) pre jednu požiadavku scenára"""
+        if scenario == "list":
+            return "GET", reverse("task_list"), None
+        if scenario == "list_overdue":
+            return "GET", reverse("task_list") + "?filter=overdue", None
+        if scenario == "list_search":
+            return "GET", reverse("task_list") + "?q=report", None
+        if scenario == "api_list":
+            return "GET", reverse("api_task_list"), None
+        if scenario == "toggle":
+            return "POST", reverse("task_toggle_complete", args=[target.pk]), {}
+        return "POST", reverse("task_create"), {
+            "title": f"{BENCH_PREFIX}{uuid.uuid4().hex[:8]}", "status": "PENDING",
+        }
+
+    def _run_client(self, scenario, user, target, options):
+        latencies, queries, errors = [], [], 0
+        with override_settings(ALLOWED_HOSTS=["testserver"], SECURE_SSL_REDIRECT=False, DEBUG=False):
+            client = Client()
+            client.force_login(user)
+            started = time.perf_counter()
+            for _ in range(options["requests"]):
+                method, path, data = self._request(scenario, target)
+                with CaptureQueriesContext(connection) as ctx:
+                    start = time.perf_counter()
+                    response = client.post(path, data) if method == "POST" else client.get(path)
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+                    latencies.append(time.perf_counter() - start)
+                queries.append(len(ctx.captured_queries))
+                errors += response.status_code >= 400
+            elapsed = time.perf_counter() - started
+        return latencies, queries, errors, elapsed
+
+    def _run_http(self, scenario, user, target, options):
+        """Súbežní klienti s keep-alive spojením ako prehliadače voči živému serveru"""
+        base = urlsplit(options["base_url"])
+        # Prihlásenie cez session engine servera; CSRF cookie a hlavička s tým istým tajomstvom
+        login = Client()
+        login.force_login(user)
+        csrf = get_random_string(32)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={login.cookies[settings.SESSION_COOKIE_NAME].value}; " \
+                 f"{settings.CSRF_COOKIE_NAME}={csrf}"
+
+        def worker(count):
+            connection_class = http.client.HTTPSConnection if base.scheme == "https" else http.client.HTTPConnection
+            conn = connection_class(base.hostname, base.port, timeout=30)
+            latencies, queries, errors = [], [], 0
+            try:
+                for _ in range(count):
+                    method, path, data = self._request(scenario, target)
+                    headers = {"Cookie": cookie, "X-CSRFToken": csrf, "Referer": options["base_url"]}
+                    body = None
+                    if data is not None:
+                        body = urlencode(data)
+                        headers["Content-Type"] = "application/x-www-form-urlencoded"
+                    start = time.perf_counter()
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    latencies.append(time.perf_counter() - start)
+                    errors += response.status >= 400
+                    # Počet dotazov pozná len server – z hlavičky QueryTimingMiddleware
+                    match = _SERVER_QUERIES_RE.search(response.getheader("Server-Timing") or "")
+                    if match:
+                        queries.append(int(match.group(1)))
+            except OSError as exc:
+                raise CommandError(f"Server {options['base_url']} neodpovedá: {exc}")
+            finally:
+                conn.close()
+            return latencies, queries, errors
+
+        split = split_requests(options["requests"], options["concurrency"])
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as pool:
+            parts = list(pool.map(worker, [count for count in split if count]))
+        elapsed = time.perf_counter() - started
+        return (
+            [lat for part in parts for lat in part[0]],
+            [count for part in parts for count in part[1]],
+            sum(part[2] for part in parts),
+            elapsed,
+        )
+
+    def _format(self, result):
+        queries = f", dotazy {result['queries_p50']}/{result['queries_max']}" if result["queries_max"] is not None else ""
+        return (
+            f"{result['mode']:>6} {result['scenario']:<13} {result['rps']!s:>8} req/s, "
+            f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms"
+            f"{queries}, chyby {result['errors']}"
+        )
+
+    def _compare(self, report, path, threshold):
+        with open(path, encoding="utf-8") as handle:
+            baseline = {(row["mode"], row["scenario"]): row for row in json.load(handle)["results"]}
+        regressions = []
+        for row in report["results"]:
+            old = baseline.get((row["mode"], row["scenario"]))
+            if old is None or row["p95_ms"] is None or old["p95_ms"] is None:
+                continue
+            p95_change = (row["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0
+            rps_change = (row["rps"] - old["rps"]) / old["rps"] * 100 if old["rps"] else 0
+            self.stdout.write(
+                f"{row['mode']:>6} {row['scenario']:<13} p95 {p95_change:+.1f} %, req/s {rps_change:+.1f} %, "
+                f"dotazy {old['queries_max']} → {row['queries_max']}"
+            )
+            if p95_change > threshold or -rps_change > threshold:
+                regressions.append(f"{row['mode']}/{row['scenario']}")
+            elif (row["queries_max"] or 0) > (old["queries_max"] or 0):
+                regressions.append(f"{row['mode']}/{row['scenario']} (dotazy)")
+        if regressions:
+            raise CommandError(f"Zhoršenie oproti {path}: {', '.join(regressions)}")
+        self.stdout.write(self.style.SUCCESS(f"✅ Bez zhoršenia oproti {path}"))
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+
+from tasks.bench import bench_user, split_requests, summarize
+
+MODES = ("wsgi", "asgi")
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the task views through the WSGI handler (sync views) and the "
+        "ASGI handler (TASK_ASYNC_VIEWS) under concurrent load; reports req/s and p99"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=MODES, help="Spustí len jeden režim v tomto procese")
+        parser.add_argument("--path", default="/", help="Meraná URL (predvolene zoznam úloh)")
+        parser.add_argument("--method", default="GET", choices=["GET", "POST"])
+        parser.add_argument("--requests", type=int, default=200, help="Počet požiadaviek na režim")
+        parser.add_argument("--concurrency", type=int, default=10, help="Počet súbežných klientov")
+        parser.add_argument("--user", help="Prihlásený používateľ (predvolene prvý superuser)")
+        parser.add_argument("--json", action="store_true", help="Výstup ako JSON")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests a --concurrency musia byť kladné")
+
+        if options["mode"]:
+            result = self._run_mode(options)
+            self.stdout.write(json.dumps(result) if options["json"] else self._format(result))
+            return
+
+        # Každý režim beží v samostatnom procese – TASK_ASYNC_VIEWS sa číta pri štarte URLconf
+        results = [self._spawn(mode, options) for mode in MODES]
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            for result in results:
+                self.stdout.write(self._format(result))
+
+    def _spawn(self, mode, options):
+        command = [
+            sys.executable, str(settings.BASE_DIR / "manage.py"), "bench_wsgi_asgi",
+            "--mode", mode, "--json",
+            "--path", options["path"], "--method", options["method"],
+            "--requests", str(options["requests"]), "--concurrency", str(options["concurrency"]),
+        ]
+        if options["user"]:
+            command += ["--user", options["user"]]
+        env = {**os.environ, "TASK_ASYNC_VIEWS": "1" if mode == "asgi" else "0"}
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise CommandError(f"Benchmark {mode} zlyhal:\n{completed.stderr}")
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def _format(self, result):
+        return (
+            f"{result['mode'].upper():>5}: {result['rps']} req/s, "
+            f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms "
+            f"({result['requests']} požiadaviek, {result['concurrency']} súbežne, chyby {result['errors']})"
+        )
+
+    def _run_mode(self, options):
+        user = bench_user(options["user"])
+        with override_settings(ALLOWED_HOSTS=["testserver"], SECURE_SSL_REDIRECT=False, DEBUG=False):
+            login = Client()
+            login.force_login(user)
+            cookies = login.cookies
+            if options["mode"] == "wsgi":
+                latencies, errors, elapsed = self._run_wsgi(options, cookies)
+            else:
+                latencies, errors, elapsed = asyncio.run(self._run_asgi(options, cookies))
+
+        result = summarize(latencies, elapsed)
+        result.update(mode=options["mode"], concurrency=options["concurrency"],
+                      path=options["path"], errors=errors)
+        return result
+
+    def _run_wsgi(self, options, cookies):
+        """Vlákna ako vo vláknovom WSGI serveri (gunicorn --threads)"""
+        def worker(count):
+            client = Client()
+            client.cookies = cookies
+            latencies, errors = [], 0
+            try:
+                for _ in range(count):
+                    start = time.perf_counter()
+                    response = client.generic(options["method"], options["path"])
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+                    latencies.append(time.perf_counter() - start)
+                    errors += response.status_code >= 400
+            finally:
+                connection.close()
+            return latencies, errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as pool:
+            parts = list(pool.map(worker, split_requests(options["requests"], options["concurrency"])))
+        elapsed = time.perf_counter() - started
+        return [lat for part in parts for lat in part[0]], sum(part[1] for part in parts), elapsed
+
+    async def _run_asgi(self, options, cookies):
+        """Korutíny nad jedným event loopom ako v uvicorn"""
+        client = AsyncClient()
+        client.cookies = cookies
+
+        async def worker(count):
+            latencies, errors = [], 0
+            for _ in range(count):
+                start = time.perf_counter()
+                response = await client.generic(options["method"], options["path"])
+                if response.streaming:
+                    b"".join([chunk async for chunk in response.streaming_content])
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code >= 400
+            return latencies, errors
+
+        started = time.perf_counter()
+        parts = await asyncio.gather(*(worker(n) for n in split_requests(options["requests"], options["concurrency"])))
+        elapsed = time.perf_counter() - started
+        return [lat for part in parts for lat in part[0]], sum(part[1] for part in parts), elapsed
@@ -0,0 +1,92 @@
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from tasks.models import Task
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Assert that task_list runs a fixed number of SQL queries regardless of row count"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[1, 10, 50],
+            help="Počty úloh, pre ktoré sa zoznam vykreslí",
+        )
+        parser.add_argument(
+            "--max-queries", type=int, default=None,
+            help="Horný limit dotazov na jedno vykreslenie",
+        )
+
+    def handle(self, *args, **options):
+        counts = {}
+        try:
+            # Všetko beží v transakcii, ktorá sa na konci zahodí
+            with transaction.atomic():
+                counts = self._measure(options["sizes"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        failed = False
+        for role, by_size in counts.items():
+            self.stdout.write(f"{role}:")
+            for size, queries in by_size.items():
+                self.stdout.write(f"{size:>6} úloh → {len(queries)} dotazov")
+
+            distinct = {len(queries) for queries in by_size.values()}
+            if len(distinct) > 1:
+                failed = True
+                worst = max(by_size.values(), key=len)
+                for query in worst:
+                    self.stdout.write(f"  {query['sql'][:160]}")
+                self.stderr.write(f"Počet dotazov pre {role} závisí od počtu úloh: {sorted(distinct)}")
+
+            limit = options["max_queries"]
+            if limit is not None and max(distinct) > limit:
+                failed = True
+                self.stderr.write(f"Zoznam úloh pre {role} prekročil limit {limit} dotazov")
+
+        if failed:
+            raise CommandError("Kontrola počtu dotazov task_list zlyhala")
+        self.stdout.write(self.style.SUCCESS("✅ Počet dotazov task_list je konštantný"))
+
+    def _measure(self, sizes):
+        owner = User.objects.create_user("query-check-owner")
+        # Reader vidí všetky úlohy, ale tlačidlá závisia od vlastníctva riadku
+        reader = User.objects.create_user("query-check-reader")
+        reader.groups.add(Group.objects.get_or_create(name="Reader")[0])
+        superuser = User.objects.create_superuser("query-check-admin", "query-check@localhost", None)
+        viewers = {"Reader": reader, "superuser": superuser}
+
+        # Stránka musí obsiahnuť všetky riadky, inak by N+1 skryl limit stránky
+        page_size = Task.objects.count() + max(sizes)
+
+        url = reverse("task_list")
+        counts = {role: {} for role in viewers}
+        with override_settings(
+            ALLOWED_HOSTS=["testserver"], SECURE_SSL_REDIRECT=False, TASK_LIST_PAGE_SIZE=page_size,
+        ):
+            created = 0
+            for size in sorted(sizes):
+                Task.objects.bulk_create(
+                    Task(title=f"Úloha {i}", user=owner if i % 2 else reader)
+                    for i in range(created, size)
+                )
+                created = max(created, size)
+                for role, viewer in viewers.items():
+                    client = Client()
+                    client.force_login(viewer)
+                    with CaptureQueriesContext(connection) as ctx:
+                        response = client.get(url)
+                    if response.status_code != 200:
+                        raise CommandError(f"task_list vrátil {response.status_code}")
+                    counts[role][size] = ctx.captured_queries
+        return counts
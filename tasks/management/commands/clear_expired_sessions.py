@@ -0,0 +1,58 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions in small batches so the django_session table is never "
+        "locked by one large DELETE (a batched alternative to clearsessions)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Riadkov na jeden DELETE (predvolene SESSION_CLEANUP_BATCH_SIZE)")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Pauza medzi dávkami v sekundách")
+        parser.add_argument("--max-batches", type=int, default=None, help="Najviac dávok v jednom behu")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or settings.SESSION_CLEANUP_BATCH_SIZE
+        if batch_size < 1:
+            raise CommandError("--batch-size musí byť kladné")
+
+        engine = import_module(settings.SESSION_ENGINE)
+        store = engine.SessionStore
+        if not hasattr(store, "get_model_class"):
+            # cache a signed_cookies expirujú samy, file backend má vlastné upratovanie
+            try:
+                store.clear_expired()
+            except NotImplementedError:
+                pass
+            self.stdout.write(f"Backend {settings.SESSION_ENGINE} nemá tabuľku na upratanie")
+            return
+
+        model = store.get_model_class()
+        now = timezone.now()
+        deleted = batches = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            with transaction.atomic():
+                # Kľúče dávky cez index expire_date, DELETE potom podľa primárneho kľúča
+                keys = list(
+                    model.objects.filter(expire_date__lt=now)
+                    .values_list("session_key", flat=True)[:batch_size]
+                )
+                if not keys:
+                    break
+                count, _ = model.objects.filter(session_key__in=keys).delete()
+            deleted += count
+            batches += 1
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Dávka {batches}: zmazaných {count} session")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Zmazaných {deleted} expirovaných session v {batches} dávkach"))
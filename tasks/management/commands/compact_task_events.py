@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tasks.audit import compact_events
+from tasks.models import TaskEvent
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold task history events older than N days into one SNAPSHOT event per task "
+        "with the net field changes, so the event table does not grow without bound"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None,
+                            help="Vek záznamu v dňoch (predvolene TASK_EVENT_COMPACT_AFTER_DAYS)")
+        parser.add_argument("--batch-size", type=int, default=500, help="Úloh na jednu transakciu")
+        parser.add_argument("--dry-run", action="store_true", help="Len spočítať staré záznamy")
+
+    def handle(self, *args, **options):
+        days = settings.TASK_EVENT_COMPACT_AFTER_DAYS if options["days"] is None else options["days"]
+        if days < 0 or options["batch_size"] < 1:
+            raise CommandError("--days musí byť nezáporné a --batch-size kladné")
+        cutoff = timezone.now() - timedelta(days=days)
+
+        if options["dry_run"]:
+            count = TaskEvent.objects.filter(created_at__lt=cutoff).count()
+            self.stdout.write(f"Záznamov starších ako {cutoff:%d.%m.%Y}: {count}")
+            return
+
+        tasks, folded = compact_events(cutoff, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Zlúčených {folded} záznamov do {tasks} snapshotov"))
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import Group, Permission
 from tasks.models import Task
+from tasks.roles import GROUP_PERMISSIONS, invalidate_roles
 from django.contrib.contenttypes.models import ContentType
 
 
@@ -11,15 +12,8 @@ class Command(BaseCommand):
         # Získanie content types
         task_content_type = ContentType.objects.get_for_model(Task)
 
-        # Definuj skupiny s oprávneniami
-        groups = {
-            "Reader": ["view_task", "add_task"],  # Čítať + vytvárať tasky
-            "Editor": ["view_task", "add_task", "change_task"],  # Reader + upravovať
-            "Manager": ["view_task", "add_task", "change_task", "delete_task"],  # Editor + mazať
-            "Admin": ["view_task", "add_task", "change_task", "delete_task"]  # Všetko pre tasky
-        }
-
-        for group_name, perms in groups.items():
+        # Skupiny s oprávneniami sú definované v tasks/roles.py
+        for group_name, perms in GROUP_PERMISSIONS.items():
             group, created = Group.objects.get_or_create(name=group_name)
 
             # Vymazanie starých oprávnení
@@ -50,6 +44,9 @@ class Command(BaseCommand):
                 )
             )
 
+        # Roly v cache mohli vzniknúť ešte pred vytvorením skupín
+        invalidate_roles()
+
         # Výpis súhrnu
         self.stdout.write('\n' + '=' * 50)
         self.stdout.write(self.style.SUCCESS('📋 SÚHRN SKUPÍN A OPRÁVNENÍ:'))
@@ -0,0 +1,101 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.pagination import KeysetPaginator
+from tasks.queries import TASK_FILTERS, filter_tasks, list_columns
+from tasks.stats import compute_stats
+
+# Názvy indexov vo výstupe EXPLAIN (SQLite QUERY PLAN / PostgreSQL)
+INDEX_PATTERNS = {
+    "sqlite": re.compile(r"USING (?:COVERING )?INDEX (\w+)"),
+    "postgresql": re.compile(r"(?:Index Scan|Index Only Scan|Bitmap Index Scan)(?: Backward)? (?:using|on) (\w+)"),
+}
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN for every task_list filter variant and report which index is used"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Používateľ pre rozsah 'vlastné úlohy' (predvolene prvý)")
+        parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE (len PostgreSQL)")
+        parser.add_argument("--verbose-plan", action="store_true", help="Vypíše celý plán dotazu")
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in INDEX_PATTERNS:
+            raise CommandError(f"EXPLAIN report nepodporuje databázu '{vendor}'")
+
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"Používateľ '{options['user']}' neexistuje")
+        else:
+            user = User.objects.order_by("pk").first()
+            if user is None:
+                raise CommandError("V databáze nie je žiadny používateľ")
+
+        explain_options = {}
+        if options["analyze"]:
+            if vendor != "postgresql":
+                raise CommandError("--analyze je dostupné len pre PostgreSQL")
+            explain_options = {"analyze": True}
+
+        today = timezone.now().date()
+        scopes = {"všetky": Task.objects.all(), f"používateľ {user.username}": Task.objects.filter(user=user)}
+
+        self.stdout.write(f"Databáza: {vendor}\n")
+        for scope_name, scope in scopes.items():
+            for filter_by in TASK_FILTERS:
+                tasks = list_columns(filter_tasks(scope, filter_by, today), user)
+                page = KeysetPaginator(tasks).queryset[: settings.TASK_LIST_PAGE_SIZE + 1]
+                self._report(f"{scope_name} / {filter_by}", page, vendor, explain_options, options)
+
+            # Agregované štatistiky (jeden dotaz cez celý rozsah)
+            plan = self._explain_aggregate(scope, today, explain_options)
+            self._print(f"{scope_name} / štatistiky", plan, vendor, options)
+
+    def _report(self, label, queryset, vendor, explain_options, options):
+        plan = queryset.explain(**explain_options)
+        self._print(label, plan, vendor, options)
+
+    def _explain_aggregate(self, scope, today, explain_options):
+        # aggregate() nemá .explain(), preto sa vykoná so zachytením SQL
+        capture = _CaptureSQL()
+        with connection.execute_wrapper(capture):
+            compute_stats(scope, today)
+        sql, params = capture.queries[-1]
+        prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else (
+            "EXPLAIN ANALYZE " if explain_options else "EXPLAIN "
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+        return "\n".join(" ".join(str(col) for col in row) for row in rows)
+
+    def _print(self, label, plan, vendor, options):
+        indexes = sorted(set(INDEX_PATTERNS[vendor].findall(plan)))
+        if indexes:
+            self.stdout.write(self.style.SUCCESS(f"✅ {label}: {', '.join(indexes)}"))
+        else:
+            self.stdout.write(self.style.WARNING(f"⚠️  {label}: bez indexu (sekvenčný prechod)"))
+        if options["verbose_plan"]:
+            for line in plan.splitlines():
+                self.stdout.write(f"      {line}")
+
+
+class _CaptureSQL:
+    """execute_wrapper, ktorý si zapamätá vykonané SQL s parametrami"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params))
+        return execute(sql, params, many, context)
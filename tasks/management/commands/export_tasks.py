@@ -0,0 +1,65 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from tasks.models import Task
+from tasks.transfer import FORMATS, Checkpoint, RowWriter, detect_format, open_stream
+
+VALUE_FIELDS = ('id', 'title', 'description', 'due_date', 'status', 'completed', 'created_at', 'updated_at')
+
+
+class Command(BaseCommand):
+    help = "Stream tasks to a CSV or JSONL file in constant memory, resumable via a checkpoint file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Cieľový súbor alebo '-' pre stdout")
+        parser.add_argument("--format", choices=FORMATS, help="Predvolene podľa prípony súboru")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Riadkov na jedno načítanie z DB")
+        parser.add_argument("--user", help="Exportovať len úlohy tohto používateľa")
+        parser.add_argument("--checkpoint", help="Súbor so stavom pre pokračovanie po prerušení")
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        fmt = detect_format(output, options["format"])
+        chunk_size = options["chunk_size"]
+        if options["checkpoint"] and output == "-":
+            raise CommandError("--checkpoint vyžaduje výstup do súboru")
+
+        checkpoint = Checkpoint(options["checkpoint"])
+        if checkpoint.get("done"):
+            # Checkpoint zo staršej verzie, ktorá ho po dokončení nemazala – nový export od začiatku
+            checkpoint.clear()
+        last_id = checkpoint.get("last_id", 0)
+        exported = checkpoint.get("rows", 0)
+        resuming = bool(checkpoint.get("offset"))
+        if resuming:
+            # Riadky zapísané po poslednom checkpointe sa zahodia, inak by sa zdvojili
+            os.truncate(output, checkpoint.get("offset"))
+
+        tasks = Task.objects.filter(pk__gt=last_id)
+        if options["user"]:
+            tasks = tasks.filter(user__username=options["user"])
+        # Poradie podľa id – kurzor pre pokračovanie, .iterator() drží v pamäti len jeden blok
+        rows = tasks.order_by("pk").values(*VALUE_FIELDS, username=F("user__username"))
+
+        with open_stream(output, "a" if resuming else "w") as handle:
+            writer = RowWriter(handle, fmt, write_header=not resuming)
+            for row in rows.iterator(chunk_size=chunk_size):
+                row["user"] = row.pop("username")
+                writer.write(row)
+                exported += 1
+                last_id = row["id"]
+                if exported % chunk_size == 0:
+                    self._checkpoint(writer, checkpoint, handle, last_id, exported)
+            writer.flush()
+        # Dokončený export checkpoint nepotrebuje – ďalší beh do toho istého súboru začne znova
+        checkpoint.clear()
+
+        if output != "-":
+            self.stdout.write(self.style.SUCCESS(f"✅ Exportovaných {exported} úloh do {output}"))
+
+    def _checkpoint(self, writer, checkpoint, handle, last_id, exported):
+        writer.flush()
+        if checkpoint.path:
+            checkpoint.save(last_id=last_id, rows=exported, offset=handle.tell())
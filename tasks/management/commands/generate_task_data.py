@@ -0,0 +1,125 @@
+import random
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.counters import apply_counter_changes
+from tasks.fragments import bump_fragments
+from tasks.models import Task
+from tasks.roles import GROUP_PERMISSIONS
+from tasks.search import get_search_backend
+from tasks.stats import invalidate_stats
+
+# Podiel používateľov v skupinách – väčšina len číta, adminov je málo
+GROUP_WEIGHTS = {None: 40, "Reader": 30, "Editor": 15, "Manager": 10, "Admin": 5}
+
+WORDS = (
+    "report", "faktúra", "stretnutie", "nákup", "oprava", "plán", "prezentácia", "zmluva",
+    "recenzia", "nasadenie", "záloha", "školenie", "rozpočet", "dokumentácia", "audit",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users spread across the permission groups and tasks with "
+        "skewed due dates, inserted in batches (suitable for millions of rows)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100, help="Počet používateľov")
+        parser.add_argument("--tasks", type=int, default=100_000, help="Počet úloh")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Riadkov na jeden bulk_create")
+        parser.add_argument("--prefix", default="bench", help="Predpona mien používateľov")
+        parser.add_argument("--password", default="bench-password", help="Heslo všetkých používateľov")
+        parser.add_argument("--seed", type=int, default=42, help="Seed generátora – rovnaké dáta pri každom behu")
+        parser.add_argument("--skip-search-index", action="store_true", help="Neprebudovať fulltextový index")
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["tasks"] < 0 or options["batch_size"] < 1:
+            raise CommandError("--users a --batch-size musia byť kladné, --tasks nezáporné")
+        rng = random.Random(options["seed"])
+
+        if Group.objects.filter(name__in=GROUP_PERMISSIONS).count() < len(GROUP_PERMISSIONS):
+            call_command("create_groups", stdout=self.stdout)
+
+        users = self._create_users(rng, options)
+        self.stdout.write(f"Používatelia: {len(users)}")
+
+        # Aktivita používateľov je nerovnomerná – pár používateľov má väčšinu úloh
+        cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(users))))
+        today = timezone.now().date()
+        tasks = (self._task(rng, users, cum_weights, today) for _ in range(options["tasks"]))
+        created = 0
+        while True:
+            batch = list(islice(tasks, options["batch_size"]))
+            if not batch:
+                break
+            with transaction.atomic():
+                Task.objects.bulk_create(batch)
+                apply_counter_changes([(None, task.stats_state()) for task in batch])
+            created += len(batch)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Úlohy: {created}/{options['tasks']}")
+
+        # bulk_create neposiela signály – index, štatistiky a fragmenty sa obnovia naraz
+        if not options["skip_search_index"]:
+            get_search_backend().rebuild()
+        user_ids = [user.pk for user in users]
+        invalidate_stats(user_ids)
+        bump_fragments(user_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(users)} používateľov, vytvorených {created} úloh (heslo: {options['password']})"
+        ))
+
+    def _create_users(self, rng, options):
+        prefix = options["prefix"]
+        existing = set(User.objects.filter(username__startswith=f"{prefix}-").values_list("username", flat=True))
+        # Hash sa počíta raz – make_password pre každého používateľa by trval minúty
+        password = make_password(options["password"])
+        new_users = [
+            User(username=name, email=f"{name}@example.com", password=password)
+            for name in (f"{prefix}-{i:06d}" for i in range(options["users"]))
+            if name not in existing
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(new_users, batch_size=options["batch_size"])
+            users = list(User.objects.filter(username__startswith=f"{prefix}-").order_by("username")[: options["users"]])
+
+            groups = {group.name: group for group in Group.objects.filter(name__in=GROUP_PERMISSIONS)}
+            names, weights = zip(*GROUP_WEIGHTS.items())
+            membership = User.groups.through
+            new_names = {user.username for user in new_users}
+            membership.objects.bulk_create([
+                membership(user_id=user.pk, group_id=groups[name].pk)
+                for user, name in zip(users, rng.choices(names, weights, k=len(users)))
+                if name is not None and user.username in new_names
+            ], batch_size=options["batch_size"])
+        return users
+
+    def _task(self, rng, users, cum_weights, today):
+        completed = rng.random() < 0.4
+        # Termíny: štvrtina bez termínu, 15 % po termíne, zvyšok hlavne v najbližších
+        # týždňoch s dlhým chvostom do budúcnosti
+        roll = rng.random()
+        if roll < 0.25:
+            due_date = None
+        elif roll < 0.4:
+            due_date = today - timedelta(days=int(rng.expovariate(1 / 20)) + 1)
+        else:
+            due_date = today + timedelta(days=int(rng.expovariate(1 / 14)))
+        title = " ".join(rng.sample(WORDS, 2)).capitalize()
+        return Task(
+            title=f"{title} #{rng.randrange(10_000)}",
+            description=" ".join(rng.choices(WORDS, k=rng.randrange(0, 20))),
+            due_date=due_date,
+            completed=completed,
+            status="COMPLETED" if completed else rng.choice(("PENDING", "IN_PROGRESS")),
+            user=rng.choices(users, cum_weights=cum_weights)[0],
+        )
@@ -0,0 +1,123 @@
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tasks.forms import ImportTaskForm
+from tasks.audit import audit_values, diff, write_events
+from tasks.counters import apply_counter_changes
+from tasks.fragments import bump_fragments
+from tasks.models import ImportCheckpoint, Task, TaskEvent
+from tasks.search import get_search_backend
+from tasks.stats import invalidate_stats
+from tasks.transfer import FORMATS, detect_format, open_stream, read_rows
+
+FALSE_VALUES = ("", "0", "false", "no", "nie")
+
+
+class Command(BaseCommand):
+    help = "Stream tasks from a CSV or JSONL file, validate like TaskForm and insert in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="Zdrojový súbor alebo '-' pre stdin")
+        parser.add_argument("--format", choices=FORMATS, help="Predvolene podľa prípony súboru")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Riadkov na jeden bulk_create")
+        parser.add_argument("--default-user", help="Vlastník úloh bez stĺpca 'user'")
+        parser.add_argument("--allow-past-due", action="store_true", help="Povoliť termín v minulosti")
+        parser.add_argument(
+            "--checkpoint", help="Názov stavu pre pokračovanie po prerušení (uložený v DB spolu s dávkou)",
+        )
+        parser.add_argument("--max-errors", type=int, default=100, help="Koľko chybných riadkov vypísať")
+
+    def handle(self, *args, **options):
+        fmt = detect_format(options["input"], options["format"])
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size musí byť kladné")
+
+        default_user = None
+        if options["default_user"]:
+            try:
+                default_user = User.objects.get(username=options["default_user"])
+            except User.DoesNotExist:
+                raise CommandError(f"Používateľ '{options['default_user']}' neexistuje")
+
+        name = options["checkpoint"]
+        self.checkpoint = ImportCheckpoint.objects.get_or_create(name=name)[0] if name else None
+        skip_to = self.checkpoint.line if self.checkpoint else 0
+        self.imported = self.checkpoint.imported if self.checkpoint else 0
+        self.failed = self.checkpoint.failed if self.checkpoint else 0
+        self.max_errors = options["max_errors"]
+        self.search_backend = get_search_backend()
+
+        with open_stream(options["input"], "r") as handle:
+            rows = ((number, row) for number, row in read_rows(handle, fmt) if number > skip_to)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                self._import_batch(batch, default_user, options["allow_past_due"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Importovaných {self.imported} úloh, chybných riadkov {self.failed}"
+        ))
+
+    def _import_batch(self, batch, default_user, allow_past_due):
+        # Používatelia dávky jedným dotazom
+        usernames = {row.get("user") for _, row in batch if row.get("user")}
+        users = {user.username: user for user in User.objects.filter(username__in=usernames)}
+
+        tasks = []
+        for number, row in batch:
+            if "__error__" in row:
+                self._error(number, row["__error__"])
+                continue
+            owner = users.get(row.get("user")) if row.get("user") else default_user
+            if owner is None:
+                self._error(number, f"Neznámy používateľ '{row.get('user', '')}'")
+                continue
+
+            data = dict(row)
+            if isinstance(data.get("completed"), str) and data["completed"].strip().lower() in FALSE_VALUES:
+                data["completed"] = False
+            if not data.get("status"):
+                data["status"] = "PENDING"
+            form = ImportTaskForm(data, allow_past_due=allow_past_due)
+            if not form.is_valid():
+                self._error(number, "; ".join(
+                    f"{field}: {' '.join(errors)}" for field, errors in form.errors.items()
+                ))
+                continue
+            task = form.save(commit=False)
+            task.user = owner
+            tasks.append(task)
+
+        with transaction.atomic():
+            created = Task.objects.bulk_create(tasks) if tasks else []
+            if created:
+                # bulk_create neposiela signály – index, počty a štatistiky sa doplnia tu
+                self.search_backend.index_tasks(created)
+                apply_counter_changes([(None, task.stats_state()) for task in created])
+                write_events(
+                    (task.pk, task.user_id, TaskEvent.CREATED, diff(None, audit_values(task)), None)
+                    for task in created
+                )
+            self.imported += len(created)
+            # Checkpoint v tej istej transakcii – dávka a jej stav sa zapíšu spolu alebo vôbec
+            self._save_checkpoint(batch[-1][0])
+        if created:
+            owner_ids = {task.user_id for task in created}
+            invalidate_stats(owner_ids)
+            bump_fragments(owner_ids)
+
+    def _save_checkpoint(self, line):
+        if self.checkpoint is None:
+            return
+        self.checkpoint.line, self.checkpoint.imported, self.checkpoint.failed = line, self.imported, self.failed
+        self.checkpoint.save(update_fields=["line", "imported", "failed", "updated_at"])
+
+    def _error(self, number, message):
+        self.failed += 1
+        if self.failed <= self.max_errors:
+            self.stderr.write(f"Riadok {number}: {message}")
@@ -0,0 +1,84 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from tasks.models import Task
+
+
+class _Rollback(Exception):
+    pass
+
+
+STEPS = ("login", "create", "list", "toggle", "list")
+
+
+class Command(BaseCommand):
+    help = (
+        "Count django_session reads and writes for a login + create + toggle round-trip "
+        "under each session engine and message storage combination"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sessions", nargs="+", choices=sorted(settings.SESSION_ENGINES),
+                            default=["db", "cached_db", "cache", "signed_cookies"])
+        parser.add_argument("--messages", nargs="+", choices=sorted(settings.MESSAGE_STORAGES),
+                            default=["session", "fallback", "cookie"])
+        parser.add_argument("--json", action="store_true", help="Výstup ako JSON")
+
+    def handle(self, *args, **options):
+        results = []
+        try:
+            # Používateľ aj úlohy sa na konci zahodia
+            with transaction.atomic():
+                user = User.objects.create_superuser("session-check", "session-check@localhost", "session-check")
+                for session in options["sessions"]:
+                    for message in options["messages"]:
+                        results.append(self._measure(user, session, message))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        baseline = results[0]["writes"] if results else 0
+        for result in results:
+            steps = ", ".join(f"{name} {count}" for name, count in result["steps"])
+            self.stdout.write(
+                f"{result['session']:>14} + {result['message']:<8}: zápisy {result['writes']:>2} "
+                f"(ušetrené {baseline - result['writes']:>2}), čítania {result['reads']:>2}  [{steps}]"
+            )
+
+    def _measure(self, user, session, message):
+        with override_settings(
+            SESSION_ENGINE=settings.SESSION_ENGINES[session],
+            MESSAGE_STORAGE=settings.MESSAGE_STORAGES[message],
+            ALLOWED_HOSTS=["testserver"], SECURE_SSL_REDIRECT=False,
+        ):
+            # Nový klient – SessionMiddleware si engine načíta pri vytvorení handlera
+            client = Client()
+            steps, writes, reads = [], 0, 0
+            task = None
+            for name in STEPS:
+                with CaptureQueriesContext(connection) as ctx:
+                    if name == "login":
+                        client.login(username=user.username, password="session-check")
+                    elif name == "create":
+                        client.post(reverse("task_create"), {"title": "Meranie session", "status": "PENDING"})
+                        task = Task.objects.filter(user=user).latest("pk")
+                    elif name == "toggle":
+                        client.post(reverse("task_toggle_complete", args=[task.pk]))
+                    else:
+                        client.get(reverse("task_list"))
+                session_queries = [q["sql"] for q in ctx.captured_queries if "django_session" in q["sql"]]
+                step_writes = sum(not sql.lstrip().upper().startswith("SELECT") for sql in session_queries)
+                writes += step_writes
+                reads += len(session_queries) - step_writes
+                steps.append((name, step_writes))
+        return {"session": session, "message": message, "writes": writes, "reads": reads, "steps": steps}
@@ -0,0 +1,138 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PHASES = ("settings", "setup", "application", "first_request", "second_request")
+
+# "import time: self [us] | cumulative | imported package"
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_importtime(stderr):
+    """Riadky -X importtime ako (modul, self µs, kumulatívne µs, hĺbka)"""
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules.append((name, int(own), int(cumulative), (len(indent) - 1) // 2))
+    return modules
+
+
+def by_package(modules):
+    """Súčet vlastného času importu podľa balíka najvyššej úrovne (django, allauth, tasks…)"""
+    totals = defaultdict(int)
+    for name, own, _, _ in modules:
+        totals[name.split(".")[0]] += own
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile worker cold start in fresh processes: per-module import time "
+        "(python -X importtime), boot phases and time to first request, optionally "
+        "comparing the default boot with TASK_FAST_BOOT"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/accounts/login/",
+                            help="URL prvej požiadavky (predvolene prihlásenie – bez session)")
+        parser.add_argument("--repeat", type=int, default=3,
+                            help="Počet čerstvých procesov na režim – fázy sú medián")
+        parser.add_argument("--top", type=int, default=15, help="Počet najdrahších modulov vo výpise")
+        parser.add_argument("--compare", action="store_true",
+                            help="Porovnať štandardný štart s TASK_FAST_BOOT=1")
+        parser.add_argument("--json", action="store_true", help="Výstup ako JSON")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1 or options["top"] < 1:
+            raise CommandError("--repeat a --top musia byť kladné")
+
+        # Bez --compare platí TASK_FAST_BOOT z prostredia, inak sa merajú oba režimy
+        modes = [False, True] if options["compare"] else [settings.TASK_FAST_BOOT]
+        results = [self._profile(fast_boot, options) for fast_boot in modes]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self._report(result, options["top"])
+        if len(results) == 2:
+            self._compare(*results)
+
+    def _spawn(self, fast_boot, path):
+        """Čerstvý proces s -X importtime – import adminu a allauth sa meria od nuly"""
+        code = f"from tasker.boot import probe; probe({path!r})"
+        # Zahriatie sa riadi režimom, aby porovnanie merala celý rozdiel
+        env = {
+            **os.environ,
+            "TASK_FAST_BOOT": "1" if fast_boot else "0",
+            "TASK_BOOT_WARMUP": "1" if fast_boot else "0",
+        }
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            raise CommandError(f"Meranie štartu zlyhalo:\n{completed.stderr[-4000:]}")
+        return json.loads(completed.stdout.strip().splitlines()[-1]), parse_importtime(completed.stderr)
+
+    def _profile(self, fast_boot, options):
+        runs = [self._spawn(fast_boot, options["path"]) for _ in range(options["repeat"])]
+        phases = {
+            phase: round(statistics.median(run["phases"][phase] for run, _ in runs), 2) for phase in PHASES
+        }
+        # Rozpad importov z behu s mediánom celkového času (nie priemer cez behy)
+        totals = [sum(run["phases"].values()) for run, _ in runs]
+        run, modules = runs[totals.index(statistics.median_low(totals))]
+        top = sorted(modules, key=lambda module: module[1], reverse=True)[: options["top"]]
+        return {
+            "fast_boot": fast_boot,
+            "status": run["status"],
+            "phases_ms": phases,
+            # Kedy môže server prijímať požiadavky a kedy prvá z nich dostane odpoveď
+            "ready_ms": round(sum(phases[phase] for phase in PHASES[:3]), 2),
+            "time_to_first_request_ms": round(sum(phases[phase] for phase in PHASES[:4]), 2),
+            "warm_up_ms": run["warm_up"],
+            "modules_loaded": run["modules"],
+            "import_ms": round(sum(own for _, own, _, _ in modules) / 1000, 2),
+            "packages_ms": [(name, round(own / 1000, 2)) for name, own in by_package(modules)[: options["top"]]],
+            "modules_ms": [
+                (name, round(own / 1000, 2), round(cumulative / 1000, 2)) for name, own, cumulative, _ in top
+            ],
+        }
+
+    def _report(self, result, top):
+        mode = "TASK_FAST_BOOT" if result["fast_boot"] else "štandardný štart"
+        self.stdout.write(self.style.MIGRATE_HEADING(f"== {mode} (prvá požiadavka: HTTP {result['status']})"))
+        for phase, ms in result["phases_ms"].items():
+            self.stdout.write(f"  {phase:<16} {ms:>9.1f} ms")
+        if result["warm_up_ms"]:
+            steps = ", ".join(f"{step} {ms:.1f} ms" for step, ms in result["warm_up_ms"].items())
+            self.stdout.write(f"  {'':<16} z toho warm_up: {steps}")
+        self.stdout.write(
+            f"  Pripravený po {result['ready_ms']:.1f} ms, "
+            f"prvá odpoveď po {result['time_to_first_request_ms']:.1f} ms, "
+            f"importy {result['import_ms']:.1f} ms, {result['modules_loaded']} modulov"
+        )
+        self.stdout.write("  Balíky (vlastný čas importu):")
+        for name, ms in result["packages_ms"]:
+            self.stdout.write(f"    {name:<32} {ms:>8.1f} ms")
+        self.stdout.write(f"  Top {top} modulov (vlastný / kumulatívny):")
+        for name, own, cumulative in result["modules_ms"]:
+            self.stdout.write(f"    {name:<48} {own:>8.1f} {cumulative:>9.1f} ms")
+
+    def _compare(self, default, fast):
+        self.stdout.write(self.style.MIGRATE_HEADING("== Porovnanie (medián, ms)"))
+        for phase in PHASES:
+            before, after = default["phases_ms"][phase], fast["phases_ms"][phase]
+            self.stdout.write(f"  {phase:<16} {before:>9.1f} → {after:>9.1f}")
+        for label, key in (("pripravený", "ready_ms"), ("do 1. odpovede", "time_to_first_request_ms")):
+            self.stdout.write(f"  {label:<16} {default[key]:>9.1f} → {fast[key]:>9.1f}")
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from tasks.search import clear_search_backend_cache, get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for tasks from the Task table"
+
+    def handle(self, *args, **options):
+        # Výber znova podľa aktuálnej schémy – FTS tabuľka mohla medzitým pribudnúť
+        clear_search_backend_cache()
+        backend = get_search_backend()
+        indexed = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {type(backend).__name__}: zaindexovaných {indexed} úloh"
+        ))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.counters import counters_enabled, reconcile_counters
+from tasks.fragments import bump_fragments
+from tasks.stats import ALL_SCOPE, invalidate_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the denormalized TaskCounters and due-date histogram with the task table "
+        "and repair any drift (e.g. after raw SQL or bulk writes that bypassed the counters); "
+        "run it right after switching TASK_STATS_SOURCE to counters to build them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Len vypísať rozdiely, nič neopravovať")
+        parser.add_argument("--fail-on-drift", action="store_true",
+                            help="Skončiť chybou, ak sa nájde rozdiel (pre monitoring)")
+
+    def handle(self, *args, **options):
+        if not counters_enabled():
+            # Neudržiavané počty by sa len znova rozišli – postavia sa až po zapnutí
+            self.stdout.write("Počítadlá sú vypnuté (TASK_STATS_SOURCE nie je 'counters'), nič sa neporovnáva")
+            return
+        drift = reconcile_counters(repair=not options["dry_run"])
+        for scope, field, have, actual in drift:
+            self.stdout.write(f"{scope:<12} {field:<16} uložené {have:>8}, skutočné {actual:>8}")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("✅ Počty úloh zodpovedajú tabuľke úloh"))
+            return
+
+        if not options["dry_run"]:
+            # Opravené počty sa musia prejaviť aj v cache štatistík a fragmentov
+            user_ids = {int(scope.split(":", 1)[1]) for scope, *_ in drift if scope != ALL_SCOPE}
+            invalidate_stats(user_ids)
+            bump_fragments(user_ids)
+            self.stdout.write(self.style.WARNING(f"Opravených rozdielov: {len(drift)}"))
+        if options["fail_on_drift"]:
+            raise CommandError(f"Nájdených rozdielov: {len(drift)}")
@@ -0,0 +1,76 @@
+import json
+import statistics
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+METRICS = ("total_ms", "sql_ms", "template_ms", "queries")
+
+
+def percentiles(values):
+    """p50, p95 a p99 zo zoznamu hodnôt"""
+    values = sorted(values)
+    if len(values) == 1:
+        return values * 3
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+class Command(BaseCommand):
+    help = "Aggregate samples recorded by QueryTimingMiddleware into per-URL-name percentile reports"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--log", help="Súbor so vzorkami (predvolene TASK_INSTRUMENTATION_LOG)")
+        parser.add_argument("--sort", choices=METRICS, default="total_ms", help="Zoradiť podľa p95 tejto metriky")
+        parser.add_argument("--url-name", help="Len tento názov URL")
+        parser.add_argument("--json", action="store_true", help="Výstup ako JSON")
+
+    def handle(self, *args, **options):
+        path = options["log"] or settings.TASK_INSTRUMENTATION_LOG
+        samples = defaultdict(list)
+        try:
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if options["url_name"] and record["url_name"] != options["url_name"]:
+                        continue
+                    samples[record["url_name"]].append(record)
+        except FileNotFoundError:
+            raise CommandError(f"Súbor {path} neexistuje – je zapnuté TASK_INSTRUMENTATION?")
+
+        report = []
+        for url_name, records in samples.items():
+            row = {
+                "url_name": url_name,
+                "requests": len(records),
+                "errors": sum(record["status"] >= 500 for record in records),
+                "with_duplicates": sum(bool(record["duplicates"]) for record in records),
+                "max_queries": max(record["queries"] for record in records),
+            }
+            for metric in METRICS:
+                p50, p95, p99 = percentiles([record[metric] for record in records])
+                row[metric] = {"p50": round(p50, 2), "p95": round(p95, 2), "p99": round(p99, 2)}
+            report.append(row)
+        report.sort(key=lambda row: row[options["sort"]]["p95"], reverse=True)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        if not report:
+            self.stdout.write("Žiadne vzorky")
+            return
+        for row in report:
+            total, sql, tpl, queries = (row[metric] for metric in METRICS)
+            self.stdout.write(
+                f"{row['url_name']:<28} {row['requests']:>6} req  "
+                f"celkom p50/p95/p99 {total['p50']}/{total['p95']}/{total['p99']} ms  "
+                f"SQL p95 {sql['p95']} ms  šablóny p95 {tpl['p95']} ms  "
+                f"dotazy p50 {queries['p50']:g} max {row['max_queries']}"
+            )
+            if row["with_duplicates"]:
+                self.stdout.write(self.style.WARNING(
+                    f"{'':<28} {row['with_duplicates']} požiadaviek s duplicitnými dotazmi"
+                ))
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tasks.models import ReminderWatermark
+from tasks.reminders import WATERMARK_NAME, purge_reminders, send_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        "Email users about tasks that became overdue or are due soon; meant to run from cron. "
+        "Each run only scans the due-date window and task changes since the previous run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None,
+                            help="Koľko dní vopred pripomenúť (predvolene TASK_REMINDER_DAYS)")
+        parser.add_argument("--lookback-days", type=int, default=None,
+                            help="Najstarší termín po termíne (predvolene TASK_REMINDER_LOOKBACK_DAYS)")
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Správ na jedno send_messages (predvolene TASK_REMINDER_BATCH_SIZE)")
+        parser.add_argument("--dry-run", action="store_true", help="Len spočítať, nič neodoslať")
+        parser.add_argument("--reset", action="store_true",
+                            help="Zabudnúť vodoznak – ďalší beh prejde celé okno (odoslané sa neopakujú)")
+
+    def handle(self, *args, **options):
+        for name in ("days", "lookback_days", "batch_size"):
+            if options[name] is not None and options[name] < (1 if name == "batch_size" else 0):
+                raise CommandError(f"--{name.replace('_', '-')} musí byť kladné")
+
+        if options["reset"]:
+            ReminderWatermark.objects.filter(name=WATERMARK_NAME).delete()
+            self.stdout.write("Vodoznak pripomienok zmazaný")
+
+        result = send_reminders(
+            days=options["days"], lookback=options["lookback_days"],
+            batch_size=options["batch_size"], dry_run=options["dry_run"],
+        )
+        if result["skipped"]:
+            self.stdout.write(self.style.WARNING(f"Bez emailu: {result['skipped']} úloh"))
+        if options["dry_run"]:
+            self.stdout.write(f"Na pripomenutie: {result['tasks']} úloh pre {result['users']} používateľov")
+            return
+
+        # Záznamy s termínom mimo všetkých okien už duplicite nezabránia
+        lookback = settings.TASK_REMINDER_LOOKBACK_DAYS if options["lookback_days"] is None else options["lookback_days"]
+        purged = purge_reminders(timezone.localdate() - timedelta(days=lookback))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Odoslaných {result['messages']} správ ({result['tasks']} úloh), "
+            f"zmazaných starých záznamov: {purged}"
+        ))
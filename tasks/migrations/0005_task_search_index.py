@@ -0,0 +1,47 @@
+from django.db import migrations
+
+FTS_TABLE = 'tasks_task_fts'
+
+# Musí sa zhodovať s tasks.search.PG_VECTOR_SQL
+PG_VECTOR_SQL = (
+    "to_tsvector('simple', coalesce(\"tasks_task\".\"title\", '') || ' ' || "
+    "coalesce(\"tasks_task\".\"description\", ''))"
+)
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                # Bez FTS5 sa použije záložné vyhľadávanie (icontains)
+                return
+        schema_editor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, description)")
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description) "
+            f"SELECT id, title, description FROM tasks_task"
+        )
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS task_search_gin ON tasks_task USING GIN ({PG_VECTOR_SQL})"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS task_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
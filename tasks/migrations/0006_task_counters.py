@@ -0,0 +1,75 @@
+# Generated by Django 5.0 on 2026-10-18 03:21
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_counters(apps, schema_editor):
+    """Počiatočné počty z existujúcich úloh (ďalej ich udržiavajú signály)"""
+    Task = apps.get_model('tasks', 'Task')
+    TaskCounters = apps.get_model('tasks', 'TaskCounters')
+    TaskDueCount = apps.get_model('tasks', 'TaskDueCount')
+
+    counters = {'all': TaskCounters(scope='all')}
+    per_user = Task.objects.values('user_id').annotate(
+        total=Count('id'), completed=Count('id', filter=Q(completed=True)),
+    ).order_by()
+    for row in per_user:
+        counter = TaskCounters(
+            scope=f"user:{row['user_id']}", total=row['total'],
+            completed=row['completed'], pending=row['total'] - row['completed'],
+        )
+        counters[counter.scope] = counter
+        for field in ('total', 'completed', 'pending'):
+            setattr(counters['all'], field, getattr(counters['all'], field) + getattr(counter, field))
+    TaskCounters.objects.bulk_create(counters.values(), batch_size=1000)
+
+    histogram = {}
+    per_date = Task.objects.filter(completed=False, due_date__isnull=False).values(
+        'user_id', 'due_date',
+    ).annotate(count=Count('id')).order_by()
+    for row in per_date:
+        for scope in ('all', f"user:{row['user_id']}"):
+            histogram[scope, row['due_date']] = histogram.get((scope, row['due_date']), 0) + row['count']
+    TaskDueCount.objects.bulk_create(
+        (TaskDueCount(scope=scope, due_date=due_date, count=count) for (scope, due_date), count in histogram.items()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=32, unique=True)),
+                ('total', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Task counters',
+                'verbose_name_plural': 'Task counters',
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskDueCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=32)),
+                ('due_date', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='taskduecount',
+            constraint=models.UniqueConstraint(fields=('scope', 'due_date'), name='task_due_count_unique'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0 on 2026-10-18 03:55
+
+import django.db.models.deletion
+import tasks.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskSearchIndex',
+            fields=[
+                ('task', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='tasks.task')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('fts', tasks.models.FTS5TableField(db_column='tasks_task_fts')),
+            ],
+            options={
+                'db_table': 'tasks_task_fts',
+                'managed': False,
+            },
+        ),
+    ]
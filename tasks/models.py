@@ -1,7 +1,18 @@
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import F
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+
+class TaskConflict(Exception):
+    """Úlohu medzitým zmenil niekto iný – verzia v DB nesedí s očakávanou"""
+
+    def __init__(self, task, expected_version):
+        super().__init__(f'Task {task.pk}: expected version {expected_version}')
+        self.task = task
+        self.expected_version = expected_version
+
+
 class Task(models.Model):
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
@@ -21,17 +32,322 @@ class Task(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)  # ← PRIDANÉ
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Optimistické zamykanie – každý UPDATE zvýši verziu (Task._do_update)
+    version = models.PositiveIntegerField(default=1)
 
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
+        # Indexy podľa prístupových ciest task_list (filter + poradie -created_at, -id)
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='task_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='task_user_created_idx'),
+            models.Index(fields=['completed', '-created_at', '-id'], name='task_done_created_idx'),
+            models.Index(
+                fields=['user', 'completed', '-created_at', '-id'], name='task_user_done_created_idx',
+            ),
+            # Po termíne sú len nedokončené úlohy – čiastočný index je malý. Bez stĺpca
+            # completed: Django ho v SQLite porovnáva ako NOT completed a index by len prechádzal
+            models.Index(
+                fields=['due_date'], name='task_open_due_date_idx',
+                condition=models.Q(completed=False),
+            ),
+            models.Index(
+                fields=['user', 'due_date'], name='task_user_open_due_idx',
+                condition=models.Q(completed=False),
+            ),
+            # Vodoznak pripomienok – nedokončené úlohy zmenené od posledného behu
+            models.Index(
+                fields=['updated_at'], name='task_open_updated_idx',
+                condition=models.Q(completed=False),
+            ),
+            # Archivácia – dokončené úlohy bez zmeny od určitého dátumu
+            models.Index(
+                fields=['updated_at'], name='task_done_updated_idx',
+                condition=models.Q(completed=True),
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Pôvodné hodnoty pre inkrementálnu aktualizáciu štatistík
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # TaskCounters sa upravujú v post_save – v tej istej transakcii ako zápis úlohy
+        using = kwargs.get('using') or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using):
+            if not self._state.adding:
+                self._lock_row(using)
+            super().save(*args, **kwargs)
+        # post_save signály už pôvodné hodnoty videli, odteraz platí nový stav
+        self._loaded_values = {f.attname: getattr(self, f.attname) for f in self._meta.concrete_fields}
+
+    def save_changes(self, fields, expected_version):
+        """Uloží len `fields`, ak má riadok v DB stále verziu `expected_version`
+
+        Podmienený UPDATE ... WHERE version = %s; ak medzitým úlohu zmenil
+        niekto iný, neuloží nič a vyhodí TaskConflict.
+        """
+        self._expected_version = expected_version
+        try:
+            self.save(update_fields=[*fields, 'updated_at'])
+        finally:
+            self.__dict__.pop('_expected_version', None)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        version_field = self._meta.get_field('version')
+        values = [value for value in values if value[0] is not version_field]
+        expected = getattr(self, '_expected_version', None)
+        if expected is not None:
+            base_qs = base_qs.filter(version=expected)
+        # Zvýšenie v SQL – súbežné zápisy sa nemôžu zhodnúť na rovnakej verzii
+        values.append((version_field, None, F('version') + 1))
+        updated = super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if expected is not None and not updated:
+            raise TaskConflict(self, expected)
+        if updated:
+            self.version = (self.version if expected is None else expected) + 1
+        return updated
+
+    def _lock_row(self, using):
+        """Zámok zápisu pred čítaním pôvodného stavu v pre_save a delete()
+
+        Tam, kde chýba SELECT ... FOR UPDATE (SQLite), odložená transakcia, ktorá
+        najprv číta, už nesmie zapisovať, ak medzitým zapísal niekto iný
+        ("database is locked"). Prázdny UPDATE na začiatku získa zámok hneď a
+        počká naň podľa busy_timeout; s očakávanou verziou zároveň odhalí konflikt.
+        """
+        if connections[using].features.has_select_for_update:
+            return
+        rows = Task.objects.using(using).filter(pk=self.pk)
+        expected = getattr(self, '_expected_version', None)
+        if expected is not None:
+            rows = rows.filter(version=expected)
+        if not rows.update(version=F('version')) and expected is not None:
+            raise TaskConflict(self, expected)
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using):
+            self._lock_row(using)
+            # Inštancia mohla byť načítaná pred zmenou inou požiadavkou – počty
+            # v post_delete odčítajú aktuálny stav zamknutého riadku
+            current = Task.objects.select_for_update().filter(pk=self.pk).values(
+                'user_id', 'completed', 'due_date',
+            ).first()
+            if current is not None:
+                self._loaded_values = {**getattr(self, '_loaded_values', {}), **current}
+            return super().delete(*args, **kwargs)
+
+    def stats_state(self, loaded=False):
+        """Trojica (user_id, completed, due_date) pre počítadlá štatistík"""
+        if not loaded:
+            return self.user_id, self.completed, self.due_date
+        values = getattr(self, '_loaded_values', None)
+        if values is None or not {'user_id', 'completed', 'due_date'} <= values.keys():
+            return None
+        return values['user_id'], values['completed'], values['due_date']
+
     def is_overdue(self):
         """Kontrola či je úloha po termíne"""
         if self.due_date and not self.completed:
             return self.due_date < timezone.now().date()
-        return False
\ No newline at end of file
+        return False
+
+
+class ArchivedTask(models.Model):
+    """Dokončená úloha presunutá z tabuľky Task (príkaz archive_tasks)
+
+    Tabuľka úloh tak obsahuje len aktuálne úlohy, ktoré zoznam a počty naozaj
+    čítajú. Id zostáva pôvodné, archív sa číta len na požiadanie (?archived=1).
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+    due_date = models.DateField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, default='COMPLETED')
+    completed = models.BooleanField(default=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_tasks')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    version = models.PositiveIntegerField(default=1)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived task'
+        verbose_name_plural = 'Archived tasks'
+        # Rovnaké prístupové cesty ako zoznam úloh (keyset podľa -created_at, -id)
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='archived_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='archived_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def is_overdue(self):
+        return False
+
+
+class FTS5TableField(models.TextField):
+    """Skrytý stĺpec FTS5 tabuľky pomenovaný ako tabuľka – ľavá strana MATCH a argument bm25()"""
+
+
+@FTS5TableField.register_lookup
+class FTS5Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class TaskSearchIndex(models.Model):
+    """FTS5 tabuľka z migrácie 0005 (len SQLite), rowid = id úlohy
+
+    Nespravovaný model slúži len na spojenie v tasks/search.py – zápisy do indexu
+    idú priamym SQL. Na iných databázach tabuľka neexistuje a model sa nečíta.
+    """
+    task = models.OneToOneField(
+        Task, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid',
+        db_constraint=False, related_name='search_index',
+    )
+    title = models.TextField()
+    description = models.TextField()
+    fts = FTS5TableField(db_column='tasks_task_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'tasks_task_fts'
+
+
+class TaskCounters(models.Model):
+    """Počty úloh pre rozsah štatistík – globálny riadok ('all') a riadok na používateľa
+
+    Rozsah je rovnaký ako v tasks.stats.stats_scope. Bez cudzieho kľúča na
+    používateľa – pri jeho zmazaní sa riadok len vynuluje signálmi úloh.
+    """
+    scope = models.CharField(max_length=32, unique=True)
+    total = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Task counters'
+        verbose_name_plural = 'Task counters'
+
+    def __str__(self):
+        return f'{self.scope}: {self.total}'
+
+
+class TaskDueCount(models.Model):
+    """Histogram nedokončených úloh podľa termínu – počet po termíne je súčet dní pred dneškom"""
+    scope = models.CharField(max_length=32)
+    due_date = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'due_date'], name='task_due_count_unique'),
+        ]
+
+    def __str__(self):
+        return f'{self.scope} {self.due_date}: {self.count}'
+
+
+class TaskReminder(models.Model):
+    """Odoslaná pripomienka – tá istá úloha s tým istým termínom sa nepripomína dvakrát"""
+    KIND_CHOICES = [
+        ('DUE_SOON', 'Due soon'),
+        ('OVERDUE', 'Overdue'),
+    ]
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='reminders')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    due_date = models.DateField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'kind', 'due_date'], name='task_reminder_unique'),
+        ]
+
+    def __str__(self):
+        return f'{self.task_id} {self.kind} {self.due_date}'
+
+
+class ReminderWatermark(models.Model):
+    """Stav plánovača pripomienok – po ktoré termíny a od ktorej zmeny sa už spracovalo"""
+    name = models.CharField(max_length=32, unique=True)
+    last_run = models.DateTimeField(null=True, blank=True)
+    overdue_until = models.DateField(null=True, blank=True)
+    due_soon_until = models.DateField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.name}: {self.last_run}'
+
+
+class ImportCheckpoint(models.Model):
+    """Stav prerušiteľného importu (import_tasks --checkpoint)
+
+    Ukladá sa v tej istej transakcii ako dávka úloh – po páde sa pokračuje presne
+    za poslednou zapísanou dávkou, bez duplicít.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    line = models.PositiveIntegerField(default=0)
+    imported = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.name}: riadok {self.line}'
+
+
+class TaskEvent(models.Model):
+    """Záznam v histórii úlohy – len pridávaný, nikdy sa neupravuje
+
+    Bez cudzieho kľúča na úlohu: história prežije zmazanie aj archiváciu.
+    `changes` je {pole: [pôvodná, nová]}; SNAPSHOT nahrádza `folded` starších
+    záznamov jedným (príkaz compact_task_events).
+    """
+    CREATED = 'CREATED'
+    UPDATED = 'UPDATED'
+    DELETED = 'DELETED'
+    ARCHIVED = 'ARCHIVED'
+    SNAPSHOT = 'SNAPSHOT'
+    ACTION_CHOICES = [
+        (CREATED, 'Created'),
+        (UPDATED, 'Updated'),
+        (DELETED, 'Deleted'),
+        (ARCHIVED, 'Archived'),
+        (SNAPSHOT, 'Snapshot'),
+    ]
+
+    task_id = models.BigIntegerField()
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_events')
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changes = models.JSONField(default=dict, blank=True)
+    folded = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        # Časové osi úlohy a vlastníka – keyset podľa (created_at, id) ako zoznam úloh
+        indexes = [
+            models.Index(fields=['task_id', '-created_at', '-id'], name='task_event_task_idx'),
+            models.Index(fields=['owner', '-created_at', '-id'], name='task_event_owner_idx'),
+            models.Index(fields=['created_at'], name='task_event_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.task_id} {self.action} {self.created_at:%Y-%m-%d %H:%M}'
@@ -0,0 +1,275 @@
+# tasks/pagination.py
+
+import base64
+import binascii
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(ValueError):
+    """Neplatný alebo poškodený stránkovací token"""
+
+
+def encode_cursor(direction, created_at, pk):
+    """Zakóduje pozíciu (created_at, id) a smer do URL-bezpečného tokenu"""
+    raw = f"{direction}|{created_at.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Dekóduje token na trojicu (smer, created_at, id)"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        direction, created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError, binascii.Error) as exc:
+        raise InvalidCursor(token) from exc
+
+
+class KeysetPage:
+    """Jedna stránka úloh s tokenmi na susedné stránky"""
+
+    def __init__(self, object_list, has_next, has_previous, is_first=True):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.is_first = is_first
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous or self.stranded
+
+    @property
+    def stranded(self):
+        """Prázdna stránka za kurzorom (riadky okna medzitým zmizli)
+
+        Bez riadkov nie je z čoho odvodiť kurzory – ponúkne sa len prvá stránka.
+        """
+        return not self.is_first and not self
+
+    def chunks(self):
+        """Riadky stránky ako jeden blok (rovnaké rozhranie ako pri streame)"""
+        if self.object_list:
+            yield self.object_list
+
+    async def achunks(self):
+        if self.object_list:
+            yield self.object_list
+
+    @property
+    def next_cursor(self):
+        if not self.has_next or not self.object_list:
+            return None
+        last = self.object_list[-1]
+        return encode_cursor("next", last.created_at, last.pk)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous or not self.object_list:
+            return None
+        first = self.object_list[0]
+        return encode_cursor("prev", first.created_at, first.pk)
+
+
+class StreamedKeysetPage(KeysetPage):
+    """Stránka, ktorej riadky sa načítavajú postupne cez .iterator()
+
+    `has_next` a `next_cursor` sú známe až po prečítaní všetkých riadkov.
+    """
+
+    def __init__(self, queryset, per_page, has_previous, chunk_size):
+        super().__init__([], has_next=False, has_previous=has_previous, is_first=not has_previous)
+        self._queryset = queryset
+        self._per_page = per_page
+        self._chunk_size = chunk_size
+        self._first = None
+        self._last = None
+        self._seen = 0
+
+    def _rows(self):
+        return self._queryset[: self._per_page + 1]
+
+    def _accept(self, task):
+        """Započíta riadok; vráti False pre riadok navyše (existuje ďalšia stránka)"""
+        self._seen += 1
+        if self._seen > self._per_page:
+            self.has_next = True
+            return False
+        if self._first is None:
+            self._first = task
+        self._last = task
+        return True
+
+    def chunks(self):
+        """Generátor zoznamov riadkov po `chunk_size` kusoch"""
+        chunk = []
+        for task in self._rows().iterator(chunk_size=self._chunk_size):
+            if not self._accept(task):
+                break
+            chunk.append(task)
+            if len(chunk) >= self._chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    async def achunks(self):
+        """Asynchrónna verzia chunks() pre ASGI stream"""
+        chunk = []
+        async for task in self._rows().aiterator(chunk_size=self._chunk_size):
+            if not self._accept(task):
+                break
+            chunk.append(task)
+            if len(chunk) >= self._chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def __bool__(self):
+        return self._queryset.exists()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next or self._last is None:
+            return None
+        return encode_cursor("next", self._last.created_at, self._last.pk)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous or self._first is None:
+            return None
+        return encode_cursor("prev", self._first.created_at, self._first.pk)
+
+
+class KeysetPaginator:
+    """Stránkovanie podľa (created_at, id) zostupne
+
+    Na rozdiel od OFFSET stránkovania je pozícia viazaná na konkrétny riadok,
+    takže súbežne pridané úlohy neposúvajú ani neduplikujú riadky na ďalšej
+    stránke a cena dotazu nezávisí od čísla stránky.
+    """
+
+    ordering = ("-created_at", "-id")
+
+    def __init__(self, queryset, per_page=25):
+        self.queryset = queryset.order_by(*self.ordering)
+        self.per_page = per_page
+
+    def _parse(self, token):
+        if not token:
+            return None
+        try:
+            return decode_cursor(token)
+        except InvalidCursor:
+            # Poškodený token → prvá stránka namiesto chyby 500
+            return None
+
+    def _window(self, cursor):
+        if cursor is None:
+            return self.queryset
+        direction, created_at, pk = cursor
+        if direction == "next":
+            return self.queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+        return self.queryset.filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+        ).order_by("created_at", "id")
+
+    def page(self, token=None):
+        cursor = self._parse(token)
+        return self._make_page(list(self._window(cursor)[: self.per_page + 1]), cursor)
+
+    async def apage(self, token=None):
+        """Asynchrónna verzia page() cez async iteráciu querysetu"""
+        cursor = self._parse(token)
+        return self._make_page([row async for row in self._window(cursor)[: self.per_page + 1]], cursor)
+
+    def _make_page(self, rows, cursor):
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if cursor is not None and cursor[0] == "prev":
+            rows.reverse()
+            return KeysetPage(rows, has_next=True, has_previous=has_more, is_first=False)
+        return KeysetPage(rows, has_next=has_more, has_previous=cursor is not None, is_first=cursor is None)
+
+    def stream(self, token=None, chunk_size=100):
+        """Vráti stránku na postupné vykreslenie
+
+        Spätný smer vyžaduje otočenie poradia, preto sa materializuje celý.
+        """
+        cursor = self._parse(token)
+        if cursor is not None and cursor[0] == "prev":
+            return self.page(token)
+        return self._streamed(cursor, chunk_size)
+
+    async def astream(self, token=None, chunk_size=100):
+        """Asynchrónna verzia stream() – spätný smer sa načíta cez apage()"""
+        cursor = self._parse(token)
+        if cursor is not None and cursor[0] == "prev":
+            return await self.apage(token)
+        return self._streamed(cursor, chunk_size)
+
+    def _streamed(self, cursor, chunk_size):
+        return StreamedKeysetPage(
+            self._window(cursor), self.per_page,
+            has_previous=cursor is not None, chunk_size=chunk_size,
+        )
+
+
+def estimated_count(model):
+    """Odhad počtu riadkov zo štatistík databázy (PostgreSQL reltuples, MySQL table_rows)
+
+    Bez štatistík (SQLite, tabuľka ešte neanalyzovaná) vracia None.
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s", [table],
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    # reltuples je -1 (PostgreSQL 14+) alebo 0, kým tabuľku nespracuje ANALYZE
+    return row[0] if row and row[0] and row[0] > 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Stránkovanie bez COUNT(*) nad celou tabuľkou (zoznamy v admine)
+
+    Nefiltrovaný zoznam použije odhad z estimate(), filtrovaný počíta len
+    po TASK_ADMIN_COUNT_LIMIT riadkov – ďalšie stránky sú potom „aspoň“.
+    """
+
+    def estimate(self):
+        return estimated_count(self.object_list.model)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = self.estimate()
+            if estimate is not None:
+                return estimate
+        return queryset.order_by()[: settings.TASK_ADMIN_COUNT_LIMIT].count()
@@ -0,0 +1,51 @@
+# tasks/queries.py
+
+from django.db.models import BooleanField, ExpressionWrapper, Q
+
+from .models import ArchivedTask, Task
+from .roles import resolve_roles
+
+TASK_FILTERS = ('all', 'completed', 'pending', 'overdue')
+
+# Stĺpce, ktoré šablóna zoznamu naozaj používa (created_at kvôli stránkovaniu)
+TASK_LIST_FIELDS = ('id', 'title', 'description', 'due_date', 'completed', 'created_at', 'user_id')
+
+
+def visible_tasks(user, archived=False):
+    """Úlohy, ktoré používateľ smie vidieť, a príznak či vidí všetky
+
+    S `archived` z archívu (ArchivedTask) – rovnaké stĺpce, len na čítanie.
+    """
+    model = ArchivedTask if archived else Task
+    if resolve_roles(user).can_see_all:
+        return model.objects.all(), True
+    return model.objects.filter(user=user), False
+
+
+def filter_tasks(queryset, filter_by, today):
+    """Filter zo zoznamu úloh (?filter=...)"""
+    if filter_by == 'completed':
+        return queryset.filter(completed=True)
+    if filter_by == 'pending':
+        return queryset.filter(completed=False)
+    if filter_by == 'overdue':
+        return queryset.filter(completed=False, due_date__lt=today)
+    return queryset
+
+
+def task_matches_filter(task, filter_by, today):
+    """To isté ako filter_tasks, ale pre jednu načítanú úlohu (bez dotazu)"""
+    if filter_by == 'completed':
+        return task.completed
+    if filter_by in ('pending', 'overdue') and task.completed:
+        return False
+    if filter_by == 'overdue':
+        return task.due_date is not None and task.due_date < today
+    return True
+
+
+def list_columns(queryset, user):
+    """Len potrebné stĺpce a vlastníctvo vyhodnotené v SQL (bez task.user po riadkoch)"""
+    return queryset.only(*TASK_LIST_FIELDS).annotate(
+        is_owner=ExpressionWrapper(Q(user_id=user.pk), output_field=BooleanField())
+    )
@@ -0,0 +1,162 @@
+# tasks/reminders.py
+"""Pripomienky termínov – úlohy, ktoré sa blížia k termínu alebo sú po ňom
+
+Každý beh spracuje len nové okno termínov od posledného behu (vodoznak
+v ReminderWatermark) a úlohy zmenené od posledného behu. Tabuľka úloh sa
+nikdy neprechádza celá, všetky dotazy sú rozsahy nad čiastočnými indexmi
+nedokončených úloh. Odoslané pripomienky sa zapisujú do TaskReminder, takže
+opakovaný beh (aj po chybe pri odosielaní) nič nepošle dvakrát.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import ReminderWatermark, Task, TaskReminder
+
+WATERMARK_NAME = 'reminders'
+DUE_SOON = 'DUE_SOON'
+OVERDUE = 'OVERDUE'
+
+# Úloha uložená počas predchádzajúceho behu mohla mať updated_at tesne pred jeho
+# vodoznakom – malý presah ju zachytí, duplicity vylúči TaskReminder
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+TASK_FIELDS = ('id', 'title', 'due_date', 'user_id', 'user__username', 'user__email')
+
+
+def reminder_kind(due_date, today):
+    return OVERDUE if due_date < today else DUE_SOON
+
+
+def _windows(watermark, today, horizon, lookback):
+    """Rozsahy termínov, ktoré predchádzajúci beh ešte nespracoval"""
+    oldest = today - timedelta(days=lookback)
+    overdue_from = max(watermark.overdue_until or oldest, oldest)
+    # Nový „blíži sa“ úsek začína za posledným horizontom, najskôr dnes
+    due_soon_from = max(watermark.due_soon_until + timedelta(days=1), today) \
+        if watermark.due_soon_until else today
+    windows = []
+    if overdue_from < today:
+        windows.append((overdue_from, today - timedelta(days=1)))
+    if due_soon_from <= horizon:
+        windows.append((due_soon_from, horizon))
+    return windows
+
+
+def find_due_tasks(watermark, today, days, lookback):
+    """Kandidáti na pripomienku – nové okná termínov a úlohy zmenené od posledného behu
+
+    Každý zdroj je samostatný rozsahový dotaz (task_open_due_date_idx,
+    task_open_updated_idx); OR v jednom dotaze by index nevyužil.
+    """
+    horizon = today + timedelta(days=days)
+    open_tasks = Task.objects.filter(completed=False).values(*TASK_FIELDS).order_by()
+    candidates = {}
+    for start, end in _windows(watermark, today, horizon, lookback):
+        for row in open_tasks.filter(due_date__range=(start, end)).iterator():
+            candidates[row['id']] = row
+    if watermark.last_run is not None:
+        changed = open_tasks.filter(
+            updated_at__gt=watermark.last_run - WATERMARK_OVERLAP,
+            due_date__range=(today - timedelta(days=lookback), horizon),
+        )
+        for row in changed.iterator():
+            candidates[row['id']] = row
+    return candidates
+
+
+def _already_sent(candidates, today, batch_size):
+    sent = set()
+    keys = {(pk, reminder_kind(row['due_date'], today), row['due_date']) for pk, row in candidates.items()}
+    pks = iter(candidates)
+    while chunk := list(islice(pks, batch_size)):
+        sent.update(
+            key for key in TaskReminder.objects.filter(task_id__in=chunk).values_list('task_id', 'kind', 'due_date')
+            if key in keys
+        )
+    return sent
+
+
+def build_message(user, rows, today):
+    """Jeden email na používateľa so všetkými jeho pripomienkami"""
+    context = {
+        'username': user['username'],
+        'overdue': [row for row in rows if row['kind'] == OVERDUE],
+        'due_soon': [row for row in rows if row['kind'] == DUE_SOON],
+        'today': today,
+        'task_list_url': settings.TASK_REMINDER_BASE_URL.rstrip('/') + reverse('task_list'),
+    }
+    subject = render_to_string('tasks/email/reminder_subject.txt', context).strip()
+    body = render_to_string('tasks/email/reminder_body.txt', context)
+    return EmailMessage(subject, body, to=[user['email']])
+
+
+def send_reminders(days=None, lookback=None, batch_size=None, dry_run=False, now=None):
+    """Jeden beh plánovača; vracia počty (tasks, users, messages, skipped)
+
+    Všetky správy idú cez jedno spojenie email backendu po dávkach
+    `batch_size` správ. Vodoznak sa posunie až po odoslaní všetkých dávok.
+    """
+    days = settings.TASK_REMINDER_DAYS if days is None else days
+    lookback = settings.TASK_REMINDER_LOOKBACK_DAYS if lookback is None else lookback
+    batch_size = batch_size or settings.TASK_REMINDER_BATCH_SIZE
+    # Čas behu sa zachytí pred dotazmi – zmeny počas behu spracuje ďalší beh
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+
+    watermark, _ = ReminderWatermark.objects.get_or_create(name=WATERMARK_NAME)
+    candidates = find_due_tasks(watermark, today, days, lookback)
+    sent = _already_sent(candidates, today, batch_size)
+
+    by_user = defaultdict(list)
+    users = {}
+    skipped = 0
+    for pk, row in candidates.items():
+        kind = reminder_kind(row['due_date'], today)
+        if (pk, kind, row['due_date']) in sent:
+            continue
+        if not row['user__email']:
+            skipped += 1
+            continue
+        by_user[row['user_id']].append({**row, 'kind': kind})
+        users[row['user_id']] = {'username': row['user__username'], 'email': row['user__email']}
+
+    result = {'tasks': sum(map(len, by_user.values())), 'users': len(by_user), 'messages': 0, 'skipped': skipped}
+    if dry_run:
+        return result
+
+    pending = iter(sorted(by_user.items()))
+    connection = get_connection()
+    connection.open()
+    try:
+        while batch := list(islice(pending, batch_size)):
+            messages = [
+                build_message(users[user_id], sorted(rows, key=lambda row: (row['due_date'], row['id'])), today)
+                for user_id, rows in batch
+            ]
+            result['messages'] += connection.send_messages(messages) or 0
+            # Zápis po každej dávke – pri chybe v ďalšej sa odoslané neopakujú
+            TaskReminder.objects.bulk_create([
+                TaskReminder(task_id=row['id'], kind=row['kind'], due_date=row['due_date'])
+                for _, rows in batch for row in rows
+            ], ignore_conflicts=True)
+    finally:
+        connection.close()
+
+    watermark.last_run = now
+    watermark.overdue_until = today
+    watermark.due_soon_until = today + timedelta(days=days)
+    watermark.save()
+    return result
+
+
+def purge_reminders(before):
+    """Zmaže záznamy pripomienok s termínom pred `before` (už mimo všetkých okien)"""
+    return TaskReminder.objects.filter(due_date__lt=before).delete()[0]
@@ -0,0 +1,115 @@
+# tasks/roles.py
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Skupiny a ich oprávnenia na Task (používa aj príkaz create_groups)
+GROUP_PERMISSIONS = {
+    "Reader": ["view_task", "add_task"],  # Čítať + vytvárať tasky
+    "Editor": ["view_task", "add_task", "change_task"],  # Reader + upravovať
+    "Manager": ["view_task", "add_task", "change_task", "delete_task"],  # Editor + mazať
+    "Admin": ["view_task", "add_task", "change_task", "delete_task"],  # Všetko pre tasky
+}
+
+SEE_ALL_GROUPS = frozenset(['Admin', 'Manager', 'Editor', 'Reader'])
+EDIT_GROUPS = frozenset(['Admin', 'Manager', 'Editor'])
+DELETE_GROUPS = frozenset(['Admin', 'Manager'])
+
+_VERSION_KEY = 'tasks:roles:version'
+
+
+class TaskRoles:
+    """Vyhodnotené roly používateľa – jeden dotaz na skupiny namiesto troch"""
+
+    def __init__(self, is_superuser, groups):
+        self.is_superuser = is_superuser
+        self.groups = frozenset(groups)
+
+    @property
+    def can_see_all(self):
+        return self.is_superuser or bool(self.groups & SEE_ALL_GROUPS)
+
+    @property
+    def can_edit(self):
+        return self.is_superuser or bool(self.groups & EDIT_GROUPS)
+
+    @property
+    def can_delete(self):
+        return self.is_superuser or bool(self.groups & DELETE_GROUPS)
+
+    @property
+    def group_names(self):
+        return sorted(self.groups)
+
+
+def _cache_key(user_pk):
+    # Pri chýbajúcej verzii začne nová (časová), aby staré záznamy neožili
+    version = cache.get_or_set(_VERSION_KEY, lambda: int(time.time()), timeout=None)
+    return f'tasks:roles:{version}:{user_pk}'
+
+
+async def _acache_key(user_pk):
+    version = await cache.aget_or_set(_VERSION_KEY, lambda: int(time.time()), timeout=None)
+    return f'tasks:roles:{version}:{user_pk}'
+
+
+def _load_groups(user):
+    if not settings.TASK_ROLES_CACHE:
+        return list(user.groups.values_list('name', flat=True))
+    key = _cache_key(user.pk)
+    groups = cache.get(key)
+    if groups is None:
+        groups = list(user.groups.values_list('name', flat=True))
+        cache.set(key, groups, timeout=settings.TASK_ROLES_CACHE_TIMEOUT)
+    return groups
+
+
+async def _aload_groups(user):
+    names = user.groups.values_list('name', flat=True)
+    if not settings.TASK_ROLES_CACHE:
+        return [name async for name in names]
+    key = await _acache_key(user.pk)
+    groups = await cache.aget(key)
+    if groups is None:
+        groups = [name async for name in names]
+        await cache.aset(key, groups, timeout=settings.TASK_ROLES_CACHE_TIMEOUT)
+    return groups
+
+
+def resolve_roles(user):
+    """Roly používateľa, zapamätané na objekte user (teda na jednu požiadavku)"""
+    roles = getattr(user, '_task_roles', None)
+    if roles is None:
+        if not user.is_authenticated:
+            roles = TaskRoles(False, ())
+        else:
+            roles = TaskRoles(user.is_superuser, _load_groups(user))
+        user._task_roles = roles
+    return roles
+
+
+async def aresolve_roles(user):
+    """Asynchrónna verzia resolve_roles – zdieľa to isté zapamätanie na user"""
+    roles = getattr(user, '_task_roles', None)
+    if roles is None:
+        if not user.is_authenticated:
+            roles = TaskRoles(False, ())
+        else:
+            roles = TaskRoles(user.is_superuser, await _aload_groups(user))
+        user._task_roles = roles
+    return roles
+
+
+def invalidate_roles(user_pks=None):
+    """Zneplatní roly v cache – pre konkrétnych používateľov alebo pre všetkých"""
+    if not settings.TASK_ROLES_CACHE:
+        return
+    if user_pks is None:
+        try:
+            cache.incr(_VERSION_KEY)
+        except ValueError:
+            cache.set(_VERSION_KEY, int(time.time()), timeout=None)
+        return
+    cache.delete_many([_cache_key(pk) for pk in user_pks])
@@ -0,0 +1,193 @@
+# tasks/search.py
+
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, F, FloatField, Func, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Task, TaskSearchIndex
+from .pagination import KeysetPage
+
+FTS_TABLE = TaskSearchIndex._meta.db_table
+
+# Rovnaký výraz ako v indexe z migrácie 0005 – inak ho PostgreSQL nepoužije
+PG_VECTOR_SQL = (
+    "to_tsvector('simple', coalesce(\"tasks_task\".\"title\", '') || ' ' || "
+    "coalesce(\"tasks_task\".\"description\", ''))"
+)
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _no_results(queryset):
+    # Prázdny výsledok s rovnakými stĺpcami – search_tasks podľa search_rank triedi
+    return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class BasicSearchBackend:
+    """Záložné vyhľadávanie cez icontains – bez indexu a bez poradia"""
+
+    def index_task(self, task):
+        pass
+
+    def index_tasks(self, tasks):
+        pass
+
+    def remove_task(self, pk):
+        pass
+
+    def remove_tasks(self, pks):
+        pass
+
+    def rebuild(self):
+        return 0
+
+    def search(self, queryset, query):
+        for word in _WORD_RE.findall(query):
+            queryset = queryset.filter(Q(title__icontains=word) | Q(description__icontains=word))
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTS5Backend(BasicSearchBackend):
+    """SQLite FTS5 tabuľka (rowid = id úlohy), udržiavaná signálmi na Task"""
+
+    def index_task(self, task):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [task.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)",
+                [task.pk, task.title, task.description],
+            )
+
+    def index_tasks(self, tasks):
+        """Hromadné zaindexovanie (napr. po bulk_create, ktorý neposiela signály)"""
+        rows = [(task.pk, task.title, task.description) for task in tasks]
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(f"INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)", rows)
+
+    def remove_task(self, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+    def remove_tasks(self, pks):
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk in pks])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description) "
+                f"SELECT id, title, description FROM {Task._meta.db_table}"
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def match_expression(query):
+        # Každé slovo ako predpona v úvodzovkách – užívateľský vstup nemôže rozbiť syntax FTS5
+        words = _WORD_RE.findall(query)
+        return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return _no_results(queryset)
+        # Spojenie s FTS tabuľkou (TaskSearchIndex) – bm25() musí byť v tom istom dotaze
+        # ako MATCH. Korelovaný poddotaz pre každý riadok by MATCH vyhodnocoval znova (kvadraticky).
+        # bm25 je záporné – menšie číslo znamená lepšiu zhodu, preto zmena znamienka
+        return queryset.filter(search_index__fts__match=match).annotate(
+            search_rank=-Func(F('search_index__fts'), function='bm25', output_field=FloatField()),
+        )
+
+
+class PostgresSearchBackend(BasicSearchBackend):
+    """tsvector s GIN indexom nad výrazom – databáza ho udržiava sama"""
+
+    def search(self, queryset, query):
+        if not _WORD_RE.search(query):
+            return _no_results(queryset)
+        return queryset.filter(
+            RawSQL(f"{PG_VECTOR_SQL} @@ plainto_tsquery('simple', %s)", [query], output_field=BooleanField())
+        ).annotate(search_rank=RawSQL(
+            f"ts_rank({PG_VECTOR_SQL}, plainto_tsquery('simple', %s))", [query], output_field=FloatField(),
+        ))
+
+
+def _fts5_table_exists():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def _backend_for(path, vendor):
+    if path:
+        return import_string(path)()
+    if vendor == 'postgresql':
+        return PostgresSearchBackend()
+    if vendor == 'sqlite' and _fts5_table_exists():
+        return SQLiteFTS5Backend()
+    return BasicSearchBackend()
+
+
+# Vybraný backend pre alias spojenia – výber na SQLite číta schému (sqlite_master)
+_backends = {}
+
+
+def get_search_backend():
+    """Backend podľa TASK_SEARCH_BACKEND (bodkovaná cesta) alebo podľa databázy
+
+    Výber sa pamätá pre alias spojenia; po migrácii (post_migrate) a pred
+    prestavaním indexu sa zabudne. Migráciu spustenú v inom procese zachytí
+    až reštart workerov.
+    """
+    backend = _backends.get(connection.alias)
+    if backend is None:
+        backend = _backends[connection.alias] = _backend_for(settings.TASK_SEARCH_BACKEND, connection.vendor)
+    return backend
+
+
+def clear_search_backend_cache(**kwargs):
+    """Zabudne vybrané backendy (receiver post_migrate, rebuild_search_index)"""
+    _backends.clear()
+
+
+def search_tasks(queryset, query, backend=None):
+    """Úlohy zodpovedajúce dotazu, zoradené podľa relevancie
+
+    Index pokrýva len tabuľku Task – archív (ArchivedTask) sa prehľadáva cez icontains.
+    Async views posielajú `backend` vybraný cez sync_to_async (výber môže čítať
+    schému databázy).
+    """
+    if queryset.model is not Task:
+        backend = BasicSearchBackend()
+    elif backend is None:
+        backend = get_search_backend()
+    return backend.search(queryset, query).order_by('-search_rank', '-created_at', '-id')
+
+
+class RankedPaginator:
+    """Výsledky vyhľadávania – jedna stránka najrelevantnejších úloh
+
+    Rozhranie je rovnaké ako pri KeysetPaginator, poradie podľa relevancie
+    však nie je stabilné pre kurzor, preto sa ďalšie stránky neponúkajú.
+    """
+
+    def __init__(self, queryset, limit):
+        self.queryset = queryset
+        self.limit = limit
+
+    def page(self, token=None):
+        return KeysetPage(list(self.queryset[: self.limit]), has_next=False, has_previous=False)
+
+    async def apage(self, token=None):
+        return KeysetPage([row async for row in self.queryset[: self.limit]], has_next=False, has_previous=False)
+
+    def stream(self, token=None, chunk_size=100):
+        return self.page(token)
+
+    async def astream(self, token=None, chunk_size=100):
+        return await self.apage(token)
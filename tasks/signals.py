@@ -0,0 +1,165 @@
+# tasks/signals.py
+
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .audit import AUDIT_FIELDS, audit_values, delete_action, diff, record
+from .counters import apply_counter_changes
+from .fragments import bump_fragments
+from .models import Task, TaskEvent
+from .roles import invalidate_roles
+from .search import get_search_backend
+from .stats import apply_task_change, invalidate_stats
+
+
+COUNTED_FIELDS = {'user', 'user_id', 'completed', 'due_date'}
+AUDITED_FIELDS = {'user', *AUDIT_FIELDS}
+
+
+@receiver(pre_save, sender=Task)
+def task_counters_before(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Pôvodný stav pre TaskCounters a históriu – zo zamknutého riadku, nie z načítanej inštancie
+
+    Načítané hodnoty môžu byť zastarané (úlohu medzitým zmenila iná požiadavka),
+    rozdiel počtov by potom bol nesprávny natrvalo.
+    """
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not AUDITED_FIELDS & set(update_fields):
+        return
+    old = Task.objects.select_for_update().filter(pk=instance.pk).values(*AUDIT_FIELDS).first()
+    instance._audit_old = old
+    if update_fields is None or COUNTED_FIELDS & set(update_fields):
+        instance._counters_old = old and (old['user_id'], old['completed'], old['due_date'])
+
+
+@receiver(post_save, sender=Task)
+def task_counters_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Počty v TaskCounters – v transakcii zápisu (Task.save beží v atomic)"""
+    if raw:
+        return
+    if update_fields is not None and not COUNTED_FIELDS & set(update_fields):
+        return
+    old = None if created else instance.__dict__.pop('_counters_old', None)
+    apply_counter_changes([(old, instance.stats_state())])
+
+
+@receiver(post_delete, sender=Task)
+def task_counters_deleted(sender, instance, **kwargs):
+    # Collector maže v transakcii, signál beží pred jej potvrdením; stav je čerstvý
+    # z dotazu collectora alebo z Task.delete()
+    apply_counter_changes([(instance.stats_state(loaded=True) or instance.stats_state(), None)])
+
+
+@receiver(post_save, sender=Task)
+def task_audit_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Záznam do histórie – v tej istej transakcii ako zápis úlohy"""
+    if raw:
+        return
+    if created:
+        record(instance.pk, instance.user_id, TaskEvent.CREATED, diff(None, audit_values(instance)))
+        return
+    old = instance.__dict__.pop('_audit_old', None)
+    if old is None:
+        return
+    changes = diff(old, audit_values(instance))
+    if update_fields is not None:
+        saved = {'user_id' if field == 'user' else field for field in update_fields}
+        changes = {field: values for field, values in changes.items() if field in saved}
+    if changes:
+        record(instance.pk, instance.user_id, TaskEvent.UPDATED, changes)
+
+
+@receiver(post_delete, sender=Task)
+def task_audit_deleted(sender, instance, origin=None, **kwargs):
+    # Pri zmazaní používateľa zmizne aj jeho história (CASCADE), záznam by nemal vlastníka
+    if isinstance(origin, User) or (isinstance(origin, QuerySet) and origin.model is User):
+        return
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    values = {**audit_values(instance), **{k: v for k, v in loaded.items() if k in AUDIT_FIELDS}}
+    action = delete_action()
+    if action == TaskEvent.DELETED:
+        changes = {field: [value, None] for field, (_, value) in diff(None, values).items()}
+    else:
+        # Archivovaná úloha žije ďalej v ArchivedTask – hodnoty sa nemenia
+        changes = {}
+    record(instance.pk, values['user_id'], action, changes)
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, raw=False, **kwargs):
+    """Po uložení úlohy posunie počty v cache o rozdiel starého a nového stavu"""
+    if raw:
+        return
+    new = instance.stats_state()
+    if created:
+        old = None
+    else:
+        old = instance.stats_state(loaded=True)
+        if old is None:
+            # Pôvodný stav nepoznáme (inštancia nebola načítaná z DB)
+            transaction.on_commit(lambda: invalidate_stats([instance.user_id]))
+            return
+    transaction.on_commit(lambda: apply_task_change(old, new))
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    old = instance.stats_state(loaded=True) or instance.stats_state()
+    transaction.on_commit(lambda: apply_task_change(old, None))
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_fragments_changed(sender, instance, raw=False, **kwargs):
+    """Posunie verziu fragmentov rozsahu vlastníka (aj pôvodného pri zmene vlastníka)"""
+    if raw:
+        return
+    old = instance.stats_state(loaded=True)
+    user_ids = {instance.user_id, old[0] if old else None}
+    transaction.on_commit(lambda: bump_fragments(user_ids))
+
+
+@receiver(post_save, sender=Task)
+def task_search_index(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Aktualizuje fulltextový index, ak sa zmenil názov alebo popis"""
+    if raw:
+        return
+    if update_fields is not None and not {'title', 'description'} & set(update_fields):
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+    if (not created and loaded is not None
+            and loaded.get('title') == instance.title
+            and loaded.get('description') == instance.description):
+        return
+    get_search_backend().index_task(instance)
+
+
+@receiver(post_delete, sender=Task)
+def task_search_remove(sender, instance, **kwargs):
+    get_search_backend().remove_task(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Zmena členstva v skupinách zneplatní roly dotknutých používateľov"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        instance.__dict__.pop('_task_roles', None)
+        user_pks = [instance.pk]
+    elif pk_set:
+        user_pks = list(pk_set)
+    else:
+        # group.user_set.clear() – zoznam používateľov už nepoznáme
+        user_pks = None
+    transaction.on_commit(lambda: invalidate_roles(user_pks))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, **kwargs):
+    transaction.on_commit(lambda: invalidate_roles())
@@ -0,0 +1,173 @@
+# tasks/stats.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+STAT_FIELDS = ('total', 'completed', 'pending', 'overdue')
+ALL_SCOPE = 'all'
+
+
+def stats_scope(user_id=None):
+    """Kľúč rozsahu štatistík – všetky úlohy alebo úlohy jedného používateľa"""
+    return ALL_SCOPE if user_id is None else f'user:{user_id}'
+
+
+def _keys(scope, today):
+    # overdue závisí od dátumu, preto má kľúč s dňom – o polnoci sa sám zneplatní
+    return {
+        'total': f'tasks:stats:{scope}:total',
+        'completed': f'tasks:stats:{scope}:completed',
+        'pending': f'tasks:stats:{scope}:pending',
+        'overdue': f'tasks:stats:{scope}:overdue:{today.isoformat()}',
+    }
+
+
+def _aggregates(today):
+    # Aliasy sa nesmú volať rovnako ako pole `completed`, inak ho Q zatieni
+    return {
+        'stat_total': Count('id'),
+        'stat_completed': Count('id', filter=Q(completed=True)),
+        'stat_pending': Count('id', filter=Q(completed=False)),
+        'stat_overdue': Count('id', filter=Q(completed=False, due_date__lt=today)),
+    }
+
+
+def compute_stats(queryset, today):
+    """Všetky štyri počty jedným dotazom s podmienenou agregáciou"""
+    counts = queryset.aggregate(**_aggregates(today))
+    return {field: counts[f'stat_{field}'] for field in STAT_FIELDS}
+
+
+async def acompute_stats(queryset, today):
+    counts = await queryset.aaggregate(**_aggregates(today))
+    return {field: counts[f'stat_{field}'] for field in STAT_FIELDS}
+
+
+def load_stats(queryset, scope, today):
+    """Počty z TaskCounters (TASK_STATS_SOURCE='counters') alebo agregáciou nad úlohami"""
+    if settings.TASK_STATS_SOURCE == 'counters':
+        # tasks.counters importuje tento modul (rozsahy), preto až tu
+        from .counters import read_counters
+        return read_counters(scope, today)
+    return compute_stats(queryset, today)
+
+
+async def aload_stats(queryset, scope, today):
+    if settings.TASK_STATS_SOURCE == 'counters':
+        from .counters import aread_counters
+        return await aread_counters(scope, today)
+    return await acompute_stats(queryset, today)
+
+
+def get_stats(queryset, scope, today=None):
+    """Štatistiky pre zoznam úloh, voliteľne z cache (TASK_STATS_CACHE)
+
+    Rozsah None (archív) sa počíta vždy agregáciou – cache ani počítadlá ho nesledujú.
+    """
+    today = today or timezone.now().date()
+    if scope is None:
+        return compute_stats(queryset, today)
+    if not settings.TASK_STATS_CACHE:
+        return load_stats(queryset, scope, today)
+
+    keys = _keys(scope, today)
+    cached = cache.get_many(keys.values())
+    if len(cached) == len(keys):
+        return {field: cached[key] for field, key in keys.items()}
+
+    stats = load_stats(queryset, scope, today)
+    cache.set_many(
+        {keys[field]: stats[field] for field in STAT_FIELDS},
+        timeout=settings.TASK_STATS_CACHE_TIMEOUT,
+    )
+    return stats
+
+
+async def aget_stats(queryset, scope, today=None):
+    """Asynchrónna verzia get_stats pre ASGI views"""
+    today = today or timezone.now().date()
+    if scope is None:
+        return await acompute_stats(queryset, today)
+    if not settings.TASK_STATS_CACHE:
+        return await aload_stats(queryset, scope, today)
+
+    keys = _keys(scope, today)
+    cached = await cache.aget_many(keys.values())
+    if len(cached) == len(keys):
+        return {field: cached[key] for field, key in keys.items()}
+
+    stats = await aload_stats(queryset, scope, today)
+    await cache.aset_many(
+        {keys[field]: stats[field] for field in STAT_FIELDS},
+        timeout=settings.TASK_STATS_CACHE_TIMEOUT,
+    )
+    return stats
+
+
+def _contribution(completed, due_date, today):
+    """Príspevok jednej úlohy k jednotlivým počtom"""
+    return {
+        'total': 1,
+        'completed': int(completed),
+        'pending': int(not completed),
+        'overdue': int(bool(due_date and not completed and due_date < today)),
+    }
+
+
+def stats_delta(old, new, today=None):
+    """Zmena štyroch počtov po zmene jednej úlohy (old/new ako v apply_task_change)"""
+    today = today or timezone.now().date()
+    delta = dict.fromkeys(STAT_FIELDS, 0)
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None:
+            continue
+        _, completed, due_date = state
+        for field, value in _contribution(completed, due_date, today).items():
+            delta[field] += sign * value
+    return delta
+
+
+def _apply(scope, delta, today):
+    keys = _keys(scope, today)
+    for field, value in delta.items():
+        if not value:
+            continue
+        try:
+            cache.incr(keys[field], value)
+        except ValueError:
+            # Kľúč v cache nie je – dopočíta sa pri ďalšom čítaní
+            pass
+
+
+def apply_task_change(old, new, today=None):
+    """Inkrementálne upraví počty po zmene úlohy
+
+    `old` a `new` sú dvojice (user_id, completed, due_date), pri vytvorení
+    je `old` None, pri zmazaní je `new` None.
+    """
+    if not settings.TASK_STATS_CACHE:
+        return
+    today = today or timezone.now().date()
+    deltas = {}
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None:
+            continue
+        user_id, completed, due_date = state
+        contribution = _contribution(completed, due_date, today)
+        for scope in (ALL_SCOPE, stats_scope(user_id)):
+            scope_delta = deltas.setdefault(scope, dict.fromkeys(STAT_FIELDS, 0))
+            for field, value in contribution.items():
+                scope_delta[field] += sign * value
+    for scope, delta in deltas.items():
+        _apply(scope, delta, today)
+
+
+def invalidate_stats(user_ids=(), today=None):
+    """Zahodí počty v cache – pre hromadné zmeny, ktoré obchádzajú signály"""
+    if not settings.TASK_STATS_CACHE:
+        return
+    today = today or timezone.now().date()
+    scopes = [ALL_SCOPE] + [stats_scope(user_id) for user_id in set(user_ids)]
+    cache.delete_many([key for scope in scopes for key in _keys(scope, today).values()])
@@ -0,0 +1,734 @@
+import logging
+import os
+import tempfile
+import threading
+from collections import Counter
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth.models import Group, User
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.models.signals import post_migrate
+from django.test import AsyncRequestFactory, Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import async_views
+from tasks.archive import archive_completed
+from tasks.audit import batched_events
+from tasks.bench import summarize
+from tasks.bulk import FORBIDDEN, NOT_FOUND, OK, apply_bulk_action, toggle_completed
+from tasks.counters import actual_counters, reconcile_counters
+from tasks.forms import BulkTaskForm, TaskForm
+from tasks.models import (
+    ArchivedTask, ImportCheckpoint, ReminderWatermark, Task, TaskConflict, TaskCounters, TaskEvent, TaskReminder,
+)
+from tasks.pagination import KeysetPaginator
+from tasks.reminders import DUE_SOON, OVERDUE, send_reminders
+from tasks.roles import resolve_roles
+from tasks.search import FTS_TABLE, SQLiteFTS5Backend, clear_search_backend_cache, get_search_backend, search_tasks
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, TASK_LIST_PAGE_SIZE=2, TASK_LIST_STREAMING=False)
+class TaskListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+        cls.tasks = [Task.objects.create(title=f"Úloha {index}", user=cls.user) for index in range(5)]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_links_keep_list_parameters(self):
+        response = self.client.get(reverse("task_list"), {"filter": "pending", "stream": "0"})
+        page = response.context["tasks"]
+        self.assertContains(response, f"?filter=pending&amp;stream=0&amp;cursor={page.next_cursor}")
+
+    def test_empty_previous_window_links_first_page(self):
+        first = KeysetPaginator(Task.objects.all(), per_page=2).page()
+        second = KeysetPaginator(Task.objects.all(), per_page=2).page(first.next_cursor)
+        # Novšie úlohy zo spätného okna zmizli – stránka nemá z čoho odvodiť kurzory
+        Task.objects.filter(pk__in=[task.pk for task in first]).delete()
+
+        response = self.client.get(reverse("task_list"), {"filter": "all", "cursor": second.previous_cursor})
+        self.assertTrue(response.context["tasks"].stranded)
+        self.assertContains(response, 'href="?filter=all"')
+
+    def test_first_page_is_not_stranded(self):
+        Task.objects.all().delete()
+        self.assertFalse(KeysetPaginator(Task.objects.all()).page().stranded)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, TASK_LIST_STREAMING=False, TASK_LIST_PAGE_SIZE=100)
+class TaskListQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("owner")
+        cls.reader = User.objects.create_user("reader")
+        cls.reader.groups.add(Group.objects.create(name="Reader"))
+        cls.superuser = User.objects.create_superuser("admin", "admin@localhost", None)
+
+    def _create(self, size):
+        # Polovica úloh patrí divákovi – tlačidlá v riadku závisia od vlastníctva
+        existing = Task.objects.count()
+        Task.objects.bulk_create(
+            Task(title=f"Úloha {index}", user=self.owner if index % 2 else self.reader)
+            for index in range(existing, size)
+        )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # session, používateľ, skupiny, stránka úloh, štatistiky;
+        # bez superusera ešte dva dotazy na oprávnenia pre perms v šablóne
+        expected = {self.superuser: 5, self.owner: 7, self.reader: 7}
+        for size in (1, 10, 50):
+            self._create(size)
+            for viewer, queries in expected.items():
+                with self.subTest(size=size, viewer=viewer.username):
+                    self.client.force_login(viewer)
+                    with self.assertNumQueries(queries):
+                        response = self.client.get(reverse("task_list"))
+                    self.assertEqual(response.status_code, 200)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class TaskApiListValidatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+        cls.tasks = [Task.objects.create(title=f"Úloha {index}", user=cls.user) for index in range(3)]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_collection_has_etag_but_no_last_modified(self):
+        response = self.client.get(reverse("api_task_list"))
+        self.assertIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+
+    def test_deleting_a_task_changes_the_etag(self):
+        url = reverse("api_task_list")
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Zmazanie nezvýši max(updated_at) – zmenu musí zachytiť počet v ETagu
+        self.tasks[0].delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 2)
+
+    def test_if_modified_since_alone_does_not_return_stale_304(self):
+        url = reverse("api_task_list")
+        self.tasks[0].delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class TaskApiPatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_patch_completes_overdue_task(self):
+        overdue = Task.objects.create(title="Po termíne", user=self.user, due_date=date(2020, 1, 1))
+        url = reverse("api_task_detail", args=[overdue.pk])
+
+        response = self.client.patch(url, {"completed": True}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Task.objects.get(pk=overdue.pk).completed)
+
+        # Nový termín v minulosti je stále chyba
+        response = self.client.patch(url, {"due_date": "2020-01-02"}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("due_date", response.json()["errors"])
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, TASK_LIST_PAGE_SIZE=2, TASK_FRAGMENT_CACHE=False)
+class AsyncTaskListStreamTests(TestCase):
+    """Streamovaný zoznam v tasks.async_views – nič nesmie volať sync ORM v event loope"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+        cls.tasks = [
+            Task.objects.create(title=f"Nákup {index}", description="mlieko", user=cls.user) for index in range(5)
+        ]
+
+    async def _get(self, params):
+        request = AsyncRequestFactory().get(reverse("task_list"), params)
+        request.user = self.user
+
+        async def auser():
+            return self.user
+
+        request.auser = auser
+        response = await async_views.task_list(request)
+        self.assertEqual(response.status_code, 200)
+        chunks = [chunk async for chunk in response] if response.is_async else list(response)
+        return b"".join(chunks).decode()
+
+    async def test_stream_previous_page(self):
+        paginator = KeysetPaginator(Task.objects.all(), per_page=2)
+        first = await paginator.apage()
+        second = await paginator.apage(first.next_cursor)
+        html = await self._get({"stream": "1", "cursor": second.previous_cursor})
+        self.assertIn(self.tasks[-1].title, html)
+        self.assertIn(self.tasks[-2].title, html)
+
+    async def test_stream_search_results(self):
+        # Výber backendu číta schému databázy – ani to nesmie ísť sync v event loope
+        html = await self._get({"stream": "1", "q": "nákup"})
+        for task in self.tasks:
+            self.assertIn(task.title, html)
+
+
+class SearchBackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+        cls.best = Task.objects.create(title="Faktúra faktúra", description="zaplatiť faktúru", user=cls.user)
+        cls.other = Task.objects.create(title="Nákup", description="faktúra za nákup", user=cls.user)
+        Task.objects.create(title="Upratovanie", user=cls.user)
+
+    @override_settings(SECURE_SSL_REDIRECT=False)
+    def test_query_without_words_returns_empty_page(self):
+        self.client.force_login(self.user)
+        for query in ("!!", '"', "*"):
+            with self.subTest(query=query):
+                self.assertEqual(list(search_tasks(Task.objects.all(), query)), [])
+                response = self.client.get(reverse("task_list"), {"q": query, "stream": "0"})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(list(response.context["tasks"]), [])
+
+    def test_fts5_join_ranks_matches(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("FTS5 je len na SQLite")
+        self.assertIsInstance(get_search_backend(), SQLiteFTS5Backend)
+        results = list(search_tasks(Task.objects.all(), "faktúra"))
+        self.assertEqual(results, [self.best, self.other])
+        self.assertGreater(results[0].search_rank, results[1].search_rank)
+
+    def _migrated(self):
+        # Ako po migrate – receiver post_migrate zabudne vybraný backend
+        post_migrate.send(sender=apps.get_app_config("tasks"), app_config=apps.get_app_config("tasks"))
+
+    def test_backend_follows_the_schema_after_migrate(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("FTS5 je len na SQLite")
+        self.addCleanup(clear_search_backend_cache)
+        self.assertIsInstance(get_search_backend(), SQLiteFTS5Backend)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {FTS_TABLE} RENAME TO {FTS_TABLE}_moved")
+            try:
+                self._migrated()
+                self.assertNotIsInstance(get_search_backend(), SQLiteFTS5Backend)
+            finally:
+                cursor.execute(f"ALTER TABLE {FTS_TABLE}_moved RENAME TO {FTS_TABLE}")
+        self._migrated()
+        self.assertIsInstance(get_search_backend(), SQLiteFTS5Backend)
+
+    def test_save_does_not_look_up_the_backend(self):
+        get_search_backend()
+        with CaptureQueriesContext(connection) as queries:
+            self.other.title = "Nákup mlieka"
+            self.other.save()
+        self.assertFalse([query for query in queries if "sqlite_master" in query["sql"]])
+
+
+class ImportCheckpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+
+    def _import(self, path):
+        call_command(
+            "import_tasks", path, batch_size=2, default_user="owner", checkpoint="import-test",
+            stdout=StringIO(), stderr=StringIO(),
+        )
+
+    def test_resume_after_crash_does_not_duplicate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tasks.csv")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write("title\n" + "".join(f"Úloha {index}\n" for index in range(5)))
+
+            # Pád uprostred druhej dávky – jej úlohy ani checkpoint sa nezapíšu
+            with mock.patch(
+                "tasks.management.commands.import_tasks.write_events", side_effect=[None, RuntimeError],
+            ):
+                with self.assertRaises(RuntimeError):
+                    self._import(path)
+            self.assertEqual(Task.objects.count(), 2)
+            self.assertEqual(ImportCheckpoint.objects.get(name="import-test").line, 2)
+
+            self._import(path)
+
+        self.assertEqual(
+            sorted(Task.objects.values_list("title", flat=True)), [f"Úloha {index}" for index in range(5)],
+        )
+        checkpoint = ImportCheckpoint.objects.get(name="import-test")
+        self.assertEqual((checkpoint.line, checkpoint.imported), (5, 5))
+
+
+class ExportCheckpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+        Task.objects.create(title="Prvá", user=cls.user)
+
+    def test_finished_export_does_not_block_the_next_one(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tasks.jsonl")
+            checkpoint = f"{path}.ckpt"
+            call_command("export_tasks", path, checkpoint=checkpoint, stdout=StringIO())
+            self.assertFalse(os.path.exists(checkpoint))
+
+            Task.objects.create(title="Druhá", user=self.user)
+            call_command("export_tasks", path, checkpoint=checkpoint, stdout=StringIO())
+            with open(path, encoding="utf-8") as handle:
+                self.assertEqual(len(handle.readlines()), 2)
+
+
+@override_settings(TASK_STATS_SOURCE="counters")
+class ArchiveTests(TransactionTestCase):
+    """Každá dávka sa naozaj potvrdí – cache sa zneplatňuje až po commite"""
+
+    def setUp(self):
+        self.user = User.objects.create_user("owner")
+        self.old = [
+            Task.objects.create(title=f"Faktúra {index}", user=self.user, completed=True, due_date=date(2024, 1, index + 1))
+            for index in range(5)
+        ]
+        self.pending = Task.objects.create(title="Faktúra nová", user=self.user, due_date=date(2024, 1, 1))
+        TaskReminder.objects.create(task=self.old[0], kind="OVERDUE", due_date=self.old[0].due_date)
+        Task.objects.filter(pk__in=[task.pk for task in self.old]).update(
+            updated_at=timezone.now() - timedelta(days=400),
+        )
+
+    def test_archive_keeps_counters_and_index_in_sync(self):
+        moved = list(archive_completed(timezone.now() - timedelta(days=365), batch_size=2))
+
+        self.assertEqual(moved, [2, 2, 1])
+        self.assertEqual(list(Task.objects.all()), [self.pending])
+        self.assertEqual(ArchivedTask.objects.count(), 5)
+        self.assertFalse(TaskReminder.objects.exists())
+        self.assertEqual(reconcile_counters(repair=False), [])
+        self.assertEqual(list(search_tasks(Task.objects.all(), "faktúra")), [self.pending])
+        self.assertEqual(
+            TaskEvent.objects.filter(task_id__in=[task.pk for task in self.old], action=TaskEvent.ARCHIVED).count(), 5,
+        )
+        self.assertFalse(TaskEvent.objects.filter(action=TaskEvent.DELETED).exists())
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, TASK_STATS_SOURCE="counters")
+class VersionedUpdateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+        cls.task = Task.objects.create(title="Pôvodná", description="0", user=cls.user)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        # Očakávané 409/412 by inak zaplnili výstup varovaniami django.request
+        logger = logging.getLogger("django.request")
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.ERROR)
+
+    def test_save_changes_with_stale_version_raises(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        Task.objects.get(pk=self.task.pk).save_changes(["title"], self.task.version)
+
+        stale.title = "Zastaraná"
+        with self.assertRaises(TaskConflict):
+            stale.save_changes(["title"], self.task.version)
+        current = Task.objects.get(pk=self.task.pk)
+        self.assertEqual((current.title, current.version), ("Pôvodná", self.task.version + 1))
+
+    def test_save_versioned_conflicts_even_with_equal_values(self):
+        data = {"title": "Nová", "description": "0", "version": self.task.version}
+        first = TaskForm(data, instance=Task.objects.get(pk=self.task.pk))
+        second = TaskForm(data, instance=Task.objects.get(pk=self.task.pk))
+        self.assertTrue(first.is_valid() and second.is_valid())
+
+        self.assertEqual(first.save_versioned().version, self.task.version + 1)
+        with self.assertRaises(TaskConflict):
+            second.save_versioned()
+
+    def test_stale_edit_returns_409_with_current_version(self):
+        url = reverse("task_update", args=[self.task.pk])
+        form = {"title": "Prvá", "description": "0", "version": self.task.version}
+        self.assertEqual(self.client.post(url, form).status_code, 302)
+
+        response = self.client.post(url, {**form, "title": "Druhá"})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.context["form"]["version"].value(), self.task.version + 1)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).title, "Prvá")
+
+    def test_api_if_match_mismatch_returns_412(self):
+        url = reverse("api_task_detail", args=[self.task.pk])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(
+            self.client.patch(url, {"title": "Prvá"}, content_type="application/json", HTTP_IF_MATCH=etag).status_code,
+            200,
+        )
+
+        response = self.client.patch(url, {"title": "Druhá"}, content_type="application/json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response.json()["current"]["title"], "Prvá")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_toggle_applies_to_stored_state(self):
+        # Obe inštancie videli completed=False – druhé prepnutie nesmie prvé prepísať
+        first, second = Task.objects.get(pk=self.task.pk), Task.objects.get(pk=self.task.pk)
+        self.assertEqual(toggle_completed(first), ((self.user.pk, False, None), (self.user.pk, True, None)))
+        self.assertEqual(toggle_completed(second), ((self.user.pk, True, None), (self.user.pk, False, None)))
+
+        current = Task.objects.get(pk=self.task.pk)
+        self.assertEqual((current.completed, current.version), (False, self.task.version + 2))
+        self.assertEqual(reconcile_counters(repair=False), [])
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, TASK_STATS_SOURCE="counters")
+class ConcurrentTaskUpdateTests(TransactionTestCase):
+    """Súbežné požiadavky cez skutočné views a API – žiadna úprava sa nesmie stratiť"""
+
+    threads = 4
+    iterations = 5
+
+    def setUp(self):
+        self.user = User.objects.create_user("owner")
+        self.task = Task.objects.create(title="Súbežná", description="0", user=self.user)
+        logger = logging.getLogger("django.request")
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.ERROR)
+
+    def _parallel(self, work):
+        """Spustí `work(client, index)` naraz vo vláknach; vracia spojené výsledky"""
+        barrier = threading.Barrier(self.threads)
+        results, errors = [], []
+
+        def run(index):
+            client = Client(raise_request_exception=False)
+            client.force_login(self.user)
+            barrier.wait()
+            try:
+                results.extend(work(client, index))
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        pool = [threading.Thread(target=run, args=(index,)) for index in range(self.threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        self.assertEqual(errors, [])
+        return results
+
+    def test_parallel_toggles_are_not_lost(self):
+        url = reverse("task_toggle_complete", args=[self.task.pk])
+        statuses = self._parallel(lambda client, index: [client.post(url).status_code for _ in range(self.iterations)])
+
+        done = self.threads * self.iterations
+        self.assertEqual(Counter(statuses), {302: done})
+        current = Task.objects.get(pk=self.task.pk)
+        self.assertEqual((current.completed, current.version), (done % 2 == 1, self.task.version + done))
+        self.assertEqual(TaskEvent.objects.filter(task_id=self.task.pk, action=TaskEvent.UPDATED).count(), done)
+        self.assertEqual(reconcile_counters(repair=False), [])
+
+    def test_same_version_edits_save_exactly_one(self):
+        url = reverse("task_update", args=[self.task.pk])
+        form = {"description": "0", "version": self.task.version}
+
+        def work(client, index):
+            return [(client.post(url, {**form, "title": f"Editor {index}"}).status_code, index)]
+
+        results = self._parallel(work)
+        winners = [index for status, index in results if status == 302]
+        self.assertEqual(Counter(status for status, _ in results), {302: 1, 409: self.threads - 1})
+        self.assertEqual(Task.objects.get(pk=self.task.pk).title, f"Editor {winners[0]}")
+
+    def test_versioned_increments_are_not_lost(self):
+        url = reverse("api_task_detail", args=[self.task.pk])
+
+        def work(client, index):
+            # Čítaj–zmeň–zapíš s verziou, pri 409 znova od čítania
+            for _ in range(self.iterations):
+                while True:
+                    current = client.get(url).json()
+                    response = client.patch(
+                        url, {"description": str(int(current["description"]) + 1), "version": current["version"]},
+                        content_type="application/json",
+                    )
+                    if response.status_code != 409:
+                        break
+                self.assertEqual(response.status_code, 200)
+            return []
+
+        self._parallel(work)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).description, str(self.threads * self.iterations))
+
+
+class AuditEventTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+
+    def test_event_is_written_with_the_change(self):
+        with transaction.atomic():
+            task = Task.objects.create(title="Nová", user=self.user)
+            # Záznam je v tej istej transakcii, nie až v callbacku po commite
+            self.assertTrue(TaskEvent.objects.filter(task_id=task.pk, action=TaskEvent.CREATED).exists())
+
+    def test_rollback_discards_change_and_event(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            task = Task.objects.create(title="Nová", user=self.user)
+            raise RuntimeError
+        self.assertFalse(Task.objects.filter(pk=task.pk).exists())
+        self.assertFalse(TaskEvent.objects.filter(task_id=task.pk).exists())
+
+    def test_batched_events_use_one_insert(self):
+        with CaptureQueriesContext(connection) as queries, batched_events():
+            tasks = [Task.objects.create(title=f"Úloha {index}", user=self.user) for index in range(3)]
+        inserts = [query for query in queries if query["sql"].startswith(f'INSERT INTO "{TaskEvent._meta.db_table}"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(TaskEvent.objects.filter(task_id__in=[task.pk for task in tasks]).count(), 3)
+
+
+class CounterSourceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+
+    @override_settings(TASK_STATS_SOURCE="aggregate")
+    def test_aggregate_source_does_not_touch_counters(self):
+        with CaptureQueriesContext(connection) as queries:
+            Task.objects.create(title="Nová", user=self.user, due_date=date(2030, 1, 1))
+        self.assertFalse([query for query in queries if TaskCounters._meta.db_table in query["sql"]])
+
+    def test_reconcile_builds_counters_after_switching_on(self):
+        with override_settings(TASK_STATS_SOURCE="aggregate"):
+            tasks = [Task.objects.create(title=f"Úloha {index}", user=self.user) for index in range(3)]
+        with override_settings(TASK_STATS_SOURCE="counters"):
+            self.assertNotEqual(reconcile_counters(), [])
+            toggle_completed(tasks[0])
+            tasks[1].delete()
+            self.assertEqual(reconcile_counters(repair=False), [])
+        counters, _ = actual_counters()
+        self.assertEqual(TaskCounters.objects.get(scope="all").total, counters["all"]["total"])
+
+
+class BulkTaskFormTests(TestCase):
+    def test_set_due_date_requires_a_date(self):
+        form = BulkTaskForm({"action": "set_due_date", "ids": [1]})
+        self.assertFalse(form.is_valid())
+        self.assertIn("due_date", form.errors)
+
+    @override_settings(SECURE_SSL_REDIRECT=False)
+    def test_bulk_view_keeps_due_dates_without_a_date(self):
+        user = User.objects.create_user("owner")
+        task = Task.objects.create(title="S termínom", user=user, due_date=date(2030, 1, 1))
+        self.client.force_login(user)
+        response = self.client.post(
+            reverse("task_bulk"), {"action": "set_due_date", "ids": [task.pk]}, content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Task.objects.get(pk=task.pk).due_date, date(2030, 1, 1))
+
+    def test_past_due_date_is_rejected(self):
+        form = BulkTaskForm({"action": "set_due_date", "ids": [1], "due_date": "2020-01-01"})
+        self.assertFalse(form.is_valid())
+        self.assertIn("due_date", form.errors)
+
+
+class BenchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@localhost", None)
+        Task.objects.create(title="Úloha", user=cls.user)
+
+    def test_summarize_without_measurements(self):
+        result = summarize([], 0.5)
+        self.assertEqual((result["requests"], result["rps"], result["p95_ms"]), (0, None, None))
+
+    def test_write_scenarios_require_opt_in(self):
+        with self.assertRaises(CommandError):
+            call_command("bench_tasks", scenarios=["toggle"], requests=1, stdout=StringIO())
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_default_run_does_not_write(self):
+        events = TaskEvent.objects.count()
+        call_command("bench_tasks", requests=1, stdout=StringIO())
+        self.assertEqual((Task.objects.count(), TaskEvent.objects.count()), (1, events))
+
+
+class ReminderWatermarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner", "owner@localhost")
+        cls.today = timezone.localdate()
+
+    def _task(self, title, days, **fields):
+        return Task.objects.create(title=title, user=self.user, due_date=self.today + timedelta(days=days), **fields)
+
+    def _run(self):
+        mail.outbox.clear()
+        return send_reminders(days=1, lookback=7, now=timezone.now())
+
+    def _reminded(self):
+        return set(TaskReminder.objects.values_list("task__title", "kind"))
+
+    def test_first_run_covers_lookback_and_horizon(self):
+        self._task("Po termíne", -3)
+        self._task("Zajtra", 1)
+        self._task("Príliš staré", -10)
+        self._task("Neskôr", 5)
+        self._task("Hotové", -1, completed=True)
+
+        result = self._run()
+
+        self.assertEqual((result["tasks"], result["messages"]), (2, 1))
+        self.assertEqual(self._reminded(), {("Po termíne", OVERDUE), ("Zajtra", DUE_SOON)})
+        watermark = ReminderWatermark.objects.get()
+        self.assertEqual((watermark.overdue_until, watermark.due_soon_until), (self.today, self.today + timedelta(days=1)))
+
+    def test_rerun_does_not_resend(self):
+        self._task("Po termíne", -3)
+        self._task("Zajtra", 1)
+        self._run()
+
+        result = self._run()
+        self.assertEqual((result["tasks"], result["messages"]), (0, 0))
+        self.assertEqual(mail.outbox, [])
+
+    def test_due_date_moved_into_processed_window(self):
+        later = self._task("Neskôr", 5)
+        self._run()
+        self.assertEqual(self._reminded(), set())
+
+        # Okno termínov do zajtra je už spracované – úlohu nájde len dotaz na zmeny
+        later.due_date = self.today + timedelta(days=1)
+        later.save()
+        result = self._run()
+
+        self.assertEqual(result["tasks"], 1)
+        self.assertEqual(self._reminded(), {("Neskôr", DUE_SOON)})
+        self.assertEqual(self._run()["tasks"], 0)
+
+
+@override_settings(TASK_ROLES_CACHE=True)
+class RolesCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner")
+        cls.editors = Group.objects.create(name="Editor")
+
+    def setUp(self):
+        cache.clear()
+
+    def _can_edit(self):
+        # Nový objekt ako v ďalšej požiadavke – roly z cache, nie zapamätané na inštancii
+        return resolve_roles(User.objects.get(pk=self.user.pk)).can_edit
+
+    def test_cached_roles_are_reused(self):
+        self.assertFalse(self._can_edit())
+        with self.assertNumQueries(1):
+            self._can_edit()
+
+    def test_membership_changes_invalidate_roles(self):
+        self.assertFalse(self._can_edit())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.add(self.editors)
+        self.assertTrue(self._can_edit())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.editors.user_set.remove(self.user)
+        self.assertFalse(self._can_edit())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.editors.user_set.add(self.user)
+        self.assertTrue(self._can_edit())
+
+        # clear() z opačnej strany nepozná používateľov – zneplatnia sa všetci
+        with self.captureOnCommitCallbacks(execute=True):
+            self.editors.user_set.clear()
+        self.assertFalse(self._can_edit())
+
+    def test_renamed_group_invalidates_roles(self):
+        self.user.groups.add(self.editors)
+        cache.clear()
+        self.assertTrue(self._can_edit())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.editors.name = "Bývalí editori"
+            self.editors.save()
+        self.assertFalse(self._can_edit())
+
+
+class BulkActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("owner")
+        cls.other = User.objects.create_user("other")
+        cls.reader = User.objects.create_user("reader")
+        cls.reader.groups.add(Group.objects.create(name="Reader"))
+        cls.manager = User.objects.create_user("manager")
+        cls.manager.groups.add(Group.objects.create(name="Manager"))
+        cls.own = Task.objects.create(title="Vlastná", user=cls.owner)
+        cls.foreign = Task.objects.create(title="Cudzia", user=cls.other)
+        cls.readers = Task.objects.create(title="Čitateľova", user=cls.reader)
+        cls.missing = cls.readers.pk + 100
+
+    def _user(self, user):
+        # Bez rolí zapamätaných z predchádzajúceho volania
+        return User.objects.get(pk=user.pk)
+
+    def test_owner_sees_only_own_tasks(self):
+        results = apply_bulk_action(self._user(self.owner), "complete", [self.own.pk, self.foreign.pk, self.missing])
+        self.assertEqual(results, {self.own.pk: OK, self.foreign.pk: NOT_FOUND, self.missing: NOT_FOUND})
+        self.assertEqual(
+            dict(Task.objects.values_list("title", "completed")), {"Vlastná": True, "Cudzia": False, "Čitateľova": False},
+        )
+
+    def test_reader_cannot_change_tasks_of_others(self):
+        results = apply_bulk_action(
+            self._user(self.reader), "set_due_date", [self.own.pk, self.readers.pk], due_date=date(2030, 1, 1),
+        )
+        self.assertEqual(results, {self.own.pk: FORBIDDEN, self.readers.pk: OK})
+        self.assertIsNone(Task.objects.get(pk=self.own.pk).due_date)
+        self.assertEqual(Task.objects.get(pk=self.readers.pk).due_date, date(2030, 1, 1))
+        self.assertEqual(TaskEvent.objects.filter(task_id=self.readers.pk, action=TaskEvent.UPDATED).count(), 1)
+
+    def test_delete_follows_delete_role(self):
+        results = apply_bulk_action(self._user(self.reader), "delete", [self.own.pk, self.readers.pk])
+        self.assertEqual(results, {self.own.pk: FORBIDDEN, self.readers.pk: OK})
+
+        results = apply_bulk_action(self._user(self.manager), "delete", [self.own.pk, self.foreign.pk, self.readers.pk])
+        self.assertEqual(results, {self.own.pk: OK, self.foreign.pk: OK, self.readers.pk: NOT_FOUND})
+        self.assertFalse(Task.objects.exists())
+
+    def test_toggle_of_missing_task(self):
+        task = Task(pk=self.missing)
+        with self.assertRaises(Task.DoesNotExist):
+            toggle_completed(task)
+
+    @override_settings(SECURE_SSL_REDIRECT=False)
+    def test_toggle_view_outcomes(self):
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.post(reverse("task_toggle_complete", args=[self.foreign.pk])).status_code, 404)
+        self.assertEqual(self.client.post(reverse("task_toggle_complete", args=[self.own.pk])).status_code, 302)
+        self.assertTrue(Task.objects.get(pk=self.own.pk).completed)
+
+        # Čitateľ cudziu úlohu vidí, ale prepnúť ju nesmie
+        self.client.force_login(self.reader)
+        self.client.post(reverse("task_toggle_complete", args=[self.own.pk]))
+        self.assertTrue(Task.objects.get(pk=self.own.pk).completed)
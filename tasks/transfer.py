@@ -0,0 +1,108 @@
+# tasks/transfer.py
+"""Prúdové čítanie a zápis úloh v CSV/JSONL pre import_tasks a export_tasks"""
+
+import csv
+import json
+import os
+import sys
+from contextlib import contextmanager
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+FORMATS = ('csv', 'jsonl')
+
+# Stĺpce exportu; import používa tie, ktoré pozná TaskForm, plus používateľa
+EXPORT_FIELDS = ('id', 'title', 'description', 'due_date', 'status', 'completed',
+                 'user', 'created_at', 'updated_at')
+
+
+def detect_format(path, explicit=None):
+    if explicit:
+        return explicit
+    if path.endswith('.jsonl') or path.endswith('.ndjson'):
+        return 'jsonl'
+    return 'csv'
+
+
+@contextmanager
+def open_stream(path, mode):
+    """Súbor alebo stdin/stdout pre '-'"""
+    if path == '-':
+        yield sys.stdin if 'r' in mode else sys.stdout
+        return
+    with open(path, mode, encoding='utf-8', newline='') as handle:
+        yield handle
+
+
+def read_rows(handle, fmt):
+    """Generátor (číslo riadku, slovník) – v pamäti je vždy len jeden riadok"""
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(handle), start=1):
+            yield number, row
+        return
+    for number, line in enumerate(handle, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            row = {'__error__': f'Neplatný JSON: {exc}'}
+        if not isinstance(row, dict):
+            row = {'__error__': 'Riadok musí byť JSON objekt.'}
+        yield number, row
+
+
+class RowWriter:
+    """Zápis riadkov do CSV alebo JSONL"""
+
+    def __init__(self, handle, fmt, write_header):
+        self.handle = handle
+        self.fmt = fmt
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(handle, fieldnames=EXPORT_FIELDS)
+            if write_header:
+                self._csv.writeheader()
+
+    def write(self, row):
+        if self.fmt == 'csv':
+            self._csv.writerow(row)
+        else:
+            self.handle.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+
+    def flush(self):
+        self.handle.flush()
+        if self.handle.fileno() > 2:
+            os.fsync(self.handle.fileno())
+
+
+class Checkpoint:
+    """Stav prerušiteľného exportu v malom JSON súbore (vedľa výstupného súboru)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                self.state = json.load(handle)
+
+    def get(self, key, default=None):
+        return self.state.get(key, default)
+
+    def save(self, **values):
+        self.state.update(values)
+        if not self.path:
+            return
+        # Zápis cez dočasný súbor – checkpoint nikdy neostane rozpísaný
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(self.state, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Zmaže checkpoint – ďalší export do toho istého súboru začne od začiatku"""
+        self.state = {}
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,12 +1,30 @@
 # tasks/urls.py
 
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
+
+# Pod ASGI (uvicorn/daphne) sa dajú zapnúť async varianty nad async ORM
+if settings.TASK_ASYNC_VIEWS:
+    task_list = async_views.task_list
+    task_toggle_complete = async_views.task_toggle_complete
+    api_task_list = async_views.api_task_list
+    api_task_detail = async_views.api_task_detail
+else:
+    task_list = views.task_list
+    task_toggle_complete = views.task_toggle_complete
+    api_task_list = api.api_task_list
+    api_task_detail = api.api_task_detail
 
 urlpatterns = [
-    path("", views.task_list, name="task_list"),
+    path("", task_list, name="task_list"),
     path("create/", views.task_create, name="task_create"),
     path("update/<int:pk>/", views.task_edit, name="task_update"),  # ← Zmenené path aj name
     path("delete/<int:pk>/", views.task_delete, name="task_delete"),
-    path("toggle/<int:pk>/", views.task_toggle_complete, name="task_toggle_complete"),
+    path("toggle/<int:pk>/", task_toggle_complete, name="task_toggle_complete"),
+    path("bulk/", views.task_bulk, name="task_bulk"),
+    path("history/", views.task_activity, name="task_activity"),
+    path("history/<int:pk>/", views.task_history, name="task_history"),
+    path("api/tasks/", api_task_list, name="api_task_list"),
+    path("api/tasks/<int:pk>/", api_task_detail, name="api_task_detail"),
 ]
\ No newline at end of file
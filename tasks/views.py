@@ -1,79 +1,208 @@
 # tasks/views.py
 
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import get_template, render_to_string
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required, permission_required
-from django.db import transaction
 from django.contrib import messages
 from django.utils import timezone
-from .models import Task
-from .forms import TaskForm
+from .models import Task, TaskConflict, TaskEvent
+from .bulk import OK, apply_bulk_action, toggle_completed
+from .forms import BulkTaskForm, TaskForm
+from .fragments import fragment_context, fragment_keys, render_stats, render_table
+from .pagination import KeysetPaginator
+from .queries import filter_tasks, list_columns, task_matches_filter, visible_tasks
+from .roles import resolve_roles
+from .search import RankedPaginator, search_tasks
+from .stats import get_stats, stats_delta, stats_scope
+
+TASK_ROWS_MARKER = "<!--task-rows-->"
+TASK_PAGINATION_MARKER = "<!--task-pagination-->"
 
 
 def user_can_see_all_tasks(user):
     """Kontrola či používateľ môže vidieť všetky tasky"""
-    return (user.is_superuser or
-            user.groups.filter(name__in=['Admin', 'Manager', 'Editor', 'Reader']).exists())
+    return resolve_roles(user).can_see_all
 
 
 def user_can_edit_tasks(user):
     """Kontrola či používateľ môže upravovať tasky"""
-    return (user.is_superuser or
-            user.groups.filter(name__in=['Admin', 'Manager', 'Editor']).exists())
+    return resolve_roles(user).can_edit
 
 
 def user_can_delete_tasks(user):
     """Kontrola či používateľ môže mazať tasky"""
-    return (user.is_superuser or
-            user.groups.filter(name__in=['Admin', 'Manager']).exists())
+    return resolve_roles(user).can_delete
 
 
-@login_required
-def task_list(request):
-    """Zoznam úloh podľa oprávnení používateľa"""
-    # Získanie všetkých taskov podľa oprávnení
-    if user_can_see_all_tasks(request.user):
-        all_tasks = Task.objects.all()
-        can_see_all = True
-    else:
-        all_tasks = Task.objects.filter(user=request.user)
-        can_see_all = False
+def _task_list_query(request, today, search_backend=None):
+    """Spoločná príprava zoznamu pre sync aj async view
+
+    Vracia (all_tasks, can_see_all, filter_by, query, paginator); roly už musia byť
+    vyhodnotené (resolve_roles / aresolve_roles), inak sa načítajú synchrónne.
+    Rovnako vyhľadávací backend – async view ho posiela vybraný vopred.
+    """
+    all_tasks, can_see_all = visible_tasks(request.user, archived=_wants_archived(request))
 
     # Filtrovanie podľa GET parametra
     filter_by = request.GET.get('filter', 'all')
-    today = timezone.now().date()
+    tasks = filter_tasks(all_tasks, filter_by, today)
+
+    # Vlastníctvo sa vyhodnotí v SQL, šablóna tak nenačítava task.user po riadkoch
+    tasks = list_columns(tasks, request.user)
 
-    if filter_by == 'completed':
-        tasks = all_tasks.filter(completed=True)
-    elif filter_by == 'pending':
-        tasks = all_tasks.filter(completed=False)
-    elif filter_by == 'overdue':
-        tasks = all_tasks.filter(completed=False, due_date__lt=today)
+    # Vyhľadávanie vracia najrelevantnejšie úlohy, inak keyset stránkovanie
+    # podľa (created_at, id) – zhodné s -created_at
+    query = request.GET.get('q', '').strip()
+    if query:
+        paginator = RankedPaginator(search_tasks(tasks, query, search_backend), settings.TASK_SEARCH_LIMIT)
     else:
-        tasks = all_tasks
+        paginator = KeysetPaginator(tasks, per_page=settings.TASK_LIST_PAGE_SIZE)
+    return all_tasks, can_see_all, filter_by, query, paginator
 
-    tasks = tasks.order_by("-created_at")
 
-    # Štatistiky
-    stats = {
-        'total': all_tasks.count(),
-        'completed': all_tasks.filter(completed=True).count(),
-        'pending': all_tasks.filter(completed=False).count(),
-        'overdue': all_tasks.filter(completed=False, due_date__lt=today).count(),
-    }
+def _wants_archived(request):
+    return request.GET.get('archived') == '1'
+
+
+def _list_stats_scope(request, can_see_all):
+    # Archív nemá rozsah v cache ani v počítadlách
+    if _wants_archived(request):
+        return None
+    return stats_scope(None if can_see_all else request.user.pk)
+
+
+def _wants_stream(request):
+    return request.GET.get('stream', '1' if settings.TASK_LIST_STREAMING else '0') == '1'
 
-    context = {
-        'tasks': tasks,
+
+def _page_query(request):
+    """Parametre aktuálneho zoznamu (filter, q, archived…) bez kurzora – pre odkazy stránkovania"""
+    params = request.GET.copy()
+    params.pop('cursor', None)
+    return params.urlencode()
+
+
+def _task_list_context(roles, page, stats, filter_by, query, can_see_all, archived=False, page_query=''):
+    return {
+        'archived': archived,
+        'page_query': page_query,
+        'tasks': page,
         'stats': stats,
         'current_filter': filter_by,
+        'search_query': query,
         'can_see_all_tasks': can_see_all,
-        'can_edit_tasks': user_can_edit_tasks(request.user),
-        'can_delete_tasks': user_can_delete_tasks(request.user),
-        'user_groups': [group.name for group in request.user.groups.all()],
+        'can_edit_tasks': roles.can_edit,
+        'can_delete_tasks': roles.can_delete,
+        'user_groups': roles.group_names,
     }
+
+
+@login_required
+def task_list(request):
+    """Zoznam úloh podľa oprávnení používateľa"""
+    # Roly sa načítajú raz a zdieľajú ich všetky kontroly oprávnení
+    roles = resolve_roles(request.user)
+    today = timezone.now().date()
+    all_tasks, can_see_all, filter_by, query, paginator = _task_list_query(request, today)
+
+    cursor = request.GET.get('cursor')
+    archived = _wants_archived(request)
+    streaming = _wants_stream(request)
+    if streaming:
+        page = paginator.stream(cursor, chunk_size=settings.TASK_LIST_STREAM_CHUNK_SIZE)
+    elif settings.TASK_FRAGMENT_CACHE and not archived:
+        return _cached_task_list(request, roles, today, all_tasks, can_see_all, filter_by, query, paginator)
+    else:
+        page = paginator.page(cursor)
+
+    # Štatistiky – jeden agregačný dotaz, prípadne z cache
+    stats = get_stats(all_tasks, _list_stats_scope(request, can_see_all), today)
+
+    context = _task_list_context(
+        roles, page, stats, filter_by, query, can_see_all, archived, _page_query(request),
+    )
+    if streaming:
+        return _stream_task_list(request, context)
     return render(request, "tasks/task_list.html", context)
 
 
+def _cached_task_list(request, roles, today, all_tasks, can_see_all, filter_by, query, paginator):
+    """Zoznam z fragmentov v cache (TASK_FRAGMENT_CACHE)
+
+    Pri zásahu sa nespustí ani dotaz na stránku, ani agregácia štatistík;
+    chýbajúce fragmenty sa vykreslia a uložia jedným set_many.
+    """
+    cursor = request.GET.get('cursor')
+    page_query = _page_query(request)
+    scope = stats_scope(None if can_see_all else request.user.pk)
+    keys = fragment_keys(scope, request.user, roles, today, filter_by, query, cursor, page_query)
+    cached = cache.get_many(keys.values())
+    table = cached.get(keys['table'])
+    stats_html = cached.get(keys['stats'])
+
+    page = paginator.page(cursor) if table is None else None
+    stats = get_stats(all_tasks, scope, today) if stats_html is None else None
+    context = _task_list_context(roles, page, stats, filter_by, query, can_see_all, page_query=page_query)
+
+    missing = {}
+    if table is None:
+        table = missing[keys['table']] = render_table(context, request)
+    if stats_html is None:
+        stats_html = missing[keys['stats']] = render_stats(context, request)
+    if missing:
+        cache.set_many(missing, timeout=settings.TASK_FRAGMENT_CACHE_TIMEOUT)
+
+    context.update(fragment_context(table, stats_html, request))
+    return render(request, "tasks/task_list.html", context)
+
+
+def _split_task_list(request, context):
+    """Vykreslí kostru stránky a rozdelí ju na (hlavička, stred, pätička)
+
+    Kostra sa vykresľuje hneď (správy sa tak označia ako prečítané ešte pred
+    MessageMiddleware). Pri prázdnom stave vráti None a celé HTML.
+    """
+    html = render_to_string("tasks/task_list.html", {
+        **context,
+        'streaming': True,
+        'rows_marker': TASK_ROWS_MARKER,
+        'pagination_marker': TASK_PAGINATION_MARKER,
+    }, request)
+    if TASK_ROWS_MARKER not in html:
+        return None, html
+    head, rest = html.split(TASK_ROWS_MARKER, 1)
+    middle, tail = rest.split(TASK_PAGINATION_MARKER, 1)
+    return (head, middle, tail), html
+
+
+def _stream_task_list(request, context):
+    """Streamovaná odpoveď – hlavička, bloky riadkov, stránkovanie, pätička"""
+    parts, html = _split_task_list(request, context)
+    if parts is None:
+        # Prázdny stav – nie je čo streamovať
+        return StreamingHttpResponse([html])
+
+    head, middle, tail = parts
+    page = context['tasks']
+    rows_template = get_template("tasks/task_rows.html")
+
+    def content():
+        yield head
+        for chunk in page.chunks():
+            yield rows_template.render({**context, 'tasks': chunk}, request)
+        yield middle
+        yield render_to_string("tasks/task_pagination.html", context, request)
+        yield tail
+
+    return StreamingHttpResponse(content())
+
+
 # Ostatné views zostávajú rovnaké...
 @login_required
 @permission_required('tasks.add_task', raise_exception=True)
@@ -109,7 +238,10 @@ def task_edit(request, pk):
     if request.method == "POST":
         form = TaskForm(request.POST, instance=task)
         if form.is_valid():
-            form.save()
+            try:
+                form.save_versioned()
+            except TaskConflict:
+                return _task_edit_conflict(request, form, pk)
             messages.success(request, f'Úloha "{task.title}" bola aktualizovaná!')
             return redirect("task_list")
         else:
@@ -120,22 +252,92 @@ def task_edit(request, pk):
     return render(request, "tasks/task_form.html", {"form": form, "task": task})
 
 
+def _task_edit_conflict(request, form, pk):
+    """409 – formulár s hodnotami používateľa a aktuálnou verziou z DB
+
+    Opätovné odoslanie tak vedome prepíše zmenu, ktorú používateľ práve videl.
+    """
+    current = get_object_or_404(Task, pk=pk)
+    data = request.POST.copy()
+    data['version'] = current.version
+    form = TaskForm(data, instance=current)
+    form.is_valid()
+    return render(request, "tasks/task_form.html",
+                  {"form": form, "task": current, "conflict": current}, status=409)
+
+
+def _partial_format(request):
+    """'json' alebo 'html' pre požiadavky z JS, None pre klasický formulár s presmerovaním"""
+    if _wants_json(request):
+        return 'json'
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return 'html'
+    return None
+
+
+def _partial_error(fmt, message, status=403):
+    if fmt == 'json':
+        return JsonResponse({'error': message}, status=status)
+    return HttpResponse(message, status=status, content_type='text/plain; charset=utf-8')
+
+
+def _task_partial_response(request, fmt, pk, task, old_state, new_state, message):
+    """Zmenený riadok a posun štatistík namiesto presmerovania na celý zoznam
+
+    Riadok je None, ak úloha zanikla alebo už nepatrí do aktuálneho filtra
+    (parameter `filter` z formulára riadku).
+    """
+    roles = resolve_roles(request.user)
+    today = timezone.now().date()
+    filter_by = request.POST.get('filter', 'all')
+    row = None
+    if new_state is not None and task_matches_filter(task, filter_by, today):
+        task.is_owner = task.user_id == request.user.pk
+        row = render_to_string("tasks/task_rows.html", {
+            'tasks': [task],
+            'current_filter': filter_by,
+            'can_edit_tasks': roles.can_edit,
+            'can_delete_tasks': roles.can_delete,
+        }, request)
+    delta = stats_delta(old_state, new_state, today)
+
+    if fmt == 'json':
+        return JsonResponse({
+            'id': pk,
+            'deleted': new_state is None,
+            'completed': task.completed,
+            'row': row,
+            'stats_delta': delta,
+            'message': message,
+        })
+    response = HttpResponse(row or '')
+    response['X-Task-Stats-Delta'] = json.dumps(delta)
+    return response
+
+
 @login_required
 @require_POST
 def task_delete(request, pk):
     """Zmazanie úlohy"""
+    fmt = _partial_format(request)
     if user_can_see_all_tasks(request.user):
         task = get_object_or_404(Task, pk=pk)
     else:
         task = get_object_or_404(Task, pk=pk, user=request.user)
 
-    if not user_can_delete_tasks(request.user) and task.user != request.user:
+    if not user_can_delete_tasks(request.user) and task.user_id != request.user.pk:
+        if fmt:
+            return _partial_error(fmt, 'Nemáte oprávnenie zmazať túto úlohu.')
         messages.error(request, 'Nemáte oprávnenie zmazať túto úlohu.')
         return redirect('task_list')
 
     task_title = task.title
+    old_state = task.stats_state()
     task.delete()
-    messages.success(request, f'Úloha "{task_title}" bola zmazaná!')
+    message = f'Úloha "{task_title}" bola zmazaná!'
+    if fmt:
+        return _task_partial_response(request, fmt, pk, task, old_state, None, message)
+    messages.success(request, message)
     return redirect("task_list")
 
 
@@ -143,19 +345,110 @@ def task_delete(request, pk):
 @require_POST
 def task_toggle_complete(request, pk):
     """Prepnutie stavu dokončenia úlohy"""
+    fmt = _partial_format(request)
     if user_can_see_all_tasks(request.user):
         task = get_object_or_404(Task, pk=pk)
     else:
         task = get_object_or_404(Task, pk=pk, user=request.user)
 
-    if not user_can_edit_tasks(request.user) and task.user != request.user:
+    if not user_can_edit_tasks(request.user) and task.user_id != request.user.pk:
+        if fmt:
+            return _partial_error(fmt, 'Nemáte oprávnenie upravovať túto úlohu.')
         messages.error(request, 'Nemáte oprávnenie upravovať túto úlohu.')
         return redirect('task_list')
 
-    with transaction.atomic():
-        task.completed = not task.completed
-        task.save()
+    try:
+        old_state, _ = toggle_completed(task)
+    except Task.DoesNotExist:
+        raise Http404("No Task matches the given query.")
 
     status = "dokončená" if task.completed else "nedokončená"
-    messages.success(request, f'Úloha "{task.title}" je teraz {status}!')
-    return redirect("task_list")
\ No newline at end of file
+    message = f'Úloha "{task.title}" je teraz {status}!'
+    if fmt:
+        return _task_partial_response(request, fmt, pk, task, old_state, task.stats_state(), message)
+    messages.success(request, message)
+    return redirect("task_list")
+
+
+def _wants_json(request):
+    return (request.content_type == 'application/json'
+            or 'application/json' in request.headers.get('Accept', ''))
+
+
+@login_required
+@require_POST
+def task_bulk(request):
+    """Hromadná akcia nad vybranými úlohami (complete/uncomplete/delete/set_due_date)"""
+    wants_json = _wants_json(request)
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'errors': {'__all__': ['Neplatný JSON.']}}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({'errors': {'__all__': ['Očakáva sa JSON objekt.']}}, status=400)
+    else:
+        data = request.POST
+
+    form = BulkTaskForm(data)
+    if not form.is_valid():
+        if wants_json:
+            return JsonResponse({'errors': form.errors}, status=400)
+        messages.error(request, 'Chyba pri hromadnej akcii. Vyberte úlohy a akciu.')
+        return redirect('task_list')
+
+    results = apply_bulk_action(
+        request.user,
+        form.cleaned_data['action'],
+        form.cleaned_data['ids'],
+        form.cleaned_data['due_date'],
+    )
+    done = sum(1 for outcome in results.values() if outcome == OK)
+
+    if wants_json:
+        return JsonResponse({
+            'action': form.cleaned_data['action'],
+            'processed': done,
+            'results': {str(pk): outcome for pk, outcome in results.items()},
+        })
+
+    if done:
+        messages.success(request, f'Hromadná akcia bola vykonaná pre {done} úloh.')
+    if done < len(results):
+        messages.error(request, f'{len(results) - done} úloh nebolo možné spracovať (neexistujú alebo nemáte oprávnenie).')
+    return redirect('task_list')
+
+
+def _history_page(request, events):
+    # Časová os – keyset podľa (created_at, id) nad indexmi task_event_*_idx
+    paginator = KeysetPaginator(events.select_related('actor'), per_page=settings.TASK_LIST_PAGE_SIZE)
+    return paginator.page(request.GET.get('cursor'))
+
+
+@login_required
+def task_history(request, pk):
+    """História jednej úlohy – prežije aj jej zmazanie a archiváciu"""
+    events = TaskEvent.objects.filter(task_id=pk)
+    if not user_can_see_all_tasks(request.user):
+        # Bez rozšírených práv len záznamy z obdobia, keď úloha patrila používateľovi
+        events = events.filter(owner=request.user)
+    page = _history_page(request, events)
+    if not page and not request.GET.get('cursor'):
+        raise Http404
+    return render(request, "tasks/task_history.html", {"events": page, "task_id": pk})
+
+
+@login_required
+def task_activity(request):
+    """Posledné zmeny úloh používateľa (s rozšírenými právami všetkých alebo ?user=)"""
+    events = TaskEvent.objects.all()
+    user_id = request.GET.get('user', '')
+    if not user_can_see_all_tasks(request.user):
+        events = events.filter(owner=request.user)
+        user_id = ''
+    elif user_id.isdigit():
+        events = events.filter(owner_id=int(user_id))
+    else:
+        user_id = ''
+    page = _history_page(request, events)
+    return render(request, "tasks/task_history.html", {"events": page, "filter_user": user_id})